@@ -0,0 +1,92 @@
+"""
+About page content.
+
+The About page sections (story, mission, vision, and the values and
+timeline headers) are versions in the ``AboutSection`` table, with at most
+one active version per section key. ``about_page`` loads every active
+section with one query on that constraint's index, plus the active values
+and timeline items. It caches the whole page as one object until any of
+these models changes.
+
+The page backs ``/api/about-page/``, the per-section endpoints and the
+About Settings admin page.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import metrics
+
+ABOUT_CACHE_KEY = 'api:about-page'
+
+
+def about_models():
+    """Models whose changes invalidate the cached About page."""
+    from .models import AboutSection, AboutTimelineItem, AboutValue
+
+    return [AboutSection, AboutValue, AboutTimelineItem]
+
+
+def _active_sections(queryset):
+    from .models import AboutSection
+
+    sections = dict.fromkeys(key for key, _label in AboutSection.KEY_CHOICES)
+    for section in queryset.filter(is_active=True):
+        sections[section.key] = section
+    return sections
+
+
+def about_page():
+    """
+    Return {'sections': {key: active AboutSection or None}, 'values': [...],
+    'timeline_items': [...]} (active values and timeline items), from the
+    cache when nothing changed.
+    """
+    from .models import AboutSection, AboutTimelineItem, AboutValue
+
+    content = cache.get(ABOUT_CACHE_KEY)
+    metrics.record_cache_lookup('about', content is not None)
+    if content is None:
+        content = {
+            'sections': _active_sections(AboutSection.objects.all()),
+            'values': list(AboutValue.objects.filter(is_active=True).order_by('order', 'id')),
+            'timeline_items': list(AboutTimelineItem.objects.filter(is_active=True).order_by('order', 'year')),
+        }
+        cache.set(ABOUT_CACHE_KEY, content, settings.ABOUT_CACHE_TIMEOUT)
+    return content
+
+
+def _with_latest_versions(sections, queryset):
+    # Sections without an active version are edited from their latest one
+    for key, section in sections.items():
+        if section is None:
+            sections[key] = queryset.filter(key=key).order_by('-updated_at').first()
+    return sections
+
+
+def editable_sections(for_update=False):
+    """
+    Return {key: the active version, else the latest version, or None} of
+    every section, straight from the database.
+
+    Args:
+        for_update: Lock the rows until the end of the transaction
+    """
+    from .models import AboutSection
+
+    queryset = AboutSection.objects.all()
+    if for_update:
+        queryset = queryset.select_for_update()
+    return _with_latest_versions(_active_sections(queryset), queryset)
+
+
+def cached_editable_sections():
+    """editable_sections() from the cached page (a query only for sections without an active version)."""
+    from .models import AboutSection
+
+    return _with_latest_versions(dict(about_page()['sections']), AboutSection.objects.all())
+
+
+def invalidate_about_content(sender=None, **kwargs):
+    """Signal handler: drop the cached About page once a change is committed."""
+    transaction.on_commit(lambda: cache.delete(ABOUT_CACHE_KEY))
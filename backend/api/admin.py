@@ -1,17 +1,33 @@
 from django.contrib import admin
 from django.contrib.admin import AdminSite
+from django.contrib.admin.views.main import ChangeList
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
-from django.db.models import Count, Q
+from django.db.models import Count, ImageField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from .models import (
     ContactMessage, Service, Testimonial, HeroImage, PageImage, BlogPost, Update,
-    # AboutPage,  # Legacy model - removed from admin
-    AboutValue, AboutTimelineItem, ContactInformation,
-    AboutStorySection, AboutMissionSection, AboutVisionSection,
-    AboutValuesSection, AboutTimelineSection,
-    BlogPostImage, BlogPostVideo, GalleryItem
+    AboutSection, AboutValue, AboutTimelineItem, ContactInformation,
+    BlogPostImage, BlogPostVideo, GalleryItem, GalleryUploadBatch, PendingUpload, MediaBlob, SlowQuery
 )
+from .admin_views import ContactArchiveSearchForm, GalleryBulkUploadForm
+from .archive import search_archive
+from .bulk_upload import stage_batch, start_batch
+from .changes import record_bulk_changes
+from .media import content_hash, find_references, find_similar_blobs, perceptual_hash
+from .offload import queue_offload, stage_new_files
+from .pagination import FastCountPaginator, fast_count, invalidate_counts
+from .popularity import weekly_views
+from .search import indexed_search
+from .transfer import invalidate_after_bulk_write, iter_jsonl, with_children
+from .uploads import get_upload_size_limit, with_upload_errors
 
 # ============================================================================
 # CUSTOM ADMIN SITE CONFIGURATION
@@ -33,15 +49,204 @@ admin.site.site_url = "/"
 # 3. 🖼️ MEDIA - Hero Images, Page Images, Blog Media
 # 4. ℹ️ ABOUT PAGE - Unified About page management
 # 5. 📞 CONTACT & SETTINGS - Contact Information
+# 6. 🖼️ GALLERY - Gallery Items
+# 7. ⚙️ PERFORMANCE - Slow Query report
 # ============================================================================
 
 
+# ============================================================================
+# UPLOAD SIZE LIMITS
+# ============================================================================
+
+class UploadLimitAdminMixin:
+    """
+    Show files rejected by SizeLimitedUploadHandler as errors on their field
+    instead of silently dropping them.
+    """
+
+    def get_form(self, request, obj=None, **kwargs):
+        return with_upload_errors(super().get_form(request, obj, **kwargs), request)
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.form = with_upload_errors(formset.form, request)
+        return formset
+
+
+def validate_new_uploads(obj, *field_names):
+    """Check the size of files newly uploaded to the given fields of obj."""
+    from .utils import validate_file_size
+    for name in field_names:
+        file = getattr(obj, name)
+        # Files already in storage were validated when they were uploaded
+        if file and not file._committed:
+            validate_file_size(file, get_upload_size_limit(name))
+
+
+class OffloadUploadsAdminMixin:
+    """
+    Stage new files locally and upload them to media storage in the
+    background, so saving doesn't wait on the remote storage.
+    """
+
+    def save_model(self, request, obj, form, change):
+        staged = stage_new_files(obj)
+        super().save_model(request, obj, form, change)
+        queue_offload(obj, staged)
+
+    def save_formset(self, request, form, formset, change):
+        instances = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete()
+        for instance in instances:
+            staged = stage_new_files(instance)
+            instance.save()
+            queue_offload(instance, staged)
+        formset.save_m2m()
+
+
+def warn_similar_images(request, obj):
+    """Warn when an image newly uploaded to obj is already stored, or looks like one that is."""
+    from django.contrib import messages
+    for field in obj._meta.concrete_fields:
+        if not isinstance(field, ImageField):
+            continue
+        file = getattr(obj, field.attname)
+        if not file or file._committed:
+            continue
+        sha256 = content_hash(file.file)
+        exact = list(MediaBlob.objects.filter(sha256=sha256, ref_count__gt=0))
+        similar = [blob for _distance, blob in find_similar_blobs(perceptual_hash(file.file), exclude_sha256=sha256)[:5]]
+        if not exact and not similar:
+            continue
+
+        references = find_references(blob.name for blob in exact + similar)
+
+        def describe(blobs):
+            return ', '.join(
+                ', '.join(f'{obj._meta.verbose_name} "{obj}"' for obj in references.get(blob.name, [])) or blob.name
+                for blob in blobs
+            )
+
+        if exact:
+            messages.info(request, f'"{file.name}" is identical to an image already in use ({describe(exact)}); the stored copy is reused.')
+        if similar:
+            messages.warning(request, f'"{file.name}" looks very similar to existing images: {describe(similar)}.')
+
+
+class SimilarImageWarningAdminMixin:
+    """Warn about duplicate and near-duplicate images when they are uploaded."""
+
+    def save_model(self, request, obj, form, change):
+        warn_similar_images(request, obj)
+        super().save_model(request, obj, form, change)
+
+    def save_formset(self, request, form, formset, change):
+        for inline_form in formset.forms:
+            if inline_form.has_changed() and not formset._should_delete_form(inline_form):
+                warn_similar_images(request, inline_form.instance)
+        super().save_formset(request, form, formset, change)
+
+
+class IndexedSearchAdminMixin:
+    """
+    Search the changelist through the database's full-text index instead of
+    LIKE '%term%' over every search field (see api.search).
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        results = indexed_search(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        return results, False
+
+
+class _FastCountedQuerySet:
+    """Stands in for a changelist's root queryset while its total is counted."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def count(self):
+        return fast_count(self.queryset)
+
+
+class FastCountChangeList(ChangeList):
+    def get_results(self, request):
+        # The "N total" next to filtered results counts the whole table too
+        root_queryset = self.root_queryset
+        self.root_queryset = _FastCountedQuerySet(root_queryset)
+        try:
+            super().get_results(request)
+        finally:
+            self.root_queryset = root_queryset
+
+
+class FastCountAdminMixin:
+    """
+    Count large changelists from the cache or the planner's estimate instead
+    of running COUNT(*) on every page view (see api.pagination).
+    """
+    paginator = FastCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return FastCountChangeList
+
+
+class ContentExportAdminMixin:
+    """
+    "Export selected ... as JSONL" action: streams the selected objects (and
+    a blog post's images and videos) for import_content (see api.transfer).
+    """
+    actions = ['export_jsonl']
+
+    @admin.action(description='Export selected %(verbose_name_plural)s as JSONL', permissions=['view'])
+    def export_jsonl(self, request, queryset):
+        response = StreamingHttpResponse(iter_jsonl(with_children(queryset)), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="{queryset.model._meta.model_name}.jsonl"'
+        return response
+
+
+class DragReorderAdminMixin:
+    """
+    Drag-and-drop reordering of changelist rows (in the default sort order).
+    Each drop is saved at once through /api/reorder/ (see api.ordering).
+    """
+
+    class Media:
+        js = ['admin/js/reorder.js']
+
+
+class DragReorderInlineMixin:
+    """Drag-and-drop reordering of a tabular inline's saved rows, saved at once through /api/reorder/"""
+
+    class Media:
+        js = ['admin/js/reorder.js']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Tells reorder.js which model the rows belong to
+        self.classes = [*(self.classes or []), f'reorder-{self.model._meta.model_name}']
+
+
+def preview_url(obj, file):
+    """URL of obj's small admin thumbnail, or of the full image if there is none yet."""
+    thumbnail = getattr(obj, 'admin_thumbnail', None)
+    return thumbnail.url if thumbnail else file.url
+
+
+def child_count(model):
+    """Subquery expression: number of a model's rows pointing at a blog post."""
+    rows = model.objects.filter(blog_post=OuterRef('pk')).values('blog_post').annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(rows), 0)
+
+
 # ============================================================================
 # 1. COMMUNICATION MANAGEMENT
 # ============================================================================
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(FastCountAdminMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'is_read', 'created_at']
     list_filter = ['is_read', 'created_at']
     search_fields = ['name', 'email', 'subject', 'message']
@@ -50,6 +255,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_editable = ['is_read']
     ordering = ['-created_at']
     list_per_page = 25
+    # Archive search results shown at once
+    ARCHIVE_SEARCH_LIMIT = 100
     
     fieldsets = (
         ('Message Details', {
@@ -64,14 +271,48 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         queryset.update(is_read=True)
+        invalidate_counts(ContactMessage)
         self.message_user(request, f'{queryset.count()} message(s) marked as read.')
     mark_as_read.short_description = 'Mark selected messages as read'
     
     def mark_as_unread(self, request, queryset):
         queryset.update(is_read=False)
+        invalidate_counts(ContactMessage)
         self.message_user(request, f'{queryset.count()} message(s) marked as unread.')
     mark_as_unread.short_description = 'Mark selected messages as unread'
 
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('archive/', self.admin_site.admin_view(self.archive_view), name='%s_%s_archive' % info),
+        ] + super().get_urls()
+
+    def archive_view(self, request):
+        """Search messages moved to the archive by the retention policy (see api/archive.py)"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        form = ContactArchiveSearchForm(request.GET or None)
+        results = truncated = None
+        if form.is_bound and form.is_valid():
+            results, truncated = search_archive(
+                form.cleaned_data['q'],
+                month=form.cleaned_data['month'],
+                is_read=form.cleaned_data['status'],
+                limit=self.ARCHIVE_SEARCH_LIMIT,
+            )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Search archived messages',
+            'form': form,
+            'results': results,
+            'truncated': truncated,
+            'limit': self.ARCHIVE_SEARCH_LIMIT,
+            'read_days': settings.CONTACT_RETENTION_READ_DAYS,
+            'unread_days': settings.CONTACT_RETENTION_UNREAD_DAYS,
+        }
+        return TemplateResponse(request, 'admin/api/contactmessage/archive.html', context)
+
     class Meta:
         verbose_name = 'Contact Message'
         verbose_name_plural = '📧 Contact Messages'
@@ -82,7 +323,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
 # ============================================================================
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(ContentExportAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'service_type', 'icon', 'is_active', 'created_at']
     list_filter = ['service_type', 'is_active', 'created_at']
     search_fields = ['title', 'description']
@@ -104,7 +345,7 @@ class ServiceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(ContentExportAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'role', 'rating', 'is_featured', 'created_at']
     list_filter = ['rating', 'is_featured', 'created_at']
     search_fields = ['name', 'message', 'role']
@@ -122,15 +363,23 @@ class TestimonialAdmin(admin.ModelAdmin):
         }),
     )
     
-    actions = ['mark_as_featured', 'unmark_as_featured']
+    actions = ['mark_as_featured', 'unmark_as_featured', 'export_jsonl']
     
+    def _set_featured(self, queryset, is_featured):
+        with transaction.atomic():
+            changed = list(queryset.exclude(is_featured=is_featured).select_for_update().only('pk'))
+            Testimonial.objects.filter(pk__in=[obj.pk for obj in changed]).update(is_featured=is_featured)
+            # update() sends no save signals
+            record_bulk_changes(Testimonial, changed, created=False)
+            transaction.on_commit(lambda: invalidate_after_bulk_write([Testimonial]))
+
     def mark_as_featured(self, request, queryset):
-        queryset.update(is_featured=True)
+        self._set_featured(queryset, True)
         self.message_user(request, f'{queryset.count()} testimonial(s) marked as featured.')
     mark_as_featured.short_description = 'Mark selected testimonials as featured'
     
     def unmark_as_featured(self, request, queryset):
-        queryset.update(is_featured=False)
+        self._set_featured(queryset, False)
         self.message_user(request, f'{queryset.count()} testimonial(s) unmarked as featured.')
     unmark_as_featured.short_description = 'Unmark selected testimonials as featured'
 
@@ -143,7 +392,7 @@ class TestimonialAdmin(admin.ModelAdmin):
 # BLOG POST INLINE MEDIA (Images and Videos)
 # ============================================================================
 
-class BlogPostImageInline(admin.TabularInline):
+class BlogPostImageInline(DragReorderInlineMixin, UploadLimitAdminMixin, admin.TabularInline):
     """Inline admin for adding multiple images to a blog post"""
     model = BlogPostImage
     extra = 1
@@ -161,7 +410,7 @@ class BlogPostImageInline(admin.TabularInline):
     image_preview.short_description = 'Preview'
 
 
-class BlogPostVideoInline(admin.TabularInline):
+class BlogPostVideoInline(DragReorderInlineMixin, UploadLimitAdminMixin, admin.TabularInline):
     """Inline admin for adding multiple videos to a blog post"""
     model = BlogPostVideo
     extra = 1
@@ -170,8 +419,8 @@ class BlogPostVideoInline(admin.TabularInline):
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'author', 'published', 'created_date', 'views', 'media_count', 'featured_image_preview']
+class BlogPostAdmin(ContentExportAdminMixin, IndexedSearchAdminMixin, UploadLimitAdminMixin, SimilarImageWarningAdminMixin, OffloadUploadsAdminMixin, admin.ModelAdmin):
+    list_display = ['title', 'category', 'author', 'published', 'created_date', 'views', 'weekly_views', 'media_count', 'featured_image_preview']
     list_filter = ['category', 'published', 'created_date']
     search_fields = ['title', 'excerpt', 'content', 'author']
     readonly_fields = ['slug', 'created_date', 'updated_date', 'views', 'featured_image_preview']
@@ -212,14 +461,28 @@ class BlogPostAdmin(admin.ModelAdmin):
     
     def featured_image_preview(self, obj):
         if obj.featured_image:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px; border-radius: 4px;" />', obj.featured_image.url)
+            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px; border-radius: 4px;" />', preview_url(obj, obj.featured_image))
         return "No image"
     featured_image_preview.short_description = 'Featured Image Preview'
     
+    def get_queryset(self, request):
+        # Last 7 days of views from the hourly/daily rollups, not raw events;
+        # media counts per row in the same query
+        return super().get_queryset(request).annotate(
+            weekly_views=weekly_views(),
+            image_count=child_count(BlogPostImage),
+            video_count=child_count(BlogPostVideo),
+        )
+
+    def weekly_views(self, obj):
+        return obj.weekly_views
+    weekly_views.short_description = 'Views (7 days)'
+    weekly_views.admin_order_field = 'weekly_views'
+    
     def media_count(self, obj):
         """Display count of images and videos attached to the post"""
-        images = obj.images.count()
-        videos = obj.videos.count()
+        images = obj.image_count
+        videos = obj.video_count
         parts = []
         if images:
             parts.append(f'📷 {images}')
@@ -239,7 +502,7 @@ class BlogPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(Update)
-class UpdateAdmin(admin.ModelAdmin):
+class UpdateAdmin(ContentExportAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'type', 'priority', 'published', 'created_date']
     list_filter = ['type', 'priority', 'published', 'created_date']
     search_fields = ['title', 'content']
@@ -273,7 +536,7 @@ class UpdateAdmin(admin.ModelAdmin):
 # ============================================================================
 
 @admin.register(HeroImage)
-class HeroImageAdmin(admin.ModelAdmin):
+class HeroImageAdmin(ContentExportAdminMixin, UploadLimitAdminMixin, SimilarImageWarningAdminMixin, OffloadUploadsAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'image_preview', 'is_active', 'created_at', 'updated_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['title']
@@ -294,7 +557,7 @@ class HeroImageAdmin(admin.ModelAdmin):
     
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 100px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 100px;" />', preview_url(obj, obj.image))
         return "No image"
     image_preview.short_description = 'Preview'
 
@@ -304,7 +567,7 @@ class HeroImageAdmin(admin.ModelAdmin):
 
 
 @admin.register(PageImage)
-class PageImageAdmin(admin.ModelAdmin):
+class PageImageAdmin(ContentExportAdminMixin, UploadLimitAdminMixin, SimilarImageWarningAdminMixin, OffloadUploadsAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'page', 'section', 'image_preview', 'is_active', 'created_at']
     list_filter = ['page', 'is_active', 'created_at']
     search_fields = ['title', 'section']
@@ -316,9 +579,7 @@ class PageImageAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """Override save to handle file upload errors gracefully"""
         try:
-            from .utils import validate_file_size
-            if obj.image:
-                validate_file_size(obj.image)
+            validate_new_uploads(obj, 'image')
             super().save_model(request, obj, form, change)
         except Exception as e:
             from django.contrib import messages
@@ -344,7 +605,7 @@ class PageImageAdmin(admin.ModelAdmin):
     
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 100px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 100px;" />', preview_url(obj, obj.image))
         return "No image"
     image_preview.short_description = 'Preview'
 
@@ -353,135 +614,129 @@ class PageImageAdmin(admin.ModelAdmin):
         verbose_name_plural = '🖼️ Page Images'
 
 
-# ============================================================================
-# 4. UNIFIED ABOUT PAGE MANAGEMENT
-# ============================================================================
-# Consolidated admin interface for all About page content
-# ============================================================================
-# Note: AboutValue and AboutTimelineItem are independent models without
-# ForeignKey relationships, so they cannot be managed inline.
-# They are managed through their standalone admin pages.
-
-
-# Unified About Page Admin - consolidates all About page sections
-@admin.register(AboutStorySection)
-class AboutStorySectionAdmin(admin.ModelAdmin):
-    list_display = ['title', 'is_active', 'updated_at', 'created_at']
-    list_filter = ['is_active', 'created_at', 'updated_at']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active']
-    search_fields = ['title', 'content']
-    
-    fieldsets = (
-        ('Story Content', {
-            'fields': ('title', 'content'),
-            'description': 'Main story content displayed on the About page'
-        }),
-        ('Status', {
-            'fields': ('is_active', 'created_at', 'updated_at')
-        }),
-    )
+@admin.register(PendingUpload)
+class PendingUploadAdmin(admin.ModelAdmin):
+    """Files staged by admin saves that are (being) uploaded in the background"""
+    list_display = ['__str__', 'status', 'attempts', 'next_attempt_at', 'short_error', 'created_at']
+    list_filter = ['status', 'model_label', 'created_at']
+    search_fields = ['staged_name', 'stored_name', 'last_error']
+    ordering = ['-created_at']
+    list_per_page = 50
+    readonly_fields = [
+        'model_label', 'object_id', 'field_name', 'staged_name', 'stored_name', 'status',
+        'attempts', 'last_error', 'next_attempt_at', 'created_at', 'updated_at',
+    ]
+    actions = ['retry_uploads']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def short_error(self, obj):
+        return obj.last_error[:100]
+    short_error.short_description = 'Last error'
+
+    @admin.action(description='Retry selected failed uploads now')
+    def retry_uploads(self, request, queryset):
+        from django.contrib import messages
+        from django.utils import timezone
+        from .offload import submit_uploads
+        failed = queryset.filter(status='failed')
+        ids = list(failed.values_list('pk', flat=True))
+        failed.update(attempts=0, next_attempt_at=timezone.now())
+        submit_uploads(ids)
+        messages.success(request, f'{len(ids)} upload(s) queued for retry.')
 
     class Meta:
-        verbose_name = 'About Story Section'
-        verbose_name_plural = 'ℹ️ About - Story'
+        verbose_name = 'Pending Upload'
+        verbose_name_plural = '🖼️ Pending Uploads'
 
 
-@admin.register(AboutMissionSection)
-class AboutMissionSectionAdmin(admin.ModelAdmin):
-    list_display = ['title', 'is_active', 'updated_at', 'created_at']
-    list_filter = ['is_active', 'created_at', 'updated_at']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active']
-    search_fields = ['title', 'content']
-    
-    fieldsets = (
-        ('Mission Content', {
-            'fields': ('title', 'content'),
-            'description': 'Mission statement displayed on the About page'
-        }),
-        ('Status', {
-            'fields': ('is_active', 'created_at', 'updated_at')
-        }),
-    )
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """Unique stored media files with the number of references to each"""
+    list_display = ['name', 'preview', 'size_display', 'ref_count', 'has_phash', 'created_at']
+    list_filter = ['created_at']
+    search_fields = ['sha256', 'name']
+    ordering = ['-created_at']
+    list_per_page = 50
+    readonly_fields = ['sha256', 'name', 'preview', 'size', 'phash', 'ref_count', 'created_at']
 
-    class Meta:
-        verbose_name = 'About Mission Section'
-        verbose_name_plural = 'ℹ️ About - Mission'
+    def has_add_permission(self, request):
+        return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
 
-@admin.register(AboutVisionSection)
-class AboutVisionSectionAdmin(admin.ModelAdmin):
-    list_display = ['title', 'is_active', 'updated_at', 'created_at']
-    list_filter = ['is_active', 'created_at', 'updated_at']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active']
-    search_fields = ['title', 'content']
-    
-    fieldsets = (
-        ('Vision Content', {
-            'fields': ('title', 'content'),
-            'description': 'Vision statement displayed on the About page'
-        }),
-        ('Status', {
-            'fields': ('is_active', 'created_at', 'updated_at')
-        }),
-    )
+    def has_delete_permission(self, request, obj=None):
+        # Files are removed automatically once nothing references them
+        return False
 
-    class Meta:
-        verbose_name = 'About Vision Section'
-        verbose_name_plural = 'ℹ️ About - Vision'
+    def preview(self, obj):
+        if obj.phash is not None:
+            from django.core.files.storage import default_storage
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 100px;" />', default_storage.url(obj.name))
+        return "-"
+    preview.short_description = 'Preview'
 
+    def size_display(self, obj):
+        return f'{obj.size / 1024:.0f} KB'
+    size_display.short_description = 'Size'
+    size_display.admin_order_field = 'size'
 
-@admin.register(AboutValuesSection)
-class AboutValuesSectionAdmin(admin.ModelAdmin):
-    list_display = ['title', 'is_active', 'updated_at', 'created_at']
-    list_filter = ['is_active', 'created_at', 'updated_at']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active']
-    search_fields = ['title', 'subtitle']
-    
-    fieldsets = (
-        ('Values Section Header', {
-            'fields': ('title', 'subtitle'),
-            'description': 'Header for the Values section. Manage individual values from the "About - Values" admin page.'
-        }),
-        ('Status', {
-            'fields': ('is_active', 'created_at', 'updated_at')
-        }),
-    )
+    def has_phash(self, obj):
+        return obj.phash is not None
+    has_phash.boolean = True
+    has_phash.short_description = 'Image'
 
     class Meta:
-        verbose_name = 'About Values Section'
-        verbose_name_plural = 'ℹ️ About - Values Header'
+        verbose_name = 'Media File'
+        verbose_name_plural = '🖼️ Media Files'
 
 
-@admin.register(AboutTimelineSection)
-class AboutTimelineSectionAdmin(admin.ModelAdmin):
-    list_display = ['title', 'is_active', 'updated_at', 'created_at']
-    list_filter = ['is_active', 'created_at', 'updated_at']
+# ============================================================================
+# 4. UNIFIED ABOUT PAGE MANAGEMENT
+# ============================================================================
+# Consolidated admin interface for all About page content
+# ============================================================================
+# Note: AboutValue and AboutTimelineItem are independent models without
+# ForeignKey relationships, so they cannot be managed inline.
+# They are managed through their standalone admin pages.
+
+
+# Unified About Page Admin - one row per version of each About page section
+@admin.register(AboutSection)
+class AboutSectionAdmin(ContentExportAdminMixin, admin.ModelAdmin):
+    list_display = ['title', 'key', 'is_active', 'updated_at', 'created_at']
+    list_filter = ['key', 'is_active', 'created_at', 'updated_at']
     readonly_fields = ['created_at', 'updated_at']
     list_editable = ['is_active']
-    search_fields = ['title', 'subtitle']
-    
+    search_fields = ['title', 'body', 'subtitle']
+
     fieldsets = (
-        ('Timeline Section Header', {
-            'fields': ('title', 'subtitle'),
-            'description': 'Header for the Timeline section. Manage timeline items from the "About - Timeline Items" admin page.'
+        ('Section Content', {
+            'fields': ('key', 'title', 'body', 'subtitle'),
+            'description': 'Story, mission and vision use the body; the values and timeline '
+                           'headers use the subtitle. Manage individual values and timeline items '
+                           'from the "About - Values" and "About - Timeline Items" admin pages.'
         }),
         ('Status', {
-            'fields': ('is_active', 'created_at', 'updated_at')
+            'fields': ('is_active', 'created_at', 'updated_at'),
+            'description': 'Only one version of each section is active; activating this one '
+                           'deactivates the others.'
         }),
     )
 
     class Meta:
-        verbose_name = 'About Timeline Section'
-        verbose_name_plural = 'ℹ️ About - Timeline Header'
+        verbose_name = 'About Section'
+        verbose_name_plural = 'ℹ️ About - Sections'
 
 
 # Standalone admins for Values and Timeline Items (for direct access if needed)
 @admin.register(AboutValue)
-class AboutValueAdmin(admin.ModelAdmin):
+class AboutValueAdmin(ContentExportAdminMixin, DragReorderAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'icon', 'order', 'is_active', 'updated_at', 'created_at']
     list_filter = ['is_active', 'created_at', 'updated_at']
     readonly_fields = ['created_at', 'updated_at']
@@ -504,7 +759,7 @@ class AboutValueAdmin(admin.ModelAdmin):
 
 
 @admin.register(AboutTimelineItem)
-class AboutTimelineItemAdmin(admin.ModelAdmin):
+class AboutTimelineItemAdmin(ContentExportAdminMixin, DragReorderAdminMixin, admin.ModelAdmin):
     list_display = ['year', 'title', 'order', 'is_active', 'updated_at', 'created_at']
     list_filter = ['is_active', 'created_at', 'updated_at']
     readonly_fields = ['created_at', 'updated_at']
@@ -526,26 +781,12 @@ class AboutTimelineItemAdmin(admin.ModelAdmin):
         verbose_name_plural = 'ℹ️ About - Timeline Items'
 
 
-# Legacy AboutPage model - REMOVED FROM ADMIN
-# Model kept in database for backward compatibility only
-# Users should use the individual section admins instead:
-# - About - Story Sections
-# - About - Mission Sections
-# - About - Vision Sections
-# - About - Values Header (with inline values)
-# - About - Timeline Header (with inline timeline items)
-#
-# @admin.register(AboutPage)
-# class AboutPageAdmin(admin.ModelAdmin):
-#     ... (removed to prevent usage of deprecated model)
-
-
 # ============================================================================
 # 5. CONTACT & SETTINGS MANAGEMENT
 # ============================================================================
 
 @admin.register(ContactInformation)
-class ContactInformationAdmin(admin.ModelAdmin):
+class ContactInformationAdmin(ContentExportAdminMixin, admin.ModelAdmin):
     list_display = ['id', 'is_active', 'email_primary', 'phone_primary', 'updated_at']
     list_filter = ['is_active', 'created_at', 'updated_at']
     readonly_fields = ['created_at', 'updated_at']
@@ -590,7 +831,7 @@ class ContactInformationAdmin(admin.ModelAdmin):
 # ============================================================================
 
 @admin.register(GalleryItem)
-class GalleryItemAdmin(admin.ModelAdmin):
+class GalleryItemAdmin(ContentExportAdminMixin, DragReorderAdminMixin, FastCountAdminMixin, UploadLimitAdminMixin, SimilarImageWarningAdminMixin, OffloadUploadsAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'media_type', 'event_type', 'media_preview', 'is_featured', 'is_active', 'order', 'event_date', 'created_at']
     list_filter = ['media_type', 'event_type', 'is_featured', 'is_active', 'event_date', 'created_at']
     search_fields = ['title', 'description']
@@ -627,13 +868,7 @@ class GalleryItemAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """Override save to handle file upload errors gracefully"""
         try:
-            from .utils import validate_file_size
-            if obj.image:
-                validate_file_size(obj.image)
-            if obj.video_file:
-                validate_file_size(obj.video_file)
-            if obj.thumbnail:
-                validate_file_size(obj.thumbnail)
+            validate_new_uploads(obj, 'image', 'video_file', 'thumbnail')
             super().save_model(request, obj, form, change)
         except Exception as e:
             from django.contrib import messages
@@ -684,18 +919,151 @@ class GalleryItemAdmin(admin.ModelAdmin):
         if obj.media_type == 'image' and obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 50px; max-width: 80px; border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj, obj.image)
             )
         elif obj.media_type == 'video':
             if obj.thumbnail:
                 return format_html(
                     '<img src="{}" style="max-height: 50px; max-width: 80px; border-radius: 4px; object-fit: cover;" /> <span style="margin-left: 5px;">🎬</span>',
-                    obj.thumbnail.url
+                    preview_url(obj, obj.thumbnail)
                 )
             return "🎬 Video"
         return "—"
     media_preview.short_description = 'Preview'
 
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('bulk-upload/', self.admin_site.admin_view(self.bulk_upload_view), name='%s_%s_bulk_upload' % info),
+            path(
+                'bulk-upload/<uuid:batch_id>/',
+                self.admin_site.admin_view(self.bulk_upload_status_view),
+                name='%s_%s_bulk_upload_status' % info,
+            ),
+        ] + super().get_urls()
+
+    def bulk_upload_view(self, request):
+        """Upload many photos (or a zip) at once; they're added in the background"""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form_class = with_upload_errors(GalleryBulkUploadForm, request)
+        if request.method == 'POST':
+            form = form_class(request.POST, request.FILES)
+            if form.is_valid():
+                with transaction.atomic():
+                    batch = form.save(commit=False)
+                    batch.uploaded_by = request.user
+                    batch.total = len(form.cleaned_data['files']) + len(form.members)
+                    batch.save()
+                    sources = stage_batch(batch, form.cleaned_data['files'], form.cleaned_data['archive'], form.members)
+                    start_batch(batch.pk, sources)
+                return redirect('admin:api_galleryitem_bulk_upload_status', batch_id=batch.pk)
+        else:
+            form = form_class()
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Bulk upload gallery images',
+            'form': form,
+            'max_files': settings.BULK_UPLOAD_MAX_FILES,
+            'recent_batches': GalleryUploadBatch.objects.select_related('uploaded_by')[:10],
+        }
+        return TemplateResponse(request, 'admin/api/galleryitem/bulk_upload.html', context)
+
+    def bulk_upload_status_view(self, request, batch_id):
+        """Progress of a bulk upload, as a page or as JSON (?format=json) for polling"""
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        batch = get_object_or_404(GalleryUploadBatch, pk=batch_id)
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'status': batch.status,
+                'total': batch.total,
+                'processed': batch.processed,
+                'created_items': batch.created_items,
+                'errors': batch.errors,
+            })
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Bulk upload progress',
+            'batch': batch,
+        }
+        return TemplateResponse(request, 'admin/api/galleryitem/bulk_upload.html', context)
+
     class Meta:
         verbose_name = 'Gallery Item'
         verbose_name_plural = '🖼️ Gallery'
+
+
+# ============================================================================
+# 7. PERFORMANCE MONITORING
+# ============================================================================
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Read-only report of slow SQL aggregated by fingerprint"""
+    list_display = ['short_sql', 'calls', 'average_ms', 'max_ms', 'total_ms', 'view_name', 'has_plan', 'last_seen']
+    list_filter = ['view_name', 'last_seen']
+    search_fields = ['normalized_sql', 'view_name', 'stack_frame']
+    ordering = ['-total_duration_ms']
+    list_per_page = 50
+    readonly_fields = [
+        'fingerprint', 'normalized_sql', 'sample_sql', 'sample_params', 'view_name', 'stack_frame',
+        'plan', 'explained_at', 'calls', 'total_duration_ms', 'max_duration_ms', 'first_seen', 'last_seen',
+    ]
+
+    fieldsets = (
+        ('Query', {
+            'fields': ('fingerprint', 'normalized_sql', 'sample_sql', 'sample_params'),
+        }),
+        ('Origin', {
+            'fields': ('view_name', 'stack_frame'),
+        }),
+        ('Query Plan', {
+            'fields': ('plan', 'explained_at'),
+            'description': 'A full table scan ("SCAN" on SQLite, "Seq Scan" on PostgreSQL) usually points to a missing index.'
+        }),
+        ('Statistics', {
+            'fields': ('calls', 'total_duration_ms', 'max_duration_ms', 'first_seen', 'last_seen'),
+        }),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+    short_sql.short_description = 'Query'
+
+    def average_ms(self, obj):
+        return f'{obj.average_duration_ms:.1f}'
+    average_ms.short_description = 'Avg (ms)'
+
+    def max_ms(self, obj):
+        return f'{obj.max_duration_ms:.1f}'
+    max_ms.short_description = 'Max (ms)'
+    max_ms.admin_order_field = 'max_duration_ms'
+
+    def total_ms(self, obj):
+        return f'{obj.total_duration_ms:.0f}'
+    total_ms.short_description = 'Total (ms)'
+    total_ms.admin_order_field = 'total_duration_ms'
+
+    def has_plan(self, obj):
+        return bool(obj.explain_plan)
+    has_plan.boolean = True
+    has_plan.short_description = 'Plan'
+
+    def plan(self, obj):
+        if obj.explain_plan:
+            return format_html('<pre style="white-space: pre-wrap;">{}</pre>', obj.explain_plan)
+        return "No plan captured"
+    plan.short_description = 'EXPLAIN'
+
+    class Meta:
+        verbose_name = 'Slow Query'
+        verbose_name_plural = '⚙️ Slow Queries'
@@ -1,152 +1,186 @@
+from django import forms
+from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.admin.widgets import AdminDateWidget
+from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.forms import ModelForm
-from .models import (
-    AboutStorySection, AboutMissionSection, AboutVisionSection,
-    AboutValuesSection, AboutTimelineSection, AboutValue, AboutTimelineItem
-)
+from .about import about_page, cached_editable_sections, editable_sections
+from .archive import archive_months
+from .bulk_upload import archive_members, image_extensions
+from .models import AboutSection, GalleryUploadBatch
 
 
-class AboutStoryForm(ModelForm):
+class AboutTextSectionForm(ModelForm):
+    """Story, mission or vision section"""
     class Meta:
-        model = AboutStorySection
-        fields = ['title', 'content', 'is_active']
+        model = AboutSection
+        fields = ['title', 'body', 'is_active']
 
 
-class AboutMissionForm(ModelForm):
+class AboutHeaderSectionForm(ModelForm):
+    """Values or timeline section header"""
     class Meta:
-        model = AboutMissionSection
-        fields = ['title', 'content', 'is_active']
+        model = AboutSection
+        fields = ['title', 'subtitle', 'is_active']
 
 
-class AboutVisionForm(ModelForm):
-    class Meta:
-        model = AboutVisionSection
-        fields = ['title', 'content', 'is_active']
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
 
 
-class AboutValuesSectionForm(ModelForm):
-    class Meta:
-        model = AboutValuesSection
-        fields = ['title', 'subtitle', 'is_active']
+class MultipleFileField(forms.FileField):
+    """File field accepting several files, cleaned to a list"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        single_file_clean = super().clean
+        if isinstance(data, (list, tuple)):
+            return [single_file_clean(file, initial) for file in data]
+        return [single_file_clean(data, initial)] if data else []
 
 
-class AboutTimelineSectionForm(ModelForm):
+class GalleryBulkUploadForm(ModelForm):
+    """Many photos (or a zip of them) with the values every gallery item shares"""
+    files = MultipleFileField(
+        required=False,
+        widget=MultipleFileInput(attrs={'accept': ','.join(f'.{extension}' for extension in image_extensions())}),
+        help_text='Select any number of images',
+    )
+    archive = forms.FileField(
+        required=False,
+        label='Zip file',
+        validators=[FileExtensionValidator(allowed_extensions=['zip'])],
+        help_text='Or upload a zip of images',
+    )
+
     class Meta:
-        model = AboutTimelineSection
-        fields = ['title', 'subtitle', 'is_active']
+        model = GalleryUploadBatch
+        fields = ['title', 'event_type', 'event_date', 'is_active']
+        widgets = {'event_date': AdminDateWidget()}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        files = cleaned_data.get('files') or []
+        archive = cleaned_data.get('archive')
+        self.members = []
+        if archive:
+            try:
+                self.members = archive_members(archive)
+            except ValidationError as e:
+                self.add_error('archive', e)
+                return cleaned_data
+            if not self.members:
+                self.add_error('archive', 'The zip file contains no images.')
+        if not files and not archive and not self.errors:
+            raise ValidationError('Select some images or a zip file to upload.')
+        total = len(files) + len(self.members)
+        if total > settings.BULK_UPLOAD_MAX_FILES:
+            raise ValidationError(
+                f'{total} images selected; at most {settings.BULK_UPLOAD_MAX_FILES} can be uploaded at once.'
+            )
+        return cleaned_data
+
+
+class ContactArchiveSearchForm(forms.Form):
+    """Search of archived contact messages (admin > Contact Messages > Search archive)"""
+    q = forms.CharField(required=False, label='Search', help_text='Name, email, subject or message')
+    month = forms.ChoiceField(required=False)
+    status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Read and unread'), ('read', 'Read'), ('unread', 'Unread')],
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.months = archive_months()
+        self.fields['month'].choices = [('', 'All months')] + [
+            (month.isoformat(), f'{month:%B %Y} ({count})') for month, count in self.months
+        ]
+
+    def clean_month(self):
+        month = self.cleaned_data['month']
+        return next((value for value, _count in self.months if value.isoformat() == month), None)
+
+    def clean_status(self):
+        return {'read': True, 'unread': False}.get(self.cleaned_data['status'])
+
+
+# Section key (also the form prefix) -> (form class, context name, label)
+ABOUT_SECTION_FORMS = {
+    'story': (AboutTextSectionForm, 'story_form', 'Story section'),
+    'mission': (AboutTextSectionForm, 'mission_form', 'Mission section'),
+    'vision': (AboutTextSectionForm, 'vision_form', 'Vision section'),
+    'values_header': (AboutHeaderSectionForm, 'values_section_form', 'Values section header'),
+    'timeline_header': (AboutHeaderSectionForm, 'timeline_section_form', 'Timeline section header'),
+}
+
+
+def _about_forms(sections, data=None):
+    forms = {}
+    for key, (form_class, _name, _label) in ABOUT_SECTION_FORMS.items():
+        instance = sections[key]
+        # A section that doesn't exist yet may be left blank
+        forms[key] = form_class(
+            data,
+            instance=instance or AboutSection(key=key, title=AboutSection.DEFAULT_TITLES[key]),
+            prefix=key,
+            empty_permitted=instance is None,
+            use_required_attribute=False,
+        )
+    return forms
 
 
 @staff_member_required
 def about_settings_view(request):
-    """Consolidated About Settings page - manage all About page sections in one place"""
-    
-    # Get or create the most recent active sections
-    story_section = AboutStorySection.objects.filter(is_active=True).order_by('-updated_at').first()
-    if not story_section:
-        story_section = AboutStorySection.objects.order_by('-updated_at').first()
-    if not story_section:
-        story_section = AboutStorySection()
-    
-    mission_section = AboutMissionSection.objects.filter(is_active=True).order_by('-updated_at').first()
-    if not mission_section:
-        mission_section = AboutMissionSection.objects.order_by('-updated_at').first()
-    if not mission_section:
-        mission_section = AboutMissionSection()
-    
-    vision_section = AboutVisionSection.objects.filter(is_active=True).order_by('-updated_at').first()
-    if not vision_section:
-        vision_section = AboutVisionSection.objects.order_by('-updated_at').first()
-    if not vision_section:
-        vision_section = AboutVisionSection()
-    
-    values_section = AboutValuesSection.objects.filter(is_active=True).order_by('-updated_at').first()
-    if not values_section:
-        values_section = AboutValuesSection.objects.order_by('-updated_at').first()
-    if not values_section:
-        values_section = AboutValuesSection()
-    
-    timeline_section = AboutTimelineSection.objects.filter(is_active=True).order_by('-updated_at').first()
-    if not timeline_section:
-        timeline_section = AboutTimelineSection.objects.order_by('-updated_at').first()
-    if not timeline_section:
-        timeline_section = AboutTimelineSection()
-    
-    # Get all values and timeline items
-    values = AboutValue.objects.filter(is_active=True).order_by('order', 'id')
-    timeline_items = AboutTimelineItem.objects.filter(is_active=True).order_by('order', 'year')
-    
+    """
+    Consolidated About Settings page - manage all About page sections in one place.
+
+    All sections are posted together and saved in one transaction (only the
+    ones that changed). Requests sent with "Accept: application/json" get a
+    JSON result instead of a redirect, so the page saves in one round trip.
+    """
+    wants_json = 'application/json' in request.headers.get('Accept', '')
+
     if request.method == 'POST':
-        section = request.POST.get('section')
-        success = False
-        
-        if section == 'story':
-            # Create new instance if it doesn't exist
-            if not story_section.pk:
-                story_section = AboutStorySection()
-            form = AboutStoryForm(request.POST, instance=story_section)
-            if form.is_valid():
-                form.save()
-                messages.success(request, 'Story section saved successfully!')
-                success = True
-        elif section == 'mission':
-            # Create new instance if it doesn't exist
-            if not mission_section.pk:
-                mission_section = AboutMissionSection()
-            form = AboutMissionForm(request.POST, instance=mission_section)
-            if form.is_valid():
-                form.save()
-                messages.success(request, 'Mission section saved successfully!')
-                success = True
-        elif section == 'vision':
-            # Create new instance if it doesn't exist
-            if not vision_section.pk:
-                vision_section = AboutVisionSection()
-            form = AboutVisionForm(request.POST, instance=vision_section)
-            if form.is_valid():
-                form.save()
-                messages.success(request, 'Vision section saved successfully!')
-                success = True
-        elif section == 'values_header':
-            # Create new instance if it doesn't exist
-            if not values_section.pk:
-                values_section = AboutValuesSection()
-            form = AboutValuesSectionForm(request.POST, instance=values_section)
-            if form.is_valid():
-                form.save()
-                messages.success(request, 'Values section header saved successfully!')
-                success = True
-        elif section == 'timeline_header':
-            # Create new instance if it doesn't exist
-            if not timeline_section.pk:
-                timeline_section = AboutTimelineSection()
-            form = AboutTimelineSectionForm(request.POST, instance=timeline_section)
-            if form.is_valid():
-                form.save()
-                messages.success(request, 'Timeline section header saved successfully!')
-                success = True
-        
-        if success:
+        with transaction.atomic():
+            forms = _about_forms(editable_sections(for_update=True), request.POST)
+            valid = all([form.is_valid() for form in forms.values()])
+            saved = []
+            if valid:
+                for key, form in forms.items():
+                    # A section nobody touched isn't rewritten (or created empty)
+                    if form.has_changed():
+                        form.save()
+                        saved.append(ABOUT_SECTION_FORMS[key][2])
+
+        if valid:
+            message = f'Saved: {", ".join(saved)}.' if saved else 'No changes to save.'
+            if wants_json:
+                return JsonResponse({'saved': saved, 'message': message})
+            messages.success(request, message)
             return redirect('about_settings')
-    
-    # Initialize forms
-    story_form = AboutStoryForm(instance=story_section)
-    mission_form = AboutMissionForm(instance=mission_section)
-    vision_form = AboutVisionForm(instance=vision_section)
-    values_section_form = AboutValuesSectionForm(instance=values_section)
-    timeline_section_form = AboutTimelineSectionForm(instance=timeline_section)
-    
+        if wants_json:
+            errors = {key: form.errors.get_json_data() for key, form in forms.items() if form.errors}
+            return JsonResponse({'errors': errors}, status=400)
+        content = about_page()
+    else:
+        content = about_page()
+        forms = _about_forms(cached_editable_sections())
+
     context = {
-        'story_form': story_form,
-        'mission_form': mission_form,
-        'vision_form': vision_form,
-        'values_section_form': values_section_form,
-        'timeline_section_form': timeline_section_form,
-        'values': values,
-        'timeline_items': timeline_items,
+        'values': content['values'],
+        'timeline_items': content['timeline_items'],
         'has_perm': request.user.is_staff,
     }
-    
-    return render(request, 'admin/about_settings.html', context)
+    for key, (_form_class, name, _label) in ABOUT_SECTION_FORMS.items():
+        context[name] = forms[key]
 
+    return render(request, 'admin/about_settings.html', context)
@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Content Management'
+
+    def ready(self):
+        from .signals import connect_content_signals, connect_media_signals
+        connect_media_signals()
+        connect_content_signals()
+
+        from .search import ensure_search_indexes
+        post_migrate.connect(ensure_search_indexes, sender=self, dispatch_uid='api_ensure_search_indexes')
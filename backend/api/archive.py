@@ -0,0 +1,215 @@
+"""
+Retention of contact messages.
+
+``archive_messages`` moves messages older than their retention period
+(CONTACT_RETENTION_READ_DAYS or CONTACT_RETENTION_UNREAD_DAYS, by read
+status) out of the inbox into ``ContactMessageArchive``, so the live table
+and its indexes stay small. It works in batches of CONTACT_ARCHIVE_BATCH_SIZE
+messages, each locked, copied and deleted in its own short transaction.
+
+Archived messages are stored as gzip-compressed JSON Lines (the ``dumpdata``
+format) per month. Each batch adds a row per month it touches, and
+``compact_archive`` then merges every month into a single row.
+
+The archive is only read on demand: ``search_archive`` decompresses the
+searched months, newest first, for the admin's archive search page.
+"""
+import gzip
+import json
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import smart_split, unescape_string_literal
+
+from .pagination import invalidate_counts
+
+# Fields matched by search_archive, like the inbox's search_fields
+SEARCH_FIELDS = ['name', 'email', 'subject', 'message']
+
+
+def month_of(value):
+    """First day of the (local) month of a datetime."""
+    return timezone.localtime(value).date().replace(day=1)
+
+
+def compress_lines(lines):
+    return gzip.compress(''.join(lines).encode(), compresslevel=9, mtime=0)
+
+
+def decompress_lines(data):
+    # BinaryField values are memoryviews on some backends
+    return gzip.decompress(bytes(data)).decode().splitlines(keepends=True)
+
+
+def retention_cutoffs(read_days=None, unread_days=None, now=None):
+    """
+    Return {is_read: cutoff datetime} for the read statuses with a retention
+    period; a period of 0 days keeps messages in the inbox forever.
+    """
+    now = now or timezone.now()
+    days = {
+        True: settings.CONTACT_RETENTION_READ_DAYS if read_days is None else read_days,
+        False: settings.CONTACT_RETENTION_UNREAD_DAYS if unread_days is None else unread_days,
+    }
+    return {is_read: now - timedelta(days=period) for is_read, period in days.items() if period > 0}
+
+
+def _archive_batch(queryset, batch_size):
+    from .models import ContactMessage, ContactMessageArchive
+
+    with transaction.atomic():
+        messages = list(queryset.select_for_update().order_by('created_at', 'pk')[:batch_size])
+        if not messages:
+            return 0
+        by_month = defaultdict(list)
+        for message in messages:
+            by_month[month_of(message.created_at)].append(message)
+        ContactMessageArchive.objects.bulk_create([
+            ContactMessageArchive(
+                month=month,
+                message_count=len(group),
+                data=compress_lines(serializers.serialize('jsonl', group).splitlines(keepends=True)),
+            )
+            for month, group in by_month.items()
+        ])
+        ContactMessage.objects.filter(pk__in=[message.pk for message in messages]).delete()
+    return len(messages)
+
+
+def archive_messages(read_days=None, unread_days=None, batch_size=None, dry_run=False, now=None):
+    """
+    Move messages past their retention period into the archive.
+
+    Args:
+        read_days, unread_days: Retention periods overriding the settings
+        batch_size: Messages per transaction (default CONTACT_ARCHIVE_BATCH_SIZE)
+        dry_run: Only count the messages that are due
+
+    Returns:
+        Counter of messages archived (or due) by 'read' / 'unread'
+    """
+    from .models import ContactMessage
+
+    batch_size = batch_size or settings.CONTACT_ARCHIVE_BATCH_SIZE
+    counts = Counter()
+    for is_read, cutoff in retention_cutoffs(read_days, unread_days, now).items():
+        status = 'read' if is_read else 'unread'
+        due = ContactMessage.objects.filter(is_read=is_read, created_at__lt=cutoff)
+        if dry_run:
+            counts[status] = due.count()
+            continue
+        while True:
+            archived = _archive_batch(due, batch_size)
+            if not archived:
+                break
+            counts[status] += archived
+    if counts and not dry_run:
+        invalidate_counts(ContactMessage)
+    return counts
+
+
+def compact_archive():
+    """
+    Merge the archive rows of each month into one, messages in the order
+    they were received.
+
+    Returns:
+        Number of months merged
+    """
+    from .models import ContactMessageArchive
+
+    months = list(
+        ContactMessageArchive.objects.values('month').annotate(rows=Count('id'))
+        .filter(rows__gt=1).values_list('month', flat=True)
+    )
+    for month in months:
+        with transaction.atomic():
+            rows = list(ContactMessageArchive.objects.select_for_update().filter(month=month).order_by('id'))
+            lines = [line for row in rows for line in decompress_lines(row.data)]
+            lines.sort(key=lambda line: _sort_key(json.loads(line)))
+            first = rows[0]
+            first.data = compress_lines(lines)
+            first.message_count = len(lines)
+            first.save(update_fields=['data', 'message_count', 'updated_at'])
+            ContactMessageArchive.objects.filter(pk__in=[row.pk for row in rows[1:]]).delete()
+    return len(months)
+
+
+def _sort_key(record):
+    return parse_datetime(record['fields']['created_at']), record['pk']
+
+
+def archive_months():
+    """Return [(month, number of messages)] in the archive, newest first."""
+    from .models import ContactMessageArchive
+
+    return list(
+        ContactMessageArchive.objects.values('month').annotate(messages=Sum('message_count'))
+        .order_by('-month').values_list('month', 'messages')
+    )
+
+
+def _search_terms(query):
+    terms = []
+    for bit in smart_split(query):
+        if len(bit) > 1 and bit[0] in '"\'' and bit[-1] == bit[0]:
+            bit = unescape_string_literal(bit)
+        if bit:
+            terms.append(bit.lower())
+    return terms
+
+
+def search_archive(query='', month=None, is_read=None, limit=100):
+    """
+    Search archived messages, newest first.
+
+    Every word (or quoted phrase) of query must appear in the name, email,
+    subject or message. Months are decompressed one at a time until limit
+    messages are found.
+
+    Args:
+        query: Search terms; all messages match an empty query
+        month: Only search this month (first day of the month)
+        is_read: Only messages archived as read (True) or unread (False)
+        limit: Maximum number of messages returned
+
+    Returns:
+        (messages, truncated): dicts of the message fields plus 'id' and
+        'month', and whether more messages matched
+    """
+    from .models import ContactMessageArchive
+
+    terms = _search_terms(query)
+    rows = ContactMessageArchive.objects.order_by('-month', 'id')
+    if month is not None:
+        rows = rows.filter(month=month)
+
+    results = []
+    for row_month, month_rows in groupby(rows.iterator(chunk_size=10), key=lambda row: row.month):
+        matches = []
+        for row in month_rows:
+            for line in decompress_lines(row.data):
+                record = json.loads(line)
+                fields = record['fields']
+                if is_read is not None and fields['is_read'] != is_read:
+                    continue
+                text = '\n'.join(fields[name] or '' for name in SEARCH_FIELDS).lower()
+                if all(term in text for term in terms):
+                    matches.append({
+                        **fields,
+                        'id': record['pk'],
+                        'created_at': parse_datetime(fields['created_at']),
+                        'month': row_month,
+                    })
+        matches.sort(key=lambda message: (message['created_at'], message['id']), reverse=True)
+        results.extend(matches)
+        if len(results) > limit:
+            return results[:limit], True
+    return results, False
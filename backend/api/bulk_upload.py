@@ -0,0 +1,372 @@
+"""
+Bulk photo uploads to the gallery.
+
+The admin's bulk upload page (``GalleryItemAdmin.bulk_upload_view``) stores
+the selected files, or a zip of them, in a per-batch directory under
+BULK_UPLOAD_DIR and records a ``GalleryUploadBatch``. Once that commits, a
+background job checks every image, strips its metadata (EXIF, including
+any GPS position) and renders its admin thumbnail in a pool of
+BULK_UPLOAD_WORKERS threads, which also store both files. Gallery items
+are then created with ``bulk_create`` in chunks as files finish, with
+progress kept on the batch row the upload page polls.
+
+``bulk_create`` sends no save signals, so the job records the changes and
+drops the caches itself.
+
+Jobs run in the web process, so a worker restart or deploy stops them and
+loses the files staged on local disk. ``manage.py fail_stale_uploads``
+marks such batches as failed and removes what they left behind.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .uploads import get_upload_size_limit
+
+logger = logging.getLogger('api.bulk_upload')
+
+# Items created per bulk_create (and progress update)
+CREATE_CHUNK_SIZE = 50
+
+_executor = None
+_workers = None
+_executor_lock = threading.Lock()
+
+
+def image_extensions():
+    """File extensions accepted for gallery images (from GalleryItem.image's validator)."""
+    from .models import GalleryItem
+
+    for validator in GalleryItem._meta.get_field('image').validators:
+        allowed = getattr(validator, 'allowed_extensions', None)
+        if allowed:
+            return [extension.lower() for extension in allowed]
+    return ['jpg', 'jpeg', 'png', 'webp', 'gif']
+
+
+def _is_image_name(name):
+    return os.path.splitext(name)[1].lstrip('.').lower() in image_extensions()
+
+
+def archive_members(archive):
+    """
+    List the images in a zip file, skipping folders, hidden files and macOS
+    resource forks.
+
+    Raises:
+        ValidationError: if the file isn't a readable zip
+    """
+    try:
+        with zipfile.ZipFile(archive) as zip_file:
+            members = zip_file.infolist()
+    except (zipfile.BadZipFile, OSError):
+        raise ValidationError('This is not a valid zip file.')
+    finally:
+        archive.seek(0)
+    return [
+        member.filename for member in members
+        if not member.is_dir()
+        and not member.filename.startswith('__MACOSX/')
+        and not os.path.basename(member.filename).startswith('.')
+        and _is_image_name(member.filename)
+    ]
+
+
+def batch_dir(batch_id):
+    return Path(settings.BULK_UPLOAD_DIR) / str(batch_id)
+
+
+def _store_upload(upload, path):
+    if hasattr(upload, 'temporary_file_path'):
+        # Already on disk; Django ignores the moved temporary file on close
+        shutil.move(upload.temporary_file_path(), path)
+        return
+    with open(path, 'wb') as output:
+        for chunk in upload.chunks():
+            output.write(chunk)
+
+
+def stage_batch(batch, files=(), archive=None, members=()):
+    """
+    Move a batch's uploaded files to its directory, before the request ends
+    and Django deletes them.
+
+    Args:
+        batch: GalleryUploadBatch the files belong to
+        files: Uploaded image files
+        archive: Uploaded zip file, or None
+        members: Image names in the zip to add (see archive_members)
+
+    Returns:
+        List of (display name, path, zip member or None) for process_batch
+    """
+    directory = batch_dir(batch.pk)
+    directory.mkdir(parents=True, exist_ok=True)
+    sources = []
+    for index, upload in enumerate(files):
+        path = directory / f'{index:05d}{os.path.splitext(upload.name)[1].lower()}'
+        _store_upload(upload, path)
+        sources.append((upload.name, str(path), None))
+    if archive is not None:
+        path = directory / 'archive.zip'
+        _store_upload(archive, path)
+        sources.extend((os.path.basename(member), str(path), member) for member in members)
+    return sources
+
+
+def _get_executor():
+    """Per-process pools: one thread running batches, BULK_UPLOAD_WORKERS processing images."""
+    global _executor, _workers
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gallery-upload')
+            _workers = ThreadPoolExecutor(
+                max_workers=settings.BULK_UPLOAD_WORKERS,
+                thread_name_prefix='gallery-upload-worker',
+            )
+        return _executor, _workers
+
+
+def start_batch(batch_id, sources):
+    """Process a batch in the background once the current transaction commits."""
+    transaction.on_commit(lambda: _get_executor()[0].submit(_run_in_thread, process_batch, batch_id, sources))
+
+
+def _run_in_thread(function, *args):
+    try:
+        return function(*args)
+    finally:
+        # Worker threads have their own connections; don't leak them
+        close_old_connections()
+
+
+@contextmanager
+def _open_source(path, member):
+    if member is None:
+        with open(path, 'rb') as file:
+            yield file, os.path.getsize(path)
+        return
+    # ZipFile objects can't be shared between threads, so each opens its own
+    with zipfile.ZipFile(path) as zip_file:
+        info = zip_file.getinfo(member)
+        with zip_file.open(info) as file:
+            yield file, info.file_size
+
+
+def strip_metadata(data):
+    """
+    Return image bytes without EXIF/XMP metadata, with the EXIF orientation
+    applied to the pixels and any colour profile kept.
+
+    Raises:
+        ValidationError: if Pillow can't read the image
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image_format = image.format
+            if image_format not in ('JPEG', 'PNG', 'WEBP', 'GIF'):
+                raise ValidationError('Unsupported image format.')
+            if image_format == 'GIF':
+                # GIFs carry no EXIF, and re-encoding would drop animation
+                image.verify()
+                return data, 'gif'
+            image.load()
+            icc_profile = image.info.get('icc_profile')
+            orientation = image.getexif().get(0x0112, 1)
+            if orientation != 1:
+                image = ImageOps.exif_transpose(image)
+            output = BytesIO()
+            if image_format == 'JPEG':
+                # Keep the original quantization tables when the pixels are unchanged
+                quality = 'keep' if orientation == 1 else 90
+                image.save(output, 'JPEG', quality=quality, icc_profile=icc_profile)
+            elif image_format == 'PNG':
+                image.save(output, 'PNG', icc_profile=icc_profile)
+            else:
+                image.save(output, 'WEBP', quality=90, icc_profile=icc_profile)
+    except ValidationError:
+        raise
+    except Exception:
+        raise ValidationError('Not a valid image file.')
+    return output.getvalue(), {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}[image_format]
+
+
+def process_file(batch, index, name, path, member):
+    """
+    Check, clean and store one image of a batch (run in the worker pool).
+
+    Returns:
+        Unsaved GalleryItem with its image and admin thumbnail stored
+
+    Raises:
+        ValidationError: if the file is rejected
+    """
+    from .models import GalleryItem
+    from .thumbnails import make_thumbnail
+
+    if not _is_image_name(name):
+        raise ValidationError(f'Allowed file types: {", ".join(image_extensions())}.')
+    limit = get_upload_size_limit('image')
+    with _open_source(path, member) as (file, size):
+        if size > limit:
+            raise ValidationError(f'File exceeds the maximum allowed size of {limit / (1024 * 1024):.1f}MB.')
+        data = file.read(limit + 1)
+    if len(data) > limit:
+        raise ValidationError(f'File exceeds the maximum allowed size of {limit / (1024 * 1024):.1f}MB.')
+    data, extension = strip_metadata(data)
+
+    stem = os.path.splitext(name)[0]
+    item = GalleryItem(
+        title=f'{batch.title} {index + 1}' if batch.title else stem[:200],
+        media_type='image',
+        event_type=batch.event_type,
+        event_date=batch.event_date,
+        is_active=batch.is_active,
+    )
+    item.full_clean(exclude=['image', 'admin_thumbnail'], validate_unique=False)
+
+    image_field = GalleryItem._meta.get_field('image')
+    item.image = image_field.storage.save(
+        image_field.generate_filename(item, f'{stem}.{extension}'), ContentFile(data)
+    )
+    thumbnail = make_thumbnail(BytesIO(data))
+    if thumbnail is not None:
+        thumbnail_field = GalleryItem._meta.get_field('admin_thumbnail')
+        item.admin_thumbnail = thumbnail_field.storage.save(
+            thumbnail_field.generate_filename(item, f'{stem}.jpg'), ContentFile(thumbnail)
+        )
+    return item
+
+
+def _create_items(items):
+    from .changes import record_bulk_changes
+    from .models import GalleryItem
+
+    try:
+        with transaction.atomic():
+            GalleryItem.objects.bulk_create(items)
+            record_bulk_changes(GalleryItem, items, created=True)
+    except Exception:
+        # Release the stored files nothing refers to
+        for item in items:
+            for file in (item.image, item.admin_thumbnail):
+                if file:
+                    file.storage.delete(file.name)
+        raise
+
+
+def process_batch(batch_id, sources):
+    """
+    Turn a staged batch into gallery items, updating its progress as files
+    finish.
+
+    Args:
+        batch_id: GalleryUploadBatch primary key
+        sources: List of (display name, path, zip member or None) from stage_batch
+    """
+    from .models import GalleryItem, GalleryUploadBatch
+    from .transfer import invalidate_after_bulk_write
+
+    batch = GalleryUploadBatch.objects.get(pk=batch_id)
+    _executor, workers = _get_executor()
+    processed = created = 0
+    errors = list(batch.errors)
+    pending = []
+    status = 'failed'
+    try:
+        futures = {
+            workers.submit(_run_in_thread, process_file, batch, index, name, path, member): name
+            for index, (name, path, member) in enumerate(sources)
+        }
+        last_update = time.monotonic()
+        for future in as_completed(futures):
+            processed += 1
+            try:
+                pending.append(future.result())
+            except ValidationError as e:
+                errors.append([futures[future], ' '.join(e.messages)])
+            except Exception:
+                logger.exception('Bulk upload %s: could not process %s', batch_id, futures[future])
+                errors.append([futures[future], 'The file could not be processed.'])
+            if (
+                len(pending) >= CREATE_CHUNK_SIZE
+                or processed == len(futures)
+                or time.monotonic() - last_update >= 1
+            ):
+                if pending:
+                    _create_items(pending)
+                    created += len(pending)
+                    pending = []
+                GalleryUploadBatch.objects.filter(pk=batch_id).update(
+                    processed=processed, created_items=created, errors=errors,
+                    # Progress keeps the batch from looking stalled (see fail_stale_batches)
+                    updated_at=timezone.now(),
+                )
+                last_update = time.monotonic()
+        status = 'done'
+    except Exception:
+        logger.exception('Bulk upload %s failed', batch_id)
+    finally:
+        shutil.rmtree(batch_dir(batch_id), ignore_errors=True)
+        if created:
+            invalidate_after_bulk_write([GalleryItem])
+        batch.status = status
+        batch.processed = processed
+        batch.created_items = created
+        batch.errors = errors
+        batch.save(update_fields=['status', 'processed', 'created_items', 'errors', 'updated_at'])
+
+
+def fail_stale_batches(max_age=None):
+    """
+    Mark batches whose job stopped without finishing (the process was
+    restarted or killed) as failed, and remove leftover staged files.
+
+    Args:
+        max_age: Timedelta without progress after which a batch counts as
+            stopped (default BULK_UPLOAD_STALE_MINUTES)
+
+    Returns:
+        (number of batches marked failed, number of directories removed)
+    """
+    from .models import GalleryUploadBatch
+
+    max_age = max_age or timedelta(minutes=settings.BULK_UPLOAD_STALE_MINUTES)
+    cutoff = timezone.now() - max_age
+    stale = list(
+        GalleryUploadBatch.objects.filter(status='processing', updated_at__lt=cutoff).values_list('pk', flat=True)
+    )
+    failed = GalleryUploadBatch.objects.filter(pk__in=stale, status='processing').update(
+        status='failed', updated_at=timezone.now(),
+    )
+
+    # Directories of stopped batches, and of uploads whose request failed
+    # after staging (no batch row); recent ones may belong to a batch being saved
+    processing = {str(pk) for pk in GalleryUploadBatch.objects.filter(status='processing').values_list('pk', flat=True)}
+    removed = 0
+    root = Path(settings.BULK_UPLOAD_DIR)
+    if root.is_dir():
+        for directory in root.iterdir():
+            if not directory.is_dir() or directory.name in processing:
+                continue
+            if directory.stat().st_mtime >= cutoff.timestamp():
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+    return failed, removed
@@ -0,0 +1,142 @@
+"""
+Change feed for delta sync of public content.
+
+Every save or delete of a model exposed by the public API is recorded in
+``ChangeLogEntry`` with a monotonically increasing sequence number. Clients
+keep the last sequence number they have seen and fetch
+``/api/changes/?since=<seq>`` to get only what changed since then, rendered
+with the same serializers as the list endpoints.
+
+Objects that were changed but are not (or no longer) publicly visible, e.g.
+an unpublished blog post, are reported as deleted so clients drop them.
+"""
+from functools import lru_cache
+
+from django.apps import apps
+from django.db import transaction
+
+from .models import ChangeLogEntry
+
+# Child models whose changes are reported as an update of their parent
+# (they are serialized nested in the parent), mapped to the parent FK
+PARENT_FIELDS = {
+    'api.BlogPostImage': 'blog_post',
+    'api.BlogPostVideo': 'blog_post',
+}
+
+
+@lru_cache(maxsize=None)
+def public_resources():
+    """Return {model label: (URL prefix, viewset class)} for the public API."""
+    from .urls import router
+
+    resources = {}
+    for prefix, viewset_class, _basename in router.registry:
+        model = viewset_class.serializer_class.Meta.model
+        # The first registration of a model is its canonical endpoint
+        resources.setdefault(model._meta.label, (prefix, viewset_class))
+    return resources
+
+
+def record_change(sender, instance, created=None, update_fields=None, **kwargs):
+    """Signal handler: append a change log entry once the change is committed."""
+    # View counter updates on blog post detail pages aren't content changes
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+
+    label = sender._meta.label
+    if label in PARENT_FIELDS:
+        field = sender._meta.get_field(PARENT_FIELDS[label])
+        label = field.related_model._meta.label
+        object_id = getattr(instance, field.attname)
+        operation = 'updated'
+    else:
+        object_id = instance.pk
+        if created is None:
+            operation = 'deleted'
+        else:
+            operation = 'created' if created else 'updated'
+
+    # Written after commit, so sequence numbers follow commit order and a
+    # rolled back change is never reported
+    transaction.on_commit(
+        lambda: ChangeLogEntry.objects.create(model=label, object_id=object_id, operation=operation)
+    )
+
+
+def record_bulk_changes(model, objects, created):
+    """
+    Append change log entries for objects written with bulk_create or
+    bulk_update (which send no save signals), once the change is committed.
+    """
+    label = model._meta.label
+    if label in PARENT_FIELDS:
+        field = model._meta.get_field(PARENT_FIELDS[label])
+        label = field.related_model._meta.label
+        object_ids = sorted({getattr(obj, field.attname) for obj in objects})
+        operation = 'updated'
+    else:
+        object_ids = [obj.pk for obj in objects]
+        operation = 'created' if created else 'updated'
+    entries = [ChangeLogEntry(model=label, object_id=object_id, operation=operation) for object_id in object_ids]
+    transaction.on_commit(lambda: ChangeLogEntry.objects.bulk_create(entries, batch_size=1000))
+
+
+def tracked_models():
+    """Return the models whose changes are recorded."""
+    labels = list(public_resources()) + list(PARENT_FIELDS)
+    return [apps.get_model(label) for label in labels]
+
+
+def get_changes(request, since, limit):
+    """
+    Return the public objects changed after sequence number ``since``.
+
+    Several changes of the same object are collapsed into the latest one.
+
+    Returns:
+        (changes, next_seq, has_more)
+    """
+    entries = list(ChangeLogEntry.objects.filter(seq__gt=since).order_by('seq')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for entry in entries:
+        key = (entry.model, entry.object_id)
+        # Re-insert so the collapsed change keeps the position of its last entry
+        latest.pop(key, None)
+        latest[key] = entry
+
+    ids_by_model = {}
+    for model, object_id in latest:
+        ids_by_model.setdefault(model, set()).add(object_id)
+
+    resources = public_resources()
+    serialized = {}
+    for model, ids in ids_by_model.items():
+        if model not in resources:
+            continue
+        _prefix, viewset_class = resources[model]
+        view = viewset_class(request=request, format_kwarg=None, kwargs={}, action='list')
+        queryset = view.get_queryset()
+        if queryset.query.is_sliced:
+            objects = [obj for obj in queryset if obj.pk in ids]
+        else:
+            objects = queryset.filter(pk__in=ids)
+        for data in view.get_serializer(objects, many=True).data:
+            serialized[(model, data['id'])] = data
+
+    changes = []
+    for key, entry in latest.items():
+        data = serialized.get(key)
+        changes.append({
+            'seq': entry.seq,
+            'resource': resources[entry.model][0] if entry.model in resources else entry.model,
+            'id': entry.object_id,
+            'operation': entry.operation if data is not None else 'deleted',
+            'data': data,
+            'timestamp': entry.created_at,
+        })
+    next_seq = entries[-1].seq if entries else since
+    return changes, next_seq, has_more
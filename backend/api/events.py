@@ -0,0 +1,271 @@
+"""
+Server-Sent Events stream of published updates (/api/updates/stream/).
+
+Clients open an ``EventSource`` instead of polling /api/updates/. All
+connections of a process share one ``UpdateHub``: a single background task
+reads new change log entries (see ``api.changes``) and fans the published
+updates out to every connection's queue, so idle connections cost no
+database queries. The task only runs while someone is connected, and saves
+made in the same process wake it immediately.
+
+Every event carries the change log sequence number as its id. Browsers send
+it back in the ``Last-Event-ID`` header when they reconnect, and missed
+events are replayed from the hub's recent history (or the change log).
+
+Streaming needs the ASGI application (bencyn_susu/asgi.py). Under WSGI the
+endpoint answers each request with the events missed so far and a long
+``retry`` interval, so EventSource clients degrade to polling.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+
+from .models import ChangeLogEntry, Update
+from .serializers import UpdateSerializer
+
+logger = logging.getLogger(__name__)
+
+UPDATE_MODEL = 'api.Update'
+
+# Reconnect delay sent to clients (ms); under WSGI this is the polling interval
+RETRY_MS = 3000
+FALLBACK_RETRY_MS = 15000
+
+
+def latest_seq():
+    """Return the newest change log sequence number (0 when empty)."""
+    close_old_connections()
+    return ChangeLogEntry.objects.order_by('-seq').values_list('seq', flat=True).first() or 0
+
+
+def fetch_events(after, limit=500):
+    """
+    Return the published updates changed after change log sequence ``after``.
+
+    Several changes of the same update are collapsed into the latest one.
+
+    Returns:
+        (events, cursor): events as (seq, serialized update) pairs oldest
+        first, and the last sequence number scanned
+    """
+    close_old_connections()
+    entries = list(
+        ChangeLogEntry.objects.filter(seq__gt=after).order_by('seq')
+        .values_list('seq', 'model', 'object_id')[:limit]
+    )
+    if not entries:
+        return [], after
+
+    latest = {}
+    for seq, model, object_id in entries:
+        if model == UPDATE_MODEL:
+            latest.pop(object_id, None)
+            latest[object_id] = seq
+
+    events = []
+    if latest:
+        updates = Update.objects.filter(published=True).in_bulk(list(latest))
+        for object_id, seq in latest.items():
+            if object_id in updates:
+                events.append((seq, UpdateSerializer(updates[object_id]).data))
+    return events, entries[-1][0]
+
+
+class Subscriber:
+    """One stream connection's queue of (seq, data) events."""
+
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize)
+        # Set when the client falls too far behind; the stream then ends and
+        # the client resumes from its Last-Event-ID
+        self.overflowed = False
+
+
+class UpdateHub:
+    """
+    Polls the change log once per interval and fans new events out to all
+    subscribers of this process.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.history = deque(maxlen=settings.UPDATE_STREAM_HISTORY)
+        # Events after this sequence number are all in ``history``
+        self.history_start = None
+        self.cursor = None
+        self._task = None
+        self._loop = None
+        self._wake = None
+
+    async def subscribe(self):
+        if self.cursor is None:
+            seq = await sync_to_async(latest_seq)()
+            if self.cursor is None:
+                self.cursor = self.history_start = seq
+        subscriber = Subscriber(settings.UPDATE_STREAM_HISTORY)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def replay(self, last_id):
+        """Return the events after ``last_id`` up to the hub's cursor."""
+        if last_id >= self.cursor:
+            return []
+        if last_id >= self.history_start:
+            return [event for event in self.history if event[0] > last_id]
+        events, _cursor = await sync_to_async(fetch_events)(last_id, limit=settings.UPDATE_STREAM_HISTORY)
+        return events
+
+    def notify(self):
+        """Wake the poller now; safe to call from any thread."""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or self._task is None or self._task.done():
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            # Event loop already closed
+            pass
+
+    async def _run(self):
+        while self.subscribers:
+            self._wake.clear()
+            try:
+                events, cursor = await sync_to_async(fetch_events)(self.cursor)
+            except Exception:
+                logger.exception('Could not read the change log for the update stream')
+                events, cursor = [], self.cursor
+            for seq, data in events:
+                self._publish(seq, data)
+            caught_up = cursor == self.cursor
+            self.cursor = cursor
+            if not caught_up:
+                # A full page may mean more entries are waiting
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.UPDATE_STREAM_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        # Nobody is listening; start from the latest entry next time
+        self.cursor = self.history_start = None
+        self.history.clear()
+
+    def _publish(self, seq, data):
+        if len(self.history) == self.history.maxlen:
+            self.history_start = self.history[0][0]
+        self.history.append((seq, data))
+        for subscriber in self.subscribers:
+            try:
+                subscriber.queue.put_nowait((seq, data))
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+
+
+hub = UpdateHub()
+
+
+def wake_update_hub(sender, instance, created=False, **kwargs):
+    """Signal handler: push new update changes without waiting for the next poll."""
+    if created and instance.model == UPDATE_MODEL:
+        hub.notify()
+
+
+def _format_event(seq, data):
+    return f'id: {seq}\nevent: update\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+def _matches(data, filters):
+    return all(data.get(field) == value for field, value in filters.items())
+
+
+def _last_event_id(request):
+    # EventSource sends the header on reconnect; the query parameter lets
+    # clients resume across page loads
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def _stream(last_id, filters):
+    subscriber = await hub.subscribe()
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        if last_id is None:
+            # An id-only message sets the client's Last-Event-ID without an event
+            last_id = hub.cursor
+            yield f'id: {last_id}\n\n'
+        else:
+            for seq, data in await hub.replay(last_id):
+                last_id = seq
+                if _matches(data, filters):
+                    yield _format_event(seq, data)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.UPDATE_STREAM_MAX_DURATION
+        while not subscriber.overflowed:
+            timeout = min(settings.UPDATE_STREAM_HEARTBEAT, deadline - loop.time())
+            if timeout <= 0:
+                # Reconnecting periodically lets the server drop connections
+                # of clients that went away without closing them
+                break
+            try:
+                seq, data = await asyncio.wait_for(subscriber.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            if seq <= last_id:
+                # Already sent during the replay
+                continue
+            last_id = seq
+            if _matches(data, filters):
+                yield _format_event(seq, data)
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+async def update_stream_view(request):
+    """
+    Stream newly published updates as Server-Sent Events.
+
+    Optional 'type' and 'priority' query parameters filter the events like
+    they filter /api/updates/. Each event's data is the serialized update.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    last_id = _last_event_id(request)
+    filters = {field: request.GET[field] for field in ('type', 'priority') if request.GET.get(field)}
+
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker can't hold the connection open: send what was missed
+        # and let the client poll again after FALLBACK_RETRY_MS
+        lines = [f'retry: {FALLBACK_RETRY_MS}\n\n']
+        if last_id is None:
+            lines.append(f'id: {await sync_to_async(latest_seq)()}\n\n')
+        else:
+            events, cursor = await sync_to_async(fetch_events)(last_id, limit=settings.UPDATE_STREAM_HISTORY)
+            lines.extend(_format_event(seq, data) for seq, data in events if _matches(data, filters))
+            lines.append(f'id: {cursor}\n\n')
+        response = HttpResponse(''.join(lines), content_type='text/event-stream')
+    else:
+        response = StreamingHttpResponse(_stream(last_id, filters), content_type='text/event-stream')
+        # Disable proxy buffering (nginx) so events are delivered immediately
+        response['X-Accel-Buffering'] = 'no'
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,87 @@
+"""
+Facet counts for the public filter UIs (blog categories, gallery event and
+media types, update types and priorities, and year/month buckets).
+
+Each model is aggregated with a single GROUP BY over all of its facet
+dimensions; the per-facet counts are then summed in Python from those few
+rows. The result is cached until published content changes.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from . import metrics
+from .models import BlogPost, GalleryItem, Update
+
+FACETS_CACHE_KEY = 'api:facets'
+
+# Public queryset, facet fields and date field per facet group
+FACET_SOURCES = {
+    'blog_posts': (BlogPost.objects.filter(published=True), ['category'], 'created_date'),
+    'gallery': (GalleryItem.objects.filter(is_active=True), ['event_type', 'media_type'], 'event_date'),
+    'updates': (Update.objects.filter(published=True), ['type', 'priority'], 'created_date'),
+}
+
+
+def _aggregate(queryset, fields, date_field):
+    model = queryset.model
+    rows = (
+        queryset
+        .annotate(year=ExtractYear(date_field), month=ExtractMonth(date_field))
+        .values(*fields, 'year', 'month')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+
+    totals = {field: Counter() for field in fields}
+    months = Counter()
+    total = 0
+    for row in rows:
+        total += row['count']
+        for field in fields:
+            totals[field][row[field]] += row['count']
+        if row['year'] is not None:
+            months[(row['year'], row['month'])] += row['count']
+
+    group = {'total': total}
+    for field in fields:
+        labels = dict(model._meta.get_field(field).flatchoices)
+        group[field] = [
+            {'value': value, 'label': str(labels.get(value, value)), 'count': count}
+            for value, count in sorted(totals[field].items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+    group['year_month'] = [
+        {'year': year, 'month': month, 'count': count}
+        for (year, month), count in sorted(months.items(), reverse=True)
+    ]
+    return group
+
+
+def compute_facets():
+    """Compute facet counts for all public content (one query per model)."""
+    return {
+        name: _aggregate(queryset.all(), fields, date_field)
+        for name, (queryset, fields, date_field) in FACET_SOURCES.items()
+    }
+
+
+def get_facets():
+    """Return facet counts, from the cache when content hasn't changed."""
+    facets = cache.get(FACETS_CACHE_KEY)
+    metrics.record_cache_lookup('facets', facets is not None)
+    if facets is None:
+        facets = compute_facets()
+        cache.set(FACETS_CACHE_KEY, facets, settings.FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_facets(sender, instance=None, update_fields=None, **kwargs):
+    """Signal handler: drop cached facets once a content change is committed."""
+    # View counter updates on blog post detail pages don't affect facets
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    transaction.on_commit(lambda: cache.delete(FACETS_CACHE_KEY))
@@ -0,0 +1,173 @@
+"""
+RSS and Atom feeds of the latest blog posts, updates and gallery items
+(/api/feeds/<name>.rss and /api/feeds/<name>.atom).
+
+Each feed reads the newest FEED_ITEMS rows through the same indexed
+published/date ordering as the list endpoints. The rendered XML is cached
+until content of that feed's model changes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.text import Truncator
+
+from . import metrics
+from .models import BlogPost, GalleryItem, Update
+
+FEED_FORMATS = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+
+
+class BlogPostFeed(Feed):
+    title = 'B.C BENCYN SUSU - Blog'
+    description = 'Latest articles, financial tips and company news.'
+
+    def link(self):
+        return f'{settings.FRONTEND_URL}/blog'
+
+    def items(self):
+        return BlogPost.objects.filter(published=True).order_by('-created_date')[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt or Truncator(item.content).words(60)
+
+    def item_link(self, item):
+        return f'{settings.FRONTEND_URL}/blog/{item.pk}'
+
+    def item_author_name(self, item):
+        return item.author or None
+
+    def item_categories(self, item):
+        return [item.category]
+
+    def item_pubdate(self, item):
+        return item.created_date
+
+    def item_updateddate(self, item):
+        return item.updated_date
+
+
+class UpdateFeed(Feed):
+    title = 'B.C BENCYN SUSU - Updates'
+    description = 'Announcements, alerts, news and events.'
+
+    def link(self):
+        return f'{settings.FRONTEND_URL}/updates'
+
+    def items(self):
+        return Update.objects.filter(published=True).order_by('-created_date')[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.content
+
+    def item_link(self, item):
+        # Updates have no page of their own
+        return f'{settings.FRONTEND_URL}/updates#update-{item.pk}'
+
+    def item_categories(self, item):
+        return [item.get_type_display()]
+
+    def item_pubdate(self, item):
+        return item.created_date
+
+    def item_updateddate(self, item):
+        return item.updated_date
+
+
+class GalleryFeed(Feed):
+    title = 'B.C BENCYN SUSU - Gallery'
+    description = 'Photos and videos from our events.'
+
+    def link(self):
+        return f'{settings.FRONTEND_URL}/gallery'
+
+    def items(self):
+        return GalleryItem.objects.filter(is_active=True).order_by('-created_at')[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.description
+
+    def item_link(self, item):
+        return f'{settings.FRONTEND_URL}/gallery#gallery-{item.pk}'
+
+    def item_categories(self, item):
+        return [item.get_event_type_display()]
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+
+FEEDS = {
+    'blog-posts': BlogPostFeed,
+    'updates': UpdateFeed,
+    'gallery': GalleryFeed,
+}
+
+FEED_MODELS = {
+    BlogPost: 'blog-posts',
+    Update: 'updates',
+    GalleryItem: 'gallery',
+}
+
+
+def _cache_key(name, feed_format):
+    return f'api:feed:{name}:{feed_format}'
+
+
+def feed_view(request, name, feed_format):
+    """Serve a cached RSS or Atom feed."""
+    if name not in FEEDS or feed_format not in FEED_FORMATS:
+        raise Http404('Unknown feed')
+
+    key = _cache_key(name, feed_format)
+    cached = cache.get(key)
+    metrics.record_cache_lookup('feeds', cached is not None)
+    if cached is None:
+        feed = FEEDS[name]()
+        feed.feed_type = FEED_FORMATS[feed_format]
+        response = feed(request)
+        content = response.content
+        cached = {
+            'content': content,
+            'content_type': response['Content-Type'],
+            'etag': f'"{hashlib.md5(content).hexdigest()}"',
+            'last_modified': response.get('Last-Modified'),
+        }
+        cache.set(key, cached, settings.FEEDS_CACHE_TIMEOUT)
+
+    not_modified = get_conditional_response(request, etag=cached['etag'])
+    if not_modified is not None:
+        response = not_modified
+    else:
+        response = HttpResponse(cached['content'], content_type=cached['content_type'])
+    response['ETag'] = cached['etag']
+    if cached['last_modified']:
+        response['Last-Modified'] = cached['last_modified']
+    return response
+
+
+def invalidate_feeds(sender, instance=None, update_fields=None, **kwargs):
+    """Signal handler: drop the cached feeds of a model once a change is committed."""
+    # View counter updates on blog post detail pages don't affect feeds
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    name = FEED_MODELS[sender]
+    keys = [_cache_key(name, feed_format) for feed_format in FEED_FORMATS]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,148 @@
+"""
+Duplicate suppression for public form submissions.
+
+A submission is identified by its Idempotency-Key header (when the client
+sends one) and by a hash of its normalized content, so case, whitespace and
+Unicode forms don't matter. The first submission claims both in the cache.
+Once it succeeds, its response is stored under the key for the idempotency
+timeout and under the content hash for the duplicate window. Repeats get
+that response back without being validated, sanitized or written again.
+
+A repeat arriving while the first submission is still being processed
+waits up to REPLAY_WAIT seconds for its response, then gets a 409. Failed
+submissions release their claims so they can be corrected and resent.
+
+Repeats are only caught across workers with a shared cache (see CACHES).
+"""
+import hashlib
+import re
+import time
+import unicodedata
+
+from django.core.cache import cache
+
+from . import metrics
+
+# Claims of submissions still being processed expire after this many
+# seconds, so a crashed worker doesn't block resubmission
+PENDING_TIMEOUT = 30
+REPLAY_WAIT = 5.0
+POLL_INTERVAL = 0.1
+
+IDEMPOTENCY_KEY = re.compile(r'^[\x21-\x7e]{1,255}$')
+
+
+class SubmissionInProgress(Exception):
+    """An identical submission is still being processed."""
+
+
+class IdempotencyKeyReused(Exception):
+    """The Idempotency-Key was used for a submission with different content."""
+
+
+def valid_idempotency_key(key):
+    """Idempotency keys are 1-255 printable ASCII characters (e.g. a UUID)."""
+    return bool(IDEMPOTENCY_KEY.match(key))
+
+
+def _normalize(value):
+    value = '' if value is None else str(value)
+    return ' '.join(unicodedata.normalize('NFKC', value).casefold().split())
+
+
+def content_hash(data, fields):
+    """SHA-256 of the normalized values of fields in data (a dict or QueryDict)."""
+    normalized = '\x1f'.join(_normalize(data.get(field)) for field in fields)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+class Submission:
+    """
+    Cache claims of one submission.
+
+    Usage:
+        submission = Submission('contact', request.data, fields, key, key_timeout, window)
+        replay = submission.claim()  # earlier response, or None to process it
+        ...
+        submission.complete(201, data)  # or submission.release() on failure
+    """
+
+    def __init__(self, scope, data, fields, idempotency_key=None, key_timeout=None, window=None):
+        """
+        Args:
+            scope: Name of the form, part of the cache keys
+            data: Submitted values
+            fields: Names of the values compared for duplicates
+            idempotency_key: Value of the Idempotency-Key header, or None
+            key_timeout: Seconds a response is replayed for its idempotency key
+            window: Seconds a response is replayed for identical content
+        """
+        self.scope = scope
+        self.digest = content_hash(data, fields)
+        # Cache key -> seconds the response is kept under it
+        self.keys = {}
+        if idempotency_key:
+            key_digest = hashlib.sha256(idempotency_key.encode()).hexdigest()
+            self.keys[f'api:{scope}:idempotency:{key_digest}'] = key_timeout
+        if window:
+            self.keys[f'api:{scope}:content:{self.digest}'] = window
+        self.claimed = []
+        self.completed = False
+
+    def _claim_key(self, cache_key, deadline):
+        while True:
+            if cache.add(cache_key, {'hash': self.digest}, PENDING_TIMEOUT):
+                return None
+            entry = cache.get(cache_key)
+            if entry is None:
+                # Released or expired in between
+                continue
+            if entry['hash'] != self.digest:
+                raise IdempotencyKeyReused
+            if 'status' in entry:
+                return entry
+            if time.monotonic() >= deadline:
+                raise SubmissionInProgress
+            time.sleep(POLL_INTERVAL)
+
+    def claim(self):
+        """
+        Claim this submission, or find the response to an identical one.
+
+        Returns:
+            {'status': ..., 'data': ...} of the earlier submission's
+            response, or None if this submission should be processed
+
+        Raises:
+            SubmissionInProgress: if an identical submission is still being
+                processed after REPLAY_WAIT seconds
+            IdempotencyKeyReused: if the idempotency key was used for
+                different content
+        """
+        deadline = time.monotonic() + REPLAY_WAIT
+        try:
+            for cache_key in self.keys:
+                entry = self._claim_key(cache_key, deadline)
+                if entry is not None:
+                    metrics.record_cache_lookup(f'{self.scope}_submission', True)
+                    # A new idempotency key for known content replays it too
+                    self.complete(entry['status'], entry['data'])
+                    return entry
+                self.claimed.append(cache_key)
+        except Exception:
+            self.release()
+            raise
+        metrics.record_cache_lookup(f'{self.scope}_submission', False)
+        return None
+
+    def complete(self, status_code, data):
+        """Store the response for repeats of this submission."""
+        for cache_key in self.claimed:
+            cache.set(cache_key, {'hash': self.digest, 'status': status_code, 'data': data}, self.keys[cache_key])
+        self.completed = True
+
+    def release(self):
+        """Drop the claims of a submission that failed, so it can be resent."""
+        if not self.completed:
+            cache.delete_many(self.claimed)
+        self.claimed = []
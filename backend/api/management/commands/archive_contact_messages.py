@@ -0,0 +1,57 @@
+"""
+Move contact messages past their retention period out of the inbox.
+
+Read and unread messages have separate retention periods
+(CONTACT_RETENTION_READ_DAYS / CONTACT_RETENTION_UNREAD_DAYS). They are
+moved in batches into the compressed monthly archive, which is then
+compacted to one row per month. Run daily, e.g. from cron:
+
+    python manage.py archive_contact_messages
+    python manage.py archive_contact_messages --read-days 90 --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from api.archive import archive_messages, compact_archive
+
+
+class Command(BaseCommand):
+    help = 'Move contact messages older than their retention period into the archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--read-days',
+            type=int,
+            help='Keep read messages from the last N days, 0 = all (default: CONTACT_RETENTION_READ_DAYS).',
+        )
+        parser.add_argument(
+            '--unread-days',
+            type=int,
+            help='Keep unread messages from the last N days, 0 = all (default: CONTACT_RETENTION_UNREAD_DAYS).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Messages moved per transaction (default: CONTACT_ARCHIVE_BATCH_SIZE).',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many messages are due.')
+
+    def handle(self, *args, **options):
+        for option in ('read_days', 'unread_days'):
+            if options[option] is not None and options[option] < 0:
+                raise CommandError(f'--{option.replace("_", "-")} must not be negative.')
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        counts = archive_messages(
+            read_days=options['read_days'],
+            unread_days=options['unread_days'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{counts["read"]} read and {counts["unread"]} unread messages are due for archiving.')
+            return
+        months = compact_archive()
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {counts["read"]} read and {counts["unread"]} unread messages; compacted {months} months.'
+        ))
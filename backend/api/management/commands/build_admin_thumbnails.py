@@ -0,0 +1,35 @@
+"""
+Generate the admin list thumbnails of existing images.
+
+New and changed images get one when they're saved; run this once after
+deploying, or with --force after changing ADMIN_THUMBNAIL_SIZE:
+
+    python manage.py build_admin_thumbnails
+    python manage.py build_admin_thumbnails --force
+"""
+from django.core.management.base import BaseCommand
+
+from api.thumbnails import store_admin_thumbnail, thumbnail_models, thumbnail_source
+
+
+class Command(BaseCommand):
+    help = 'Generate missing (or with --force, all) admin list thumbnails.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate existing thumbnails too')
+
+    def handle(self, *args, **options):
+        for model in thumbnail_models():
+            objects = model.objects.all()
+            if not options['force']:
+                objects = objects.filter(admin_thumbnail='')
+            created = failed = 0
+            for obj in objects.iterator(chunk_size=100):
+                if thumbnail_source(obj) is None:
+                    continue
+                if store_admin_thumbnail(obj):
+                    created += 1
+                else:
+                    failed += 1
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {created} thumbnails generated, {failed} unreadable images')
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,152 @@
+"""
+Verify that every public API queryset is served by an index.
+
+Builds the queryset of each registered viewset for every combination of its
+supported query parameters, runs the database's EXPLAIN and flags full table
+scans and sorts that are not satisfied by an index. Exits non-zero when a
+problem is found so index regressions can be caught before deploy:
+
+    python manage.py check_query_plans
+"""
+import re
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.urls import router
+
+
+# Supported query parameters per viewset with a representative value each.
+# Every combination (including none) is checked.
+VIEWSET_FILTERS = {
+    'PageImageViewSet': {'page': 'home', 'section': 'hero'},
+    'BlogPostViewSet': {'category': 'Company News', 'search': 'susu'},
+    'UpdateViewSet': {'type': 'alert', 'priority': 'high'},
+    'GalleryItemViewSet': {'media_type': 'image', 'event_type': 'meeting', 'featured': 'true'},
+}
+
+# Parameters for which a full scan is expected and accepted, with the reason.
+EXPECTED_SCANS = {
+    ('BlogPostViewSet', 'search'): "substring search (icontains) cannot use a B-tree index",
+}
+
+# Patterns marking a full table scan or an unindexed sort in EXPLAIN output
+PLAN_PROBLEMS = {
+    'sqlite': [
+        ('full scan', re.compile(r'\bSCAN (?!.*\bUSING (?:COVERING )?INDEX\b)(?!CONSTANT ROW)\S+')),
+        ('filesort', re.compile(r'USE TEMP B-TREE FOR (?:LAST TERM OF )?ORDER BY')),
+    ],
+    'postgresql': [
+        ('full scan', re.compile(r'Seq Scan on \S+')),
+        ('filesort', re.compile(r'\bSort\b(?! Key)')),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN every public viewset queryset and fail on full scans or unindexed sorts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--viewset',
+            action='append',
+            dest='viewsets',
+            help='Only check the given viewset class name (can be repeated).',
+        )
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print the full EXPLAIN output for every query.',
+        )
+
+    def handle(self, *args, **options):
+        patterns = PLAN_PROBLEMS.get(connection.vendor)
+        if patterns is None:
+            raise CommandError(f'EXPLAIN checks are not supported for the {connection.vendor} backend.')
+
+        factory = APIRequestFactory()
+        failures = 0
+        checked = 0
+
+        for prefix, viewset_class, basename in router.registry:
+            name = viewset_class.__name__
+            if options['viewsets'] and name not in options['viewsets']:
+                continue
+
+            params = VIEWSET_FILTERS.get(name, {})
+            for combo in _param_combinations(params):
+                for action in ('list', 'retrieve'):
+                    queryset = self._build_queryset(factory, prefix, viewset_class, action, combo)
+                    if queryset is None:
+                        continue
+                    plan = self._explain(queryset)
+                    checked += 1
+
+                    problems = [
+                        f'{label}: {match.group(0)}'
+                        for label, pattern in patterns
+                        for match in pattern.finditer(plan)
+                    ]
+                    expected = [
+                        EXPECTED_SCANS[(name, param)]
+                        for param in combo if (name, param) in EXPECTED_SCANS
+                    ]
+                    label = f'{name}.{action}({", ".join(f"{k}={v}" for k, v in combo.items())})'
+
+                    if problems and expected:
+                        self.stdout.write(self.style.WARNING(f'EXPECTED  {label}: {"; ".join(expected)}'))
+                    elif problems:
+                        failures += 1
+                        self.stdout.write(self.style.ERROR(f'FAIL      {label}'))
+                        for problem in problems:
+                            self.stdout.write(f'          - {problem}')
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f'OK        {label}'))
+
+                    if options['show_plans'] or (problems and not expected and options['verbosity'] > 1):
+                        for line in plan.splitlines():
+                            self.stdout.write(f'          | {line}')
+
+        summary = f'Checked {checked} queries on {connection.vendor}: {failures} problem(s).'
+        if failures:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def _build_queryset(self, factory, prefix, viewset_class, action, params):
+        request = Request(factory.get(f'/api/{prefix}/', params))
+        view = viewset_class(request=request, action=action, format_kwarg=None, kwargs={})
+        queryset = view.get_queryset()
+
+        if action == 'retrieve':
+            lookup = view.lookup_field
+            value = 'example-slug' if lookup == 'slug' else 1
+            if queryset.query.is_sliced:
+                # Sliced querysets can't be filtered further and are covered by 'list'
+                return None
+            return queryset.filter(**{lookup: value})
+
+        paginator = view.paginator
+        if paginator is not None and not queryset.query.is_sliced:
+            return queryset[:paginator.get_page_size(request) or 20]
+        return queryset
+
+    def _explain(self, queryset):
+        if connection.vendor != 'postgresql':
+            return queryset.explain()
+        # Tiny tables make PostgreSQL prefer sequential scans regardless of
+        # indexes; disable them so the plan shows whether an index *can* be used.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+            return queryset.explain()
+
+
+def _param_combinations(params):
+    keys = sorted(params)
+    for size in range(len(keys) + 1):
+        for combo in combinations(keys, size):
+            yield {key: params[key] for key in combo}
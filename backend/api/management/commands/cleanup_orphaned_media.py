@@ -0,0 +1,205 @@
+"""
+Find and delete media files that no database row references any more.
+
+Files of deleted objects, and files replaced by a new upload, stay in
+storage forever. This command collects every file name referenced by a
+file field into a compact sorted array of 64-bit hashes, walks the storage
+listing directory by directory and reports (or deletes) every file that is
+not referenced and is older than the grace period:
+
+    python manage.py cleanup_orphaned_media --dry-run
+    python manage.py cleanup_orphaned_media --grace-hours 48 --workers 16
+
+Memory use stays bounded: 8 bytes per referenced file plus one directory
+listing at a time, and at most a few batches of pending deletions.
+"""
+import hashlib
+import heapq
+from array import array
+from bisect import bisect_left
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.media import is_content_addressed, iter_file_fields, sha256_from_name
+from api.models import ChunkedUpload, MediaBlob, PendingUpload
+from api.storage import STAGED_PREFIX, get_media_backend, get_staging_storage
+
+
+def name_hash(name):
+    """Return a 64-bit hash of a storage name."""
+    return int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ReferenceSet:
+    """
+    Sorted array of 64-bit name hashes; ~8 bytes per name.
+
+    Hashes are sorted in chunks that are then merged, so building the set
+    never holds more than one chunk as Python objects. A hash collision can
+    only make an orphan look referenced, so it is never deleted by mistake.
+    """
+
+    def __init__(self, names, chunk_size=50000):
+        chunks = []
+        buffer = []
+        for name in names:
+            buffer.append(name_hash(name))
+            if len(buffer) >= chunk_size:
+                chunks.append(array('Q', sorted(buffer)))
+                buffer = []
+        chunks.append(array('Q', sorted(buffer)))
+        self._hashes = array('Q', heapq.merge(*chunks))
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, name):
+        value = name_hash(name)
+        index = bisect_left(self._hashes, value)
+        return index < len(self._hashes) and self._hashes[index] == value
+
+
+def referenced_names(chunk_size=5000):
+    """Yield every file name stored in the database."""
+    for model, field in iter_file_fields():
+        yield from (
+            model._base_manager.exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+            .values_list(field.attname, flat=True).iterator(chunk_size=chunk_size)
+        )
+    # Uploads that are finished but not yet attached to an object, or whose
+    # background upload is still in progress
+    yield from ChunkedUpload.objects.exclude(stored_name='').values_list('stored_name', flat=True).iterator(chunk_size=chunk_size)
+    yield from (
+        PendingUpload.objects.exclude(status='done').values_list('staged_name', flat=True).iterator(chunk_size=chunk_size)
+    )
+
+
+def walk_storage(storage, path=''):
+    """Yield the names of all files in a storage, one directory listing at a time."""
+    pending = [path]
+    while pending:
+        directory = pending.pop()
+        try:
+            directories, files = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        prefix = f'{directory.rstrip("/")}/' if directory else ''
+        for name in files:
+            yield prefix + name
+        pending.extend(prefix + name for name in directories)
+
+
+class Command(BaseCommand):
+    help = 'Report or delete media files that are no longer referenced by any database row.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report orphaned files, do not delete them.',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Keep unreferenced files modified within this many hours (default: 24).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of parallel stat/delete workers (default: 8).',
+        )
+        parser.add_argument(
+            '--path',
+            default='',
+            help='Only scan this directory of the media storage.',
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.verbosity = options['verbosity']
+        self.released_blobs = []
+        self.grace_hours = options['grace_hours']
+        self.cutoff = timezone.now() - timedelta(hours=self.grace_hours)
+
+        references = ReferenceSet(referenced_names())
+        self.stdout.write(f'{len(references)} file references loaded.')
+
+        sources = [(get_media_backend(), '')]
+        if not options['path']:
+            sources.append((get_staging_storage(), STAGED_PREFIX))
+
+        self.scanned = self.orphaned = self.deleted = self.kept_recent = self.failed = self.freed_bytes = 0
+        max_in_flight = max(1, options['workers']) * 4
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            in_flight = set()
+            for storage, prefix in sources:
+                try:
+                    names = walk_storage(storage, options['path'])
+                    for name in names:
+                        self.scanned += 1
+                        if prefix + name in references:
+                            continue
+                        in_flight.add(executor.submit(self._collect, storage, prefix, name))
+                        if len(in_flight) >= max_in_flight:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            self._report(done)
+                except NotImplementedError:
+                    raise CommandError(f'{type(storage).__name__} does not support listing files.')
+            self._report(wait(in_flight).done)
+        self._delete_blob_rows()
+
+        action = 'would be deleted' if self.dry_run else 'deleted'
+        summary = (
+            f'Scanned {self.scanned} files: {self.orphaned} orphaned, {self.kept_recent} kept (newer than grace period), '
+            f'{self.deleted} {action} ({self.freed_bytes / (1024 * 1024):.1f}MB), {self.failed} failed.'
+        )
+        self.stdout.write(self.style.WARNING(summary) if self.failed else self.style.SUCCESS(summary))
+
+    def _collect(self, storage, prefix, name):
+        """Check one unreferenced file and delete it if it is past the grace period."""
+        try:
+            try:
+                recent = storage.get_modified_time(name) > self.cutoff
+            except NotImplementedError:
+                # Some remote storages can't tell a file's age; only delete
+                # those files when the grace period is explicitly disabled
+                recent = self.grace_hours > 0
+            if recent:
+                return 'recent', prefix + name, 0
+            size = storage.size(name) or 0
+            if not self.dry_run:
+                storage.delete(name)
+            return 'deleted', prefix + name, size
+        except Exception as e:
+            return 'failed', prefix + name, e
+
+    def _report(self, futures):
+        for future in futures:
+            result, name, detail = future.result()
+            if result == 'recent':
+                self.orphaned += 1
+                self.kept_recent += 1
+            elif result == 'deleted':
+                self.orphaned += 1
+                self.deleted += 1
+                self.freed_bytes += detail
+                if is_content_addressed(name) and not self.dry_run:
+                    self.released_blobs.append(sha256_from_name(name))
+                    if len(self.released_blobs) >= 500:
+                        self._delete_blob_rows()
+                if self.verbosity > 1 or self.dry_run:
+                    self.stdout.write(f'{"Would delete" if self.dry_run else "Deleted"} {name}')
+            else:
+                self.failed += 1
+                self.stderr.write(f'Could not delete {name}: {detail}')
+
+    def _delete_blob_rows(self):
+        # Deleted content-addressed files must not be shared by later uploads
+        if self.released_blobs:
+            MediaBlob.objects.filter(sha256__in=self.released_blobs).delete()
+            self.released_blobs = []
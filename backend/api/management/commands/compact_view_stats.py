@@ -0,0 +1,23 @@
+"""
+Compact blog post view statistics.
+
+Merges hourly view buckets older than VIEW_HOURLY_RETENTION_HOURS into
+daily buckets and deletes daily buckets older than
+VIEW_DAILY_RETENTION_DAYS. Run daily, e.g. from cron:
+
+    python manage.py compact_view_stats
+"""
+from django.core.management.base import BaseCommand
+
+from api.popularity import compact_buckets, flush_views
+
+
+class Command(BaseCommand):
+    help = 'Merge old hourly blog post view buckets into daily ones and drop expired days.'
+
+    def handle(self, *args, **options):
+        flush_views()
+        merged, deleted = compact_buckets()
+        self.stdout.write(self.style.SUCCESS(
+            f'Merged {merged} hourly buckets into days, deleted {deleted} expired daily buckets.'
+        ))
@@ -0,0 +1,45 @@
+"""
+Export all public content, with media file references, as JSON Lines.
+
+The file can be loaded into another environment with import_content (the
+media files themselves are copied separately):
+
+    python manage.py export_content --output content.jsonl
+    python manage.py export_content --models blogpost blogpostimage blogpostvideo > posts.jsonl
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.transfer import export_models, iter_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Export public content to JSON Lines (one object per line).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help='File to write (default: standard output).')
+        parser.add_argument('--models', nargs='+', metavar='MODEL', help='Only export these models, e.g. blogpost galleryitem.')
+
+    def handle(self, *args, **options):
+        models = export_models()
+        if options['models']:
+            wanted = {name.lower().replace('api.', '') for name in options['models']}
+            unknown = wanted - {model._meta.model_name for model in models}
+            if unknown:
+                raise CommandError(f'Not exportable: {", ".join(sorted(unknown))}')
+            models = [model for model in models if model._meta.model_name in wanted]
+
+        start = time.perf_counter()
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        rows = 0
+        try:
+            for chunk in iter_jsonl(model.objects.all() for model in models):
+                output.write(chunk)
+                rows += chunk.count('\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - start
+        self.stderr.write(self.style.SUCCESS(f'Exported {rows} objects in {elapsed:.1f}s ({rows / (elapsed or 1):.0f}/s).'))
@@ -0,0 +1,40 @@
+"""
+Mark gallery bulk uploads whose background job stopped as failed.
+
+Bulk uploads are processed in the web process (see api/bulk_upload.py), so
+a worker timeout, restart or deploy during a batch stops it and loses its
+staged files, leaving the batch "processing" forever. This marks batches
+without progress for BULK_UPLOAD_STALE_MINUTES as failed, so their
+progress page stops waiting, and removes leftover staged files. Items
+already added to the gallery are kept. Run it periodically, e.g. hourly
+from cron:
+
+    python manage.py fail_stale_uploads
+    python manage.py fail_stale_uploads --minutes 120
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.bulk_upload import fail_stale_batches
+
+
+class Command(BaseCommand):
+    help = 'Mark bulk uploads stopped by a worker restart as failed and remove their staged files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=settings.BULK_UPLOAD_STALE_MINUTES,
+            help='Minutes without progress before a batch counts as stopped (default: BULK_UPLOAD_STALE_MINUTES).',
+        )
+
+    def handle(self, *args, **options):
+        if options['minutes'] < 1:
+            raise CommandError('--minutes must be at least 1.')
+        failed, removed = fail_stale_batches(timedelta(minutes=options['minutes']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Marked {failed} stopped upload(s) as failed, removed {removed} staged upload folder(s).'
+        ))
@@ -0,0 +1,85 @@
+"""
+Import public content exported by export_content (or dumpdata --format jsonl).
+
+Rows are validated and written in batches, each in its own transaction;
+blog posts are matched by slug and everything else by primary key, so
+importing the same file again updates in place. Invalid lines are reported
+and skipped:
+
+    python manage.py import_content content.jsonl
+    python manage.py import_content content.jsonl --dry-run
+    python manage.py import_content - --batch-size 5000 < content.jsonl
+
+--check fails unless the file matches the database, e.g. to verify a
+round trip: python manage.py export_content | python manage.py import_content - --check
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.thumbnails import thumbnail_models
+from api.transfer import import_jsonl
+
+MAX_REPORTED_ERRORS = 50
+
+
+class Command(BaseCommand):
+    help = 'Import public content from JSON Lines with batched bulk writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to read, or - for standard input.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per batch/transaction (default: 1000).')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without keeping any change.')
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Dry run that fails if importing would create or update anything.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        def progress(result):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'{result.rows} rows, {result.rows_per_second:.0f}/s')
+
+        try:
+            source = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8')
+        except OSError as error:
+            raise CommandError(error)
+        with source:
+            result = import_jsonl(
+                source,
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'] or options['check'],
+                progress=progress,
+            )
+
+        for label in sorted(set(result.created) | set(result.updated) | set(result.unchanged)):
+            if not (result.created[label] or result.updated[label] or result.unchanged[label]):
+                continue
+            self.stdout.write(
+                f'{label}: {result.created[label]} created, {result.updated[label]} updated, '
+                f'{result.unchanged[label]} unchanged'
+            )
+        for number, message in result.errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(f'Line {number}: {message}')
+        if len(result.errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(f'... and {len(result.errors) - MAX_REPORTED_ERRORS} more errors')
+
+        summary = (
+            f'{result.rows} rows in {result.elapsed:.1f}s ({result.rows_per_second:.0f}/s), '
+            f'{len(result.errors)} rejected.'
+        )
+        if options['check']:
+            if result.rows or result.errors:
+                raise CommandError(f'The file differs from the database: {summary}')
+            self.stdout.write(self.style.SUCCESS(f'The file matches the database: {summary}'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run, nothing was kept: {summary}'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Imported {summary}'))
+        if result.models & set(thumbnail_models()):
+            self.stdout.write('Run build_admin_thumbnails to create admin previews of imported images.')
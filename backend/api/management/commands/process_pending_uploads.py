@@ -0,0 +1,56 @@
+"""
+Push staged admin uploads to media storage and retry failed ones.
+
+Uploads are normally handled by the in-process worker pool right after the
+admin save. Run this command periodically (e.g. every few minutes from cron)
+to retry failed uploads with backoff and to finish uploads whose worker
+process was restarted:
+
+    python manage.py process_pending_uploads
+    python manage.py process_pending_uploads --limit 50
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.offload import due_uploads, process_upload
+
+
+class Command(BaseCommand):
+    help = 'Upload staged media files to storage, retrying failed uploads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=200,
+            help='Maximum number of uploads to process (default: 200).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.UPLOAD_OFFLOAD_WORKERS,
+            help='Number of parallel uploads (default: UPLOAD_OFFLOAD_WORKERS).',
+        )
+
+    def handle(self, *args, **options):
+        ids = list(due_uploads().values_list('pk', flat=True)[:options['limit']])
+        if not ids:
+            self.stdout.write('No uploads due.')
+            return
+
+        def run(upload_id):
+            try:
+                return process_upload(upload_id)
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            results = list(executor.map(run, ids))
+
+        uploaded = sum(1 for result in results if result)
+        failed = len(results) - uploaded
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stdout.write(style(f'Uploaded {uploaded} file(s), {failed} failed or skipped.'))
@@ -0,0 +1,37 @@
+"""
+Delete change feed entries older than the retention period.
+
+Clients that last synced before the oldest remaining entry get a 410 from
+/api/changes/ and reload all content. Run daily, e.g. from cron:
+
+    python manage.py prune_change_log
+    python manage.py prune_change_log --days 7
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import ChangeLogEntry
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than CHANGE_LOG_RETENTION_DAYS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help='Keep entries from the last N days (default: CHANGE_LOG_RETENTION_DAYS).',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1.')
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Always keep the latest entry so clients can still tell how far behind they are
+        latest = ChangeLogEntry.objects.order_by('-seq').values_list('seq', flat=True).first()
+        deleted, _ = ChangeLogEntry.objects.filter(created_at__lt=cutoff).exclude(seq=latest).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries older than {options["days"]} days.'))
@@ -0,0 +1,172 @@
+"""
+Measure cold-start cost: module import times and time to first request.
+
+Each measurement runs in a fresh interpreter so nothing is already imported:
+
+    python manage.py startup_report                    # import-time report
+    python manage.py startup_report --benchmark 5      # plus startup benchmark
+    python manage.py startup_report --benchmark 5 --budget-ms 1500
+
+With ``--budget-ms`` the command exits non-zero when the median time to
+first request exceeds the budget, so regressions can fail a build.
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Executed in a child interpreter: boot Django the way the WSGI server does and
+# serve a single request, printing the timings of each phase as JSON.
+CHILD_SCRIPT = r'''
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bencyn_susu.settings')
+from django.conf import settings
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+from bencyn_susu.wsgi import application
+app_loaded = time.perf_counter()
+
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+host = next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith('.') and h != '*'), 'localhost')
+environ = {
+    'PATH_INFO': sys.argv[1],
+    'HTTP_HOST': host,
+    'SERVER_NAME': host,
+    'wsgi.url_scheme': 'https',
+    'HTTP_X_FORWARDED_PROTO': 'https',
+    'wsgi.input': BytesIO(),
+}
+setup_testing_defaults(environ)
+status = []
+body = application(environ, lambda s, h, exc_info=None: status.append(s))
+for _chunk in body:
+    pass
+if hasattr(body, 'close'):
+    body.close()
+first_request = time.perf_counter()
+print(json.dumps({
+    'settings_ms': (settings_loaded - start) * 1000,
+    'app_ms': (app_loaded - settings_loaded) * 1000,
+    'request_ms': (first_request - app_loaded) * 1000,
+    'total_ms': (first_request - start) * 1000,
+    'status': status[0] if status else '',
+    'modules': len(sys.modules),
+}))
+'''
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Report module import times and benchmark time to first request in a fresh interpreter.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/api/',
+            help='Request path used for the first request (default: /api/).',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=25,
+            help='Number of modules to list in the import-time report (default: 25).',
+        )
+        parser.add_argument(
+            '--benchmark',
+            type=int,
+            default=0,
+            metavar='RUNS',
+            help='Also boot the application RUNS times and report startup timings.',
+        )
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            default=None,
+            help='Fail if the median time to first request exceeds this many milliseconds.',
+        )
+
+    def handle(self, *args, **options):
+        self._import_report(options['path'], options['top'])
+
+        runs = options['benchmark']
+        if options['budget_ms'] is not None and not runs:
+            runs = 5
+        if runs:
+            median_total = self._benchmark(options['path'], runs)
+            budget = options['budget_ms']
+            if budget is not None and median_total > budget:
+                raise CommandError(
+                    f'Median time to first request {median_total:.0f} ms exceeds the budget of {budget:.0f} ms.'
+                )
+
+    def _run_child(self, path, import_time=False):
+        command = [sys.executable]
+        if import_time:
+            command += ['-X', 'importtime']
+        command += ['-c', CHILD_SCRIPT, path]
+        python_path = os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.environ.get('PYTHONPATH')]))
+        env = dict(os.environ, PYTHONPATH=python_path)
+        result = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Application failed to start:\n{result.stderr[-4000:]}')
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        return timings, result.stderr
+
+    def _import_report(self, path, top):
+        timings, stderr = self._run_child(path, import_time=True)
+
+        modules = []
+        for line in stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+
+        # Top-level imports (depth 0) partition the total import time between packages
+        packages = {}
+        for name, _self_us, cumulative_us, depth in modules:
+            if depth == 0:
+                root = name.split('.')[0]
+                packages[root] = packages.get(root, 0) + cumulative_us
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Import time for first request to {path} ({len(modules)} modules imported)'
+        ))
+        self.stdout.write(f'{"cumulative ms":>14} {"self ms":>9}  module')
+        for name, self_us, cumulative_us, depth in sorted(modules, key=lambda m: m[2], reverse=True)[:top]:
+            self.stdout.write(f'{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {"  " * depth}{name}')
+
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING('Import time by top-level package'))
+        for root, cumulative_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f'{cumulative_us / 1000:>14.1f}  {root}')
+        self.stdout.write('')
+
+    def _benchmark(self, path, runs):
+        results = [self._run_child(path)[0] for _ in range(runs)]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Startup benchmark ({runs} cold starts, first request to {path})'))
+        self.stdout.write(f'{"phase":<22} {"min ms":>9} {"median ms":>10} {"max ms":>9}')
+        for key, label in (
+            ('settings_ms', 'settings import'),
+            ('app_ms', 'WSGI app / setup'),
+            ('request_ms', 'first request'),
+            ('total_ms', 'time to first request'),
+        ):
+            values = [result[key] for result in results]
+            self.stdout.write(
+                f'{label:<22} {min(values):>9.1f} {statistics.median(values):>10.1f} {max(values):>9.1f}'
+            )
+        self.stdout.write(f'Response status: {results[-1]["status"]}; modules loaded: {results[-1]["modules"]}')
+        return statistics.median(result['total_ms'] for result in results)
@@ -0,0 +1,160 @@
+"""
+Media file helpers: content and perceptual hashing, and lookups of which
+objects reference a stored file.
+"""
+import hashlib
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import FileField
+
+# Content-addressed file names start with this prefix (see ContentAddressedStorage)
+CONTENT_ADDRESSED_PREFIX = 'cas/'
+
+# Names as stored by the backend: FileSystemStorage keeps cas/ab/<sha256>.jpg;
+# Cloudinary prepends its PREFIX (e.g. media/), adds a unique suffix and drops
+# image extensions, giving media/cas/ab/<sha256>_x1y2z3
+CONTENT_ADDRESSED_NAME = re.compile(
+    r'(?:^|/)' + re.escape(CONTENT_ADDRESSED_PREFIX)
+    + r'[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?:_[^/.]*)?(?:\.[^/]*)?$'
+)
+
+_HASH_MASK = (1 << 64) - 1
+
+
+def is_content_addressed(name):
+    """Return True if a stored file name was assigned by ContentAddressedStorage."""
+    return bool(name) and CONTENT_ADDRESSED_NAME.search(name) is not None
+
+
+def sha256_from_name(name):
+    """Return the content hash encoded in a content-addressed file name."""
+    return CONTENT_ADDRESSED_NAME.search(name).group('sha256')
+
+
+def content_hash(file, chunk_size=64 * 1024):
+    """
+    Return the SHA-256 hex digest of a file's content.
+
+    The file is read in chunks and rewound afterwards.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def perceptual_hash(file):
+    """
+    Return a 64-bit difference hash (dHash) of an image, or None if the file
+    is not an image Pillow can read.
+
+    Visually similar images (resized, recompressed, slightly edited) get
+    hashes that differ in only a few bits. The value is returned as a signed
+    64-bit integer so it fits a BigIntegerField.
+    """
+    from PIL import Image
+
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            # Let JPEG decode at a reduced size; we only need 9x8 pixels
+            image.draft('L', (64, 64))
+            pixels = list(image.convert('L').resize((9, 8), Image.LANCZOS).getdata())
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two 64-bit perceptual hashes."""
+    return bin((a ^ b) & _HASH_MASK).count('1')
+
+
+def find_similar_blobs(phash, max_distance=None, exclude_sha256=None):
+    """
+    Return stored blobs whose perceptual hash is within max_distance bits.
+
+    Args:
+        phash: Perceptual hash of the new image
+        max_distance: Maximum Hamming distance (default: PHASH_MAX_DISTANCE)
+        exclude_sha256: Content hash to leave out (the image itself)
+
+    Returns:
+        List of (distance, MediaBlob) pairs, closest first
+    """
+    from .models import MediaBlob
+
+    if phash is None:
+        return []
+    if max_distance is None:
+        max_distance = settings.PHASH_MAX_DISTANCE
+
+    candidates = MediaBlob.objects.filter(phash__isnull=False, ref_count__gt=0)
+    if exclude_sha256:
+        candidates = candidates.exclude(sha256=exclude_sha256)
+
+    matches = []
+    # Only the hash column is loaded for the scan; matching blobs are fetched after
+    for pk, other in candidates.values_list('pk', 'phash').iterator(chunk_size=2000):
+        distance = hamming_distance(phash, other)
+        if distance <= max_distance:
+            matches.append((distance, pk))
+    matches.sort()
+    blobs = MediaBlob.objects.in_bulk([pk for _distance, pk in matches])
+    return [(distance, blobs[pk]) for distance, pk in matches if pk in blobs]
+
+
+def add_references(names):
+    """
+    Add a reference to content-addressed files for every time their name is
+    assigned without storing the content again (e.g. by an import).
+    """
+    from django.db.models import F
+
+    from .models import MediaBlob
+
+    counts = Counter(sha256_from_name(name) for name in names if is_content_addressed(name))
+    by_count = {}
+    for sha256, count in counts.items():
+        by_count.setdefault(count, []).append(sha256)
+    for count, hashes in by_count.items():
+        MediaBlob.objects.filter(sha256__in=hashes).update(ref_count=F('ref_count') + count)
+
+
+def iter_file_fields():
+    """Yield (model, field) for every file field of the api app's models."""
+    for model in apps.get_app_config('api').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField):
+                yield model, field
+
+
+def find_references(names):
+    """
+    Return the objects whose file fields reference any of the given names.
+
+    Returns:
+        Dict mapping file name to a list of model instances
+    """
+    references = {}
+    names = list(names)
+    if not names:
+        return references
+    for model, field in iter_file_fields():
+        for obj in model._default_manager.filter(**{f'{field.attname}__in': names}):
+            references.setdefault(getattr(obj, field.attname).name, []).append(obj)
+    return references
@@ -0,0 +1,188 @@
+"""
+Media file serving for deployments that keep media on local disk.
+
+Unlike ``django.views.static.serve`` this supports byte ranges (so videos can
+be seeked), conditional requests (ETag / Last-Modified) and handing the
+transfer off to the web server with X-Accel-Redirect (nginx) or X-Sendfile
+(Apache). Without a handoff, files are streamed with FileResponse, which
+lets the WSGI server use sendfile() where it can.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotAllowed
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .media import is_content_addressed, sha256_from_name
+from .storage import STAGED_PREFIX, get_media_backend, get_staging_storage
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# One year; content-addressed names never change content
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class FileRange:
+    """
+    File-like view of ``length`` bytes of an open file from its current position.
+
+    ``read`` never returns bytes past the range. ``fileno`` is exposed so WSGI
+    servers that honour Content-Length can still use sendfile().
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _resolve(path):
+    """Return (filesystem path, storage name) for a media URL path."""
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith('..') or path in ('', '.'):
+        raise Http404('Invalid media path')
+    try:
+        if path.startswith(STAGED_PREFIX):
+            return get_staging_storage().path(path[len(STAGED_PREFIX):]), path
+        return get_media_backend().path(path), path
+    except (SuspiciousFileOperation, NotImplementedError):
+        raise Http404('Invalid media path')
+
+
+def _parse_range(header, size):
+    """
+    Parse a single-range Range header.
+
+    Returns:
+        (start, end) inclusive, None to serve the whole file, or 'invalid'
+        when the range can't be satisfied
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        # Multiple ranges or other units: serve the whole file
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    date = parse_http_date_safe(if_range)
+    return date is not None and date >= int(last_modified)
+
+
+def _cache_control(name):
+    if name.startswith(STAGED_PREFIX):
+        # Staged files are replaced by the uploaded copy shortly
+        return 'private, no-cache'
+    if is_content_addressed(name):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+def media_view(request, path):
+    """Serve a media file with Range, conditional request and sendfile support."""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    full_path, name = _resolve(path)
+    try:
+        stat_result = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('Media file not found')
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404('Media file not found')
+
+    size = stat_result.st_size
+    last_modified = stat_result.st_mtime
+    if is_content_addressed(name):
+        etag = f'"{sha256_from_name(name)}"'
+    else:
+        etag = f'"{int(last_modified):x}-{size:x}"'
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    def set_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = _cache_control(name)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if not_modified is not None:
+        return set_headers(not_modified)
+
+    sendfile = settings.MEDIA_SENDFILE
+    if sendfile:
+        # The web server handles ranges and streaming from here
+        response = HttpResponse(content_type=content_type)
+        if sendfile == 'nginx':
+            response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_REDIRECT_PREFIX + name)
+        else:
+            response['X-Sendfile'] = full_path
+        if encoding:
+            response['Content-Encoding'] = encoding
+        return set_headers(response)
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and _if_range_matches(request, etag, last_modified):
+        byte_range = _parse_range(range_header, size)
+        if byte_range == 'invalid':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return set_headers(response)
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = str(size)
+    elif byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        file = open(full_path, 'rb')
+        file.seek(start)
+        response = FileResponse(FileRange(file, end - start + 1), content_type=content_type, status=206)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return set_headers(response)
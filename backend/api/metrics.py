@@ -0,0 +1,357 @@
+"""
+Lightweight in-process metrics registry with Prometheus text exposition.
+
+Counters and histograms are stored per process. When ``METRICS_DIR`` is set,
+every process writes its samples to its own mmap'd file in that directory and
+the exposition endpoint sums the files of all processes, so the numbers are
+correct across gunicorn workers. Without ``METRICS_DIR`` samples are kept in
+memory, which is enough for ``runserver`` and single-process deployments.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HEADER = struct.Struct('I')
+_KEY_LEN = struct.Struct('I')
+_VALUE = struct.Struct('d')
+_INITIAL_FILE_SIZE = 64 * 1024
+
+
+class _MemoryValues:
+    """Per-process sample store used when no metrics directory is configured."""
+
+    def __init__(self):
+        self._values = {}
+
+    def inc(self, key, amount):
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def items(self):
+        return list(self._values.items())
+
+    def close(self):
+        pass
+
+
+class _MmapValues:
+    """
+    Append-only key/value store backed by an mmap'd file.
+
+    Layout: a 4-byte header holding the number of used bytes, followed by
+    entries of (4-byte key length, UTF-8 key padded to 8 bytes, float64 value).
+    Only the owning process writes to the file; other processes just read it.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size < _INITIAL_FILE_SIZE:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        used = _HEADER.unpack_from(self._map, 0)[0]
+        if used == 0:
+            used = _HEADER.size
+            _HEADER.pack_into(self._map, 0, used)
+        self._used = used
+        for key, _value, position in _iter_entries(self._map, used):
+            self._positions[key] = position
+
+    def inc(self, key, amount):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        value = _VALUE.unpack_from(self._map, position)[0]
+        _VALUE.pack_into(self._map, position, value + amount)
+
+    def items(self):
+        return [(key, value) for key, value, _position in _iter_entries(self._map, self._used)]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _append(self, key):
+        encoded = key.encode('utf-8')
+        padded_length = _KEY_LEN.size + len(encoded)
+        padded_length += (8 - padded_length % 8) % 8
+        entry_size = padded_length + _VALUE.size
+        if self._used + entry_size > self._capacity:
+            self._grow(self._used + entry_size)
+
+        start = self._used
+        _KEY_LEN.pack_into(self._map, start, len(encoded))
+        self._map[start + _KEY_LEN.size:start + _KEY_LEN.size + len(encoded)] = encoded
+        position = start + padded_length
+        _VALUE.pack_into(self._map, position, 0.0)
+
+        # Publish the entry only once it is fully written so readers never
+        # see a half-initialised key.
+        self._used = start + entry_size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def _grow(self, required):
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        self._map.close()
+        self._file.truncate(capacity)
+        self._capacity = capacity
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+
+
+def _iter_entries(buffer, used):
+    position = _HEADER.size
+    while position < used:
+        key_length = _KEY_LEN.unpack_from(buffer, position)[0]
+        key_start = position + _KEY_LEN.size
+        key = bytes(buffer[key_start:key_start + key_length]).decode('utf-8')
+        padded_length = _KEY_LEN.size + key_length
+        padded_length += (8 - padded_length % 8) % 8
+        value_position = position + padded_length
+        yield key, _VALUE.unpack_from(buffer, value_position)[0], value_position
+        position = value_position + _VALUE.size
+
+
+def _read_file(path):
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if len(data) < _HEADER.size:
+        return []
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    return [(key, value) for key, value, _position in _iter_entries(data, used)]
+
+
+class MetricsRegistry:
+    """Holds metric definitions and the sample store for the current process."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._store = None
+        self._store_pid = None
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def inc(self, key, amount=1.0):
+        with self._lock:
+            self._get_store().inc(key, amount)
+
+    def collect(self):
+        """Return summed samples as ``{key: value}`` across all processes."""
+        directory = self._directory()
+        totals = {}
+        if directory:
+            with self._lock:
+                # Make sure this process' file exists before listing the directory
+                self._get_store()
+            for path in sorted(directory.glob('metrics_*.db')):
+                try:
+                    samples = _read_file(path)
+                except OSError:
+                    continue
+                for key, value in samples:
+                    totals[key] = totals.get(key, 0.0) + value
+        else:
+            with self._lock:
+                samples = self._get_store().items()
+            for key, value in samples:
+                totals[key] = value
+        return totals
+
+    def render(self):
+        """Render all registered metrics in the Prometheus text format (0.0.4)."""
+        samples = {}
+        for key, value in self.collect().items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.render_samples(samples))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Drop all samples of the current process (used by management tasks)."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                path = self._store_path()
+                if path is not None and path.exists():
+                    path.unlink()
+            self._store = None
+            self._store_pid = None
+
+    def _directory(self):
+        directory = getattr(settings, 'METRICS_DIR', '')
+        return Path(directory) if directory else None
+
+    def _store_path(self):
+        directory = self._directory()
+        if directory is None:
+            return None
+        return directory / f'metrics_{os.getpid()}.db'
+
+    def _get_store(self):
+        # gunicorn forks workers after import, so re-open the store when the
+        # pid changes instead of sharing the master's file.
+        pid = os.getpid()
+        if self._store is None or self._store_pid != pid:
+            path = self._store_path()
+            if path is None:
+                self._store = _MemoryValues()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._store = _MmapValues(path)
+            self._store_pid = pid
+        return self._store
+
+
+registry = MetricsRegistry()
+
+
+def _sample_key(name, labels):
+    return json.dumps([name, labels], separators=(',', ':'), sort_keys=True)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for label, value in sorted(labels.items()):
+        escaped = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{label}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def _labels(self, labels):
+        missing = set(self.labelnames) - set(labels)
+        if missing:
+            raise ValueError(f'Missing labels for {self.name}: {", ".join(sorted(missing))}')
+        return {label: str(labels[label]) for label in self.labelnames}
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        registry.inc(_sample_key(self.name, self._labels(labels)), amount)
+
+    def render_samples(self, samples):
+        return [
+            f'{self.name}{_format_labels(labels)} {_format_value(value)}'
+            for labels, value in sorted(samples.get(self.name, []), key=lambda item: sorted(item[0].items()))
+        ]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets, exposed as cumulative ``_bucket`` series."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        bucket = next((bound for bound in self.buckets if value <= bound), float('inf'))
+        registry.inc(_sample_key(f'{self.name}_bucket', dict(labels, le=_format_value(bucket))), 1)
+        registry.inc(_sample_key(f'{self.name}_sum', labels), value)
+        registry.inc(_sample_key(f'{self.name}_count', labels), 1)
+
+    def render_samples(self, samples):
+        # Buckets are stored non-cumulatively; accumulate them per label set here.
+        series = {}
+        for labels, value in samples.get(f'{self.name}_bucket', []):
+            labels = dict(labels)
+            bound = labels.pop('le')
+            series.setdefault(tuple(sorted(labels.items())), {})[bound] = value
+
+        lines = []
+        for label_items in sorted(series):
+            labels = dict(label_items)
+            counts = series[label_items]
+            cumulative = 0.0
+            for bound in self.buckets + (float('inf'),):
+                cumulative += counts.get(_format_value(bound), 0.0)
+                lines.append(
+                    f'{self.name}_bucket{_format_labels(dict(labels, le=_format_value(bound)))} '
+                    f'{_format_value(cumulative)}'
+                )
+        for suffix in ('_sum', '_count'):
+            for labels, value in sorted(samples.get(self.name + suffix, []), key=lambda item: sorted(item[0].items())):
+                lines.append(f'{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+
+# ============================================================================
+# APPLICATION METRICS
+# ============================================================================
+
+http_requests_total = Counter(
+    'http_requests_total',
+    'Total HTTP requests by route name, method and status code.',
+    ['route', 'method', 'status'],
+)
+
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency in seconds by route name and method.',
+    ['route', 'method'],
+)
+
+http_exceptions_total = Counter(
+    'http_exceptions_total',
+    'Unhandled exceptions raised while processing a request, by route name.',
+    ['route', 'exception'],
+)
+
+cache_requests_total = Counter(
+    'cache_requests_total',
+    'Cache lookups by cache name and result (hit or miss).',
+    ['cache', 'result'],
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    """
+    Record a cache hit or miss for the given logical cache.
+
+    Args:
+        cache_name: Short identifier of the cached resource (e.g. 'facets')
+        hit: True when the value was served from cache
+    """
+    cache_requests_total.inc(cache=cache_name, result='hit' if hit else 'miss')
@@ -0,0 +1,58 @@
+"""
+Custom middleware for the API app.
+"""
+import time
+
+from . import metrics
+from .querylog import capture_slow_queries
+
+
+class MetricsMiddleware:
+    """
+    Record request counts, latency and unhandled exceptions per route name.
+
+    Should be placed first in MIDDLEWARE so the measured latency covers the
+    whole middleware stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        route = self._route_name(request)
+        metrics.http_requests_total.inc(route=route, method=request.method, status=response.status_code)
+        metrics.http_request_duration_seconds.observe(duration, route=route, method=request.method)
+        return response
+
+    def process_exception(self, request, exception):
+        metrics.http_exceptions_total.inc(
+            route=self._route_name(request),
+            exception=type(exception).__name__,
+        )
+
+    @staticmethod
+    def _route_name(request):
+        # Use the URL name rather than the path so label cardinality stays
+        # bounded (e.g. 'blog-post-detail' instead of one series per slug).
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched'
+        return match.view_name or match._func_path
+
+
+class SlowQueryMiddleware:
+    """
+    Log queries slower than SLOW_QUERY_THRESHOLD_MS and aggregate them into
+    the SlowQuery report, attributed to the view that issued them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_slow_queries(request):
+            return self.get_response(request)
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.16 on 2026-10-19 03:49
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_add_indexes_and_validation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('sample_sql', models.TextField(help_text='Most recent raw SQL for this fingerprint')),
+                ('sample_params', models.TextField(blank=True)),
+                ('view_name', models.CharField(blank=True, help_text='URL name of the view that issued the query', max_length=200)),
+                ('stack_frame', models.CharField(blank=True, help_text='Project code location that issued the query', max_length=500)),
+                ('explain_plan', models.TextField(blank=True, help_text='EXPLAIN output captured for SELECT statements')),
+                ('explained_at', models.DateTimeField(blank=True, null=True)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('total_duration_ms', models.FloatField(default=0)),
+                ('max_duration_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'ordering': ['-total_duration_ms'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='slowquery',
+            index=models.Index(fields=['-total_duration_ms'], name='api_slowque_total_d_a6701b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slowquery',
+            index=models.Index(fields=['-last_seen'], name='api_slowque_last_se_24e03e_idx'),
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 4.2.16 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_slowquery'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='aboutmissionsection',
+            name='api_aboutmission_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutstorysection',
+            name='api_aboutstory_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='abouttimelineitem',
+            name='api_abouttimelineitem_active_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='abouttimelinesection',
+            name='api_abouttimelinesection_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutvalue',
+            name='api_aboutvalue_active_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutvaluessection',
+            name='api_aboutvaluessection_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutvisionsection',
+            name='api_aboutvision_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='api_blogpost_category_published_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='contactinformation',
+            name='api_contactinfo_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='galleryitem',
+            name='api_galleryitem_active_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='galleryitem',
+            name='api_galleryitem_media_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='galleryitem',
+            name='api_galleryitem_featured_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='pageimage',
+            name='api_pageimage_page_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='pageimage',
+            name='api_pageimage_page_section_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='update',
+            name='api_update_type_published_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='update',
+            name='api_update_priority_published_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aboutmissionsection',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_aboutmission_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutstorysection',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_aboutstory_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abouttimelineitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'year'], name='api_timelineitem_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abouttimelinesection',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_timelinehdr_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutvalue',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='api_aboutvalue_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutvaluessection',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_valueshdr_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutvisionsection',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_aboutvision_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-created_date'], name='api_blog_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('published', True)), fields=['category', '-created_date'], name='api_blog_pub_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactinformation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='api_contactinfo_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-event_date', '-created_at'], name='api_gallery_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['media_type', 'order', '-event_date', '-created_at'], name='api_gallery_active_media_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['event_type', 'order', '-event_date', '-created_at'], name='api_gallery_active_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_featured', 'order', '-event_date', '-created_at'], name='api_gallery_active_feat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heroimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='api_hero_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pageimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['page', '-is_active', '-created_at'], name='api_pageimg_active_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pageimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['page', 'section', '-is_active', '-created_at'], name='api_pageimg_active_section_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='update',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-created_date'], name='api_update_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='update',
+            index=models.Index(condition=models.Q(('published', True)), fields=['type', '-created_date'], name='api_update_pub_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='update',
+            index=models.Index(condition=models.Q(('published', True)), fields=['priority', '-created_date'], name='api_update_pub_priority_idx'),
+        ),
+    ]
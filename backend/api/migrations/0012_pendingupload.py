@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-19 03:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text="Model of the object, e.g. 'api.GalleryItem'", max_length=100)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field_name', models.CharField(max_length=100)),
+                ('staged_name', models.CharField(help_text='Name of the file in local staging', max_length=500)),
+                ('stored_name', models.CharField(blank=True, help_text='Name of the file in media storage once uploaded', max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pending Upload',
+                'verbose_name_plural': 'Pending Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pendingupload',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='api_pendingupload_due_idx'),
+        ),
+    ]
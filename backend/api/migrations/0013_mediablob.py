@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_pendingupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(help_text='Storage name of the file', max_length=500)),
+                ('size', models.BigIntegerField()),
+                ('phash', models.BigIntegerField(blank=True, help_text='Perceptual hash (images only)', null=True)),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of file fields referencing this file')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Media File',
+                'verbose_name_plural': 'Media Files',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
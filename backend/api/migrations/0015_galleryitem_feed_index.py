@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_changelogentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='api_gallery_active_new_idx'),
+        ),
+    ]
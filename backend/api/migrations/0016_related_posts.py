@@ -0,0 +1,53 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_galleryitem_feed_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostTerms',
+            fields=[
+                ('blog_post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='terms', serialize=False, to='api.blogpost')),
+                ('terms', models.JSONField(default=dict, help_text='Term -> weighted count over title, excerpt and content')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blog Post Terms',
+                'verbose_name_plural': 'Blog Post Terms',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Related Post',
+                'verbose_name_plural': 'Related Posts',
+                'ordering': ['blog_post', 'rank'],
+            },
+        ),
+        migrations.AddField(
+            model_name='relatedpost',
+            name='blog_post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='api.blogpost'),
+        ),
+        migrations.AddField(
+            model_name='relatedpost',
+            name='related',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.blogpost'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedpost',
+            constraint=models.UniqueConstraint(fields=('blog_post', 'rank'), name='api_related_post_rank_uniq'),
+        ),
+    ]
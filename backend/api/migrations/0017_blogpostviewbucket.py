@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_related_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('start', models.DateTimeField(help_text='Start of the hour or day (UTC)')),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Blog Post Views',
+                'verbose_name_plural': 'Blog Post Views',
+                'ordering': ['-start'],
+            },
+        ),
+        migrations.AddField(
+            model_name='blogpostviewbucket',
+            name='blog_post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='api.blogpost'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpostviewbucket',
+            index=models.Index(fields=['start', 'granularity'], name='api_view_bucket_start_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='blogpostviewbucket',
+            constraint=models.UniqueConstraint(fields=('blog_post', 'granularity', 'start'), name='api_view_bucket_uniq'),
+        ),
+    ]
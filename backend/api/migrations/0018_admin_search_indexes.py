@@ -0,0 +1,26 @@
+"""
+Search indexes for the contact message and blog post admin changelists
+(FTS5 tables on SQLite, pg_trgm indexes on PostgreSQL; see api.search).
+"""
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    from api.search import create_search_indexes
+    create_search_indexes(schema_editor)
+
+
+def drop_search_indexes(apps, schema_editor):
+    from api.search import drop_search_indexes
+    drop_search_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_blogpostviewbucket'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
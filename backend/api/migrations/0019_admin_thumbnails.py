@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='admin_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)', upload_to='admin_thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='galleryitem',
+            name='admin_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)', upload_to='admin_thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='heroimage',
+            name='admin_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)', upload_to='admin_thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='pageimage',
+            name='admin_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)', upload_to='admin_thumbnails/'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0019_admin_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GalleryUploadBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, help_text='Numbered title for all items; file names are used if blank', max_length=200)),
+                ('event_type', models.CharField(choices=[('meeting', 'Meeting'), ('celebration', 'Celebration'), ('workshop', 'Workshop'), ('community', 'Community Event'), ('award', 'Award Ceremony'), ('other', 'Other')], default='other', max_length=20)),
+                ('event_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('status', models.CharField(choices=[('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='processing', max_length=20)),
+                ('total', models.PositiveIntegerField(default=0, help_text='Number of files received')),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('created_items', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='[file name, message] of each rejected file')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Gallery Upload',
+                'verbose_name_plural': 'Gallery Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='galleryuploadbatch',
+            name='uploaded_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='gallery_upload_batches', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
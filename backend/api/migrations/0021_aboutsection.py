@@ -0,0 +1,132 @@
+"""
+Move the five About section tables (and the legacy AboutPage) into one
+AboutSection table keyed by section, with at most one active row per key.
+"""
+from django.db import migrations, models
+import django.utils.timezone
+
+# Section key -> (old model, old text field, new text field)
+OLD_SECTIONS = {
+    'story': ('AboutStorySection', 'content', 'body'),
+    'mission': ('AboutMissionSection', 'content', 'body'),
+    'vision': ('AboutVisionSection', 'content', 'body'),
+    'values_header': ('AboutValuesSection', 'subtitle', 'subtitle'),
+    'timeline_header': ('AboutTimelineSection', 'subtitle', 'subtitle'),
+}
+
+# Section key -> AboutPage field prefix
+PAGE_PREFIXES = {
+    'story': 'story',
+    'mission': 'mission',
+    'vision': 'vision',
+    'values_header': 'values',
+    'timeline_header': 'timeline',
+}
+
+
+def _copy(model, values, created_at, updated_at):
+    obj = model.objects.create(created_at=created_at, **values)
+    # Keep the old timestamp (auto_now set it to now)
+    model.objects.filter(pk=obj.pk).update(updated_at=updated_at)
+    return obj
+
+
+def copy_sections(apps, schema_editor):
+    AboutSection = apps.get_model('api', 'AboutSection')
+    AboutPage = apps.get_model('api', 'AboutPage')
+    ChangeLogEntry = apps.get_model('api', 'ChangeLogEntry')
+    page = AboutPage.objects.order_by('-is_active', '-updated_at').first()
+
+    changes = []
+    for key, (model_name, old_field, new_field) in OLD_SECTIONS.items():
+        model = apps.get_model('api', model_name)
+        rows = list(model.objects.order_by('-is_active', '-updated_at'))
+        for index, row in enumerate(rows):
+            # Only the latest active row of a section stays active
+            section = _copy(AboutSection, {
+                'key': key,
+                'title': row.title,
+                new_field: getattr(row, old_field),
+                'is_active': row.is_active and index == 0,
+            }, row.created_at, row.updated_at)
+            changes.append(ChangeLogEntry(model='api.AboutSection', object_id=section.pk, operation='created'))
+            changes.append(ChangeLogEntry(model=f'api.{model_name}', object_id=row.pk, operation='deleted'))
+        if not rows and page is not None:
+            # Sections never split out of the legacy page
+            prefix = PAGE_PREFIXES[key]
+            section = _copy(AboutSection, {
+                'key': key,
+                'title': getattr(page, f'{prefix}_title'),
+                new_field: getattr(page, f'{prefix}_{old_field}'),
+                'is_active': page.is_active,
+            }, page.created_at, page.updated_at)
+            changes.append(ChangeLogEntry(model='api.AboutSection', object_id=section.pk, operation='created'))
+    ChangeLogEntry.objects.bulk_create(changes)
+
+
+def restore_sections(apps, schema_editor):
+    # The legacy AboutPage isn't restored; nothing read it any more
+    AboutSection = apps.get_model('api', 'AboutSection')
+    for key, (model_name, old_field, new_field) in OLD_SECTIONS.items():
+        model = apps.get_model('api', model_name)
+        for section in AboutSection.objects.filter(key=key).order_by('created_at', 'pk'):
+            _copy(model, {
+                'title': section.title,
+                old_field: getattr(section, new_field),
+                'is_active': section.is_active,
+            }, section.created_at, section.updated_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_galleryuploadbatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AboutSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(choices=[('story', 'Story'), ('mission', 'Mission'), ('vision', 'Vision'), ('values_header', 'Values Header'), ('timeline_header', 'Timeline Header')], help_text='Section of the About page', max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField(blank=True, help_text='Section text (story, mission and vision)')),
+                ('subtitle', models.TextField(blank=True, help_text='Subtitle (values and timeline headers)')),
+                ('is_active', models.BooleanField(default=True, help_text='Only the active version of a section is displayed')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'About Section',
+                'verbose_name_plural': 'About - Sections',
+                'ordering': ['key', '-updated_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='aboutsection',
+            index=models.Index(fields=['key', '-updated_at'], name='api_aboutsection_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='aboutsection',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('key',), name='api_about_one_active_per_key'),
+        ),
+        migrations.RunPython(copy_sections, restore_sections),
+        migrations.DeleteModel(
+            name='AboutMissionSection',
+        ),
+        migrations.DeleteModel(
+            name='AboutPage',
+        ),
+        migrations.DeleteModel(
+            name='AboutStorySection',
+        ),
+        migrations.DeleteModel(
+            name='AboutTimelineSection',
+        ),
+        migrations.DeleteModel(
+            name='AboutValuesSection',
+        ),
+        migrations.DeleteModel(
+            name='AboutVisionSection',
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_aboutsection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessageArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the messages were received in')),
+                ('message_count', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField(help_text='gzip-compressed JSON Lines, one message per line')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Contact Message Archive',
+                'verbose_name_plural': 'Contact Message Archives',
+                'ordering': ['-month', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_read', '-created_at'], name='api_contact_read_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessagearchive',
+            index=models.Index(fields=['month'], name='api_contactarchive_month_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 from django.core.validators import FileExtensionValidator
 
@@ -19,12 +22,37 @@ class ContactMessage(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['is_read']),
+            # Inbox filtered by read status, and the retention scan (see api/archive.py)
+            models.Index(fields=['is_read', '-created_at'], name='api_contact_read_created_idx'),
         ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
 
 
+class ContactMessageArchive(models.Model):
+    """
+    Contact messages moved out of the inbox by the retention policy: one
+    month's messages as gzip-compressed JSON Lines (see api/archive.py)
+    """
+    month = models.DateField(help_text='First day of the month the messages were received in')
+    message_count = models.PositiveIntegerField(default=0)
+    data = models.BinaryField(help_text='gzip-compressed JSON Lines, one message per line')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month', 'id']
+        verbose_name = 'Contact Message Archive'
+        verbose_name_plural = 'Contact Message Archives'
+        indexes = [
+            models.Index(fields=['month'], name='api_contactarchive_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%B %Y} ({self.message_count} messages)"
+
+
 class Service(models.Model):
     SERVICE_TYPES = [
         ('susu', 'Susu Collection'),
@@ -84,6 +112,12 @@ class HeroImage(models.Model):
         help_text='Upload an image for the hero section (recommended: 1200x600px)',
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])]
     )
+    admin_thumbnail = models.ImageField(
+        upload_to='admin_thumbnails/',
+        blank=True,
+        editable=False,
+        help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)'
+    )
     is_active = models.BooleanField(default=True, help_text='Only one active hero image will be displayed')
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -94,6 +128,11 @@ class HeroImage(models.Model):
         verbose_name_plural = '🖼️ Hero Images'
         indexes = [
             models.Index(fields=['is_active', '-created_at']),
+            # Partial index for the public "latest active image" lookup
+            models.Index(
+                fields=['-created_at'], condition=models.Q(is_active=True),
+                name='api_hero_active_created_idx',
+            ),
         ]
 
     def __str__(self):
@@ -116,6 +155,12 @@ class PageImage(models.Model):
         help_text='Upload an image for this page section',
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])]
     )
+    admin_thumbnail = models.ImageField(
+        upload_to='admin_thumbnails/',
+        blank=True,
+        editable=False,
+        help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)'
+    )
     section = models.CharField(
         max_length=50,
         help_text='Section identifier (e.g., "hero", "about-story", "services-header")',
@@ -130,14 +175,26 @@ class PageImage(models.Model):
         verbose_name = 'Page Image'
         verbose_name_plural = 'Page Images'
         indexes = [
-            models.Index(fields=['page', 'is_active']),
-            models.Index(fields=['page', 'section']),
+            # Partial indexes matching the public page / page+section lookups and ordering
+            models.Index(
+                fields=['page', '-is_active', '-created_at'], condition=models.Q(is_active=True),
+                name='api_pageimg_active_page_idx',
+            ),
+            models.Index(
+                fields=['page', 'section', '-is_active', '-created_at'], condition=models.Q(is_active=True),
+                name='api_pageimg_active_section_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.get_page_display()} - {self.title}"
 
 
+class BlogPostManager(models.Manager):
+    def get_by_natural_key(self, slug):
+        return self.get(slug=slug)
+
+
 class BlogPost(models.Model):
     """Blog post model for news and articles"""
     CATEGORY_CHOICES = [
@@ -161,23 +218,43 @@ class BlogPost(models.Model):
         help_text='Featured image for the blog post',
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])]
     )
+    admin_thumbnail = models.ImageField(
+        upload_to='admin_thumbnails/',
+        blank=True,
+        editable=False,
+        help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)'
+    )
     published = models.BooleanField(default=False, help_text='Only published posts will be visible')
     created_date = models.DateTimeField(default=timezone.now)
     updated_date = models.DateTimeField(auto_now=True)
     views = models.IntegerField(default=0)
 
+    # Exports refer to posts by slug, which is stable across environments
+    objects = BlogPostManager()
+
     class Meta:
         ordering = ['-created_date']
         verbose_name = 'Blog Post'
         verbose_name_plural = 'Blog Posts'
         indexes = [
             models.Index(fields=['published', '-created_date']),
-            models.Index(fields=['category', 'published']),
             models.Index(fields=['slug']),
+            # Partial indexes matching the public list and category filter ordering
+            models.Index(
+                fields=['-created_date'], condition=models.Q(published=True),
+                name='api_blog_pub_created_idx',
+            ),
+            models.Index(
+                fields=['category', '-created_date'], condition=models.Q(published=True),
+                name='api_blog_pub_category_idx',
+            ),
         ]
 
     def __str__(self):
         return self.title
+
+    def natural_key(self):
+        return (self.slug,)
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -304,114 +381,93 @@ class Update(models.Model):
         verbose_name_plural = 'Updates'
         indexes = [
             models.Index(fields=['published', '-created_date']),
-            models.Index(fields=['type', 'published']),
-            models.Index(fields=['priority', 'published']),
+            # Partial indexes matching the public list, type and priority filter ordering
+            models.Index(
+                fields=['-created_date'], condition=models.Q(published=True),
+                name='api_update_pub_created_idx',
+            ),
+            models.Index(
+                fields=['type', '-created_date'], condition=models.Q(published=True),
+                name='api_update_pub_type_idx',
+            ),
+            models.Index(
+                fields=['priority', '-created_date'], condition=models.Q(published=True),
+                name='api_update_pub_priority_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.get_type_display()}"
 
 
-# About Page Section Models - Each section can be managed independently
-
-class AboutStorySection(models.Model):
-    """Story section of the About page - can be managed independently"""
-    title = models.CharField(max_length=200, default='Our Story')
-    content = models.TextField(help_text='Main story content for the About page')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
-    created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = 'About Story Section'
-        verbose_name_plural = 'About - Story Sections'
-        ordering = ['-updated_at']
-        indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
-        ]
-
-    def __str__(self):
-        return f"Story Section - {'Active' if self.is_active else 'Inactive'}"
-
+# About Page Sections - one table, one active version per section
 
-class AboutMissionSection(models.Model):
-    """Mission section of the About page - can be managed independently"""
-    title = models.CharField(max_length=200, default='Our Mission')
-    content = models.TextField(help_text='Mission statement')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
+class AboutSection(models.Model):
+    """
+    A version of an About page section. Only the active version of each
+    section is shown; activating a version deactivates the previous one.
+    """
+    KEY_CHOICES = [
+        ('story', 'Story'),
+        ('mission', 'Mission'),
+        ('vision', 'Vision'),
+        ('values_header', 'Values Header'),
+        ('timeline_header', 'Timeline Header'),
+    ]
+    # Sections with body text; the values and timeline headers have a subtitle instead
+    TEXT_KEYS = ('story', 'mission', 'vision')
+    DEFAULT_TITLES = {
+        'story': 'Our Story',
+        'mission': 'Our Mission',
+        'vision': 'Our Vision',
+        'values_header': 'Our Core Values',
+        'timeline_header': 'Our Journey',
+    }
+
+    key = models.CharField(max_length=20, choices=KEY_CHOICES, help_text='Section of the About page')
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True, help_text='Section text (story, mission and vision)')
+    subtitle = models.TextField(blank=True, help_text='Subtitle (values and timeline headers)')
+    is_active = models.BooleanField(default=True, help_text='Only the active version of a section is displayed')
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        verbose_name = 'About Mission Section'
-        verbose_name_plural = 'About Mission Sections'
-        ordering = ['-updated_at']
-        indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
+        verbose_name = 'About Section'
+        verbose_name_plural = 'About - Sections'
+        ordering = ['key', '-updated_at']
+        constraints = [
+            # Also the index the whole About page is loaded through
+            models.UniqueConstraint(
+                fields=['key'], condition=models.Q(is_active=True),
+                name='api_about_one_active_per_key',
+            ),
         ]
-
-    def __str__(self):
-        return f"Mission Section - {'Active' if self.is_active else 'Inactive'}"
-
-
-class AboutVisionSection(models.Model):
-    """Vision section of the About page - can be managed independently"""
-    title = models.CharField(max_length=200, default='Our Vision')
-    content = models.TextField(help_text='Vision statement')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
-    created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = 'About Vision Section'
-        verbose_name_plural = 'About - Vision Sections'
-        ordering = ['-updated_at']
         indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
+            models.Index(fields=['key', '-updated_at'], name='api_aboutsection_key_idx'),
         ]
 
     def __str__(self):
-        return f"Vision Section - {'Active' if self.is_active else 'Inactive'}"
+        return f"{self.get_key_display()} - {'Active' if self.is_active else 'Inactive'}"
 
+    def clean(self):
+        from django.core.exceptions import ValidationError
 
-class AboutValuesSection(models.Model):
-    """Values section header - manages the title and subtitle for the values section"""
-    title = models.CharField(max_length=200, default='Our Core Values')
-    subtitle = models.TextField(blank=True, help_text='Subtitle for values section')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
-    created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = 'About Values Section Header'
-        verbose_name_plural = 'About - Values Headers'
-        ordering = ['-updated_at']
-        indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
-        ]
-
-    def __str__(self):
-        return f"Values Section Header - {'Active' if self.is_active else 'Inactive'}"
-
-
-class AboutTimelineSection(models.Model):
-    """Timeline section header - manages the title and subtitle for the timeline section"""
-    title = models.CharField(max_length=200, default='Our Journey')
-    subtitle = models.TextField(blank=True, help_text='Subtitle for timeline section')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
-    created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = 'About Timeline Section Header'
-        verbose_name_plural = 'About - Timeline Headers'
-        ordering = ['-updated_at']
-        indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
-        ]
+        if self.key in self.TEXT_KEYS and not self.body.strip():
+            raise ValidationError({'body': 'This section needs some text.'})
 
-    def __str__(self):
-        return f"Timeline Section Header - {'Active' if self.is_active else 'Inactive'}"
+    def save(self, *args, **kwargs):
+        """Save; an active version replaces the section's previous active version."""
+        with transaction.atomic():
+            if self.is_active:
+                previous = AboutSection.objects.select_for_update().filter(key=self.key, is_active=True)
+                if self.pk:
+                    previous = previous.exclude(pk=self.pk)
+                for section in previous:
+                    # Saved one by one (at most one row) so signals see the change
+                    section.is_active = False
+                    section.save(update_fields=['is_active', 'updated_at'])
+            super().save(*args, **kwargs)
 
 
 class AboutValue(models.Model):
@@ -429,7 +485,10 @@ class AboutValue(models.Model):
         verbose_name = 'About Value'
         verbose_name_plural = 'About - Values'
         indexes = [
-            models.Index(fields=['is_active', 'order']),
+            models.Index(
+                fields=['order', 'id'], condition=models.Q(is_active=True),
+                name='api_aboutvalue_active_idx',
+            ),
         ]
 
     def __str__(self):
@@ -451,40 +510,16 @@ class AboutTimelineItem(models.Model):
         verbose_name = 'Timeline Item'
         verbose_name_plural = 'About - Timeline Items'
         indexes = [
-            models.Index(fields=['is_active', 'order']),
+            models.Index(
+                fields=['order', 'year'], condition=models.Q(is_active=True),
+                name='api_timelineitem_active_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.year} - {self.title}"
 
 
-# Keep old AboutPage model for backward compatibility during migration
-# This will be removed in a future migration after data is migrated
-class AboutPage(models.Model):
-    """Legacy About page model - kept for migration purposes"""
-    story_title = models.CharField(max_length=200, default='Our Story')
-    story_content = models.TextField(help_text='Main story content for the About page')
-    mission_title = models.CharField(max_length=200, default='Our Mission')
-    mission_content = models.TextField(help_text='Mission statement')
-    vision_title = models.CharField(max_length=200, default='Our Vision')
-    vision_content = models.TextField(help_text='Vision statement')
-    values_title = models.CharField(max_length=200, default='Our Core Values')
-    values_subtitle = models.TextField(blank=True, help_text='Subtitle for values section')
-    timeline_title = models.CharField(max_length=200, default='Our Journey')
-    timeline_subtitle = models.TextField(blank=True, help_text='Subtitle for timeline section')
-    is_active = models.BooleanField(default=True, help_text='Only active content will be displayed')
-    created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = 'About Page (Legacy)'
-        verbose_name_plural = '📄 About - Legacy (Deprecated)'
-        ordering = ['-updated_at']
-
-    def __str__(self):
-        return f"About Page Content - {'Active' if self.is_active else 'Inactive'}"
-
-
 class ContactInformation(models.Model):
     """Contact information for the website"""
     # Address
@@ -518,7 +553,10 @@ class ContactInformation(models.Model):
         verbose_name_plural = 'Contact Information'
         ordering = ['-updated_at']
         indexes = [
-            models.Index(fields=['is_active', '-updated_at']),
+            models.Index(
+                fields=['-updated_at'], condition=models.Q(is_active=True),
+                name='api_contactinfo_active_idx',
+            ),
         ]
 
     def __str__(self):
@@ -604,6 +642,12 @@ class GalleryItem(models.Model):
         help_text='Optional custom thumbnail for videos',
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])]
     )
+    admin_thumbnail = models.ImageField(
+        upload_to='admin_thumbnails/',
+        blank=True,
+        editable=False,
+        help_text='Small preview for admin lists, generated from the image (see api/thumbnails.py)'
+    )
     
     event_date = models.DateField(
         blank=True,
@@ -630,9 +674,28 @@ class GalleryItem(models.Model):
         verbose_name = 'Gallery Item'
         verbose_name_plural = '🖼️ Gallery Items'
         indexes = [
-            models.Index(fields=['is_active', 'order']),
-            models.Index(fields=['media_type', 'is_active']),
-            models.Index(fields=['is_featured', 'is_active']),
+            # Partial indexes matching the public gallery filters and ordering
+            models.Index(
+                fields=['order', '-event_date', '-created_at'], condition=models.Q(is_active=True),
+                name='api_gallery_active_order_idx',
+            ),
+            models.Index(
+                fields=['media_type', 'order', '-event_date', '-created_at'], condition=models.Q(is_active=True),
+                name='api_gallery_active_media_idx',
+            ),
+            models.Index(
+                fields=['event_type', 'order', '-event_date', '-created_at'], condition=models.Q(is_active=True),
+                name='api_gallery_active_event_idx',
+            ),
+            models.Index(
+                fields=['is_featured', 'order', '-event_date', '-created_at'], condition=models.Q(is_active=True),
+                name='api_gallery_active_feat_idx',
+            ),
+            # Newest first, for the gallery feed
+            models.Index(
+                fields=['-created_at'], condition=models.Q(is_active=True),
+                name='api_gallery_active_new_idx',
+            ),
         ]
 
     def __str__(self):
@@ -660,3 +723,298 @@ class GalleryItem(models.Model):
             from .utils import get_video_embed_url
             return get_video_embed_url(self.video_url, self.video_type) or self.video_url
         return self.video_url
+
+
+class ChunkedUpload(models.Model):
+    """Resumable upload session for large video files, received in chunks"""
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    # Model field each upload target attaches the finished file to
+    TARGETS = {
+        'gallery_item': ('GalleryItem', 'video_file'),
+        'blog_post_video': ('BlogPostVideo', 'video_file'),
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='chunked_uploads'
+    )
+    target = models.CharField(max_length=30, choices=[(key, key) for key in TARGETS])
+    object_id = models.PositiveBigIntegerField(blank=True, null=True, help_text='Object to attach the file to on completion')
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    stored_name = models.CharField(max_length=500, blank=True, help_text='Storage name of the completed file')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Chunked Upload'
+        verbose_name_plural = 'Chunked Uploads'
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size} bytes)"
+
+    def get_target_field(self):
+        """Return the (model class, field) pair this upload attaches to"""
+        from django.apps import apps
+        model_name, field_name = self.TARGETS[self.target]
+        model = apps.get_model('api', model_name)
+        return model, model._meta.get_field(field_name)
+
+
+class PendingUpload(models.Model):
+    """File staged locally by an admin save, waiting to be pushed to media storage"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploading', 'Uploading'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    model_label = models.CharField(max_length=100, help_text="Model of the object, e.g. 'api.GalleryItem'")
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=100)
+    staged_name = models.CharField(max_length=500, help_text='Name of the file in local staging')
+    stored_name = models.CharField(max_length=500, blank=True, help_text='Name of the file in media storage once uploaded')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Pending Upload'
+        verbose_name_plural = 'Pending Uploads'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='api_pendingupload_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field_name} ({self.get_status_display()})"
+
+
+class GalleryUploadBatch(models.Model):
+    """Photos uploaded at once from the admin, added to the gallery in the background"""
+    STATUS_CHOICES = [
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='gallery_upload_batches'
+    )
+    # Values shared by every created gallery item
+    title = models.CharField(max_length=200, blank=True, help_text='Numbered title for all items; file names are used if blank')
+    event_type = models.CharField(max_length=20, choices=GalleryItem.EVENT_TYPE_CHOICES, default='other')
+    event_date = models.DateField(blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='processing')
+    total = models.PositiveIntegerField(default=0, help_text='Number of files received')
+    processed = models.PositiveIntegerField(default=0)
+    created_items = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text='[file name, message] of each rejected file')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Gallery Upload'
+        verbose_name_plural = 'Gallery Uploads'
+
+    def __str__(self):
+        return f"{self.total} files, {self.created_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+
+class MediaBlob(models.Model):
+    """Unique media file stored once by content hash, shared by all objects using it"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=500, help_text='Storage name of the file')
+    size = models.BigIntegerField()
+    phash = models.BigIntegerField(blank=True, null=True, help_text='Perceptual hash (images only)')
+    ref_count = models.PositiveIntegerField(default=0, help_text='Number of file fields referencing this file')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Media File'
+        verbose_name_plural = 'Media Files'
+
+    def __str__(self):
+        return self.name
+
+
+# ============================================================================
+# RELATED POSTS
+# ============================================================================
+
+class BlogPostTerms(models.Model):
+    """Weighted term counts of a published blog post's text, for related posts"""
+    blog_post = models.OneToOneField(
+        BlogPost,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='terms'
+    )
+    terms = models.JSONField(default=dict, help_text='Term -> weighted count over title, excerpt and content')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Blog Post Terms'
+        verbose_name_plural = 'Blog Post Terms'
+
+    def __str__(self):
+        return f"Terms for post #{self.blog_post_id}"
+
+
+class RelatedPost(models.Model):
+    """One of the most similar published posts to a blog post (TF-IDF cosine)"""
+    blog_post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_entries'
+    )
+    related = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['blog_post', 'rank']
+        verbose_name = 'Related Post'
+        verbose_name_plural = 'Related Posts'
+        constraints = [
+            # Also the index the detail endpoint reads a post's list through
+            models.UniqueConstraint(fields=['blog_post', 'rank'], name='api_related_post_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"#{self.blog_post_id} -> #{self.related_id} ({self.score:.3f})"
+
+
+# ============================================================================
+# VIEW STATISTICS
+# ============================================================================
+
+class BlogPostViewBucket(models.Model):
+    """Views of a blog post in one hour or one day, written in batches by api.popularity"""
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+
+    blog_post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='view_buckets'
+    )
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    start = models.DateTimeField(help_text='Start of the hour or day (UTC)')
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-start']
+        verbose_name = 'Blog Post Views'
+        verbose_name_plural = 'Blog Post Views'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['blog_post', 'granularity', 'start'], name='api_view_bucket_uniq',
+            ),
+        ]
+        indexes = [
+            # Window scans for the popular/trending rankings and compaction
+            models.Index(fields=['start', 'granularity'], name='api_view_bucket_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.blog_post_id} {self.granularity} {self.start:%Y-%m-%d %H:00}: {self.views}"
+
+
+# ============================================================================
+# CHANGE FEED
+# ============================================================================
+
+class ChangeLogEntry(models.Model):
+    """Create, update or delete of a public object, numbered in commit order"""
+    OPERATION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=100, help_text="Model label, e.g. 'api.BlogPost'")
+    object_id = models.PositiveBigIntegerField()
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['seq']
+        verbose_name = 'Change Log Entry'
+        verbose_name_plural = 'Change Log'
+        indexes = [
+            models.Index(fields=['created_at'], name='api_changelog_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.operation} {self.model}#{self.object_id}"
+
+
+# ============================================================================
+# PERFORMANCE MONITORING
+# ============================================================================
+
+class SlowQuery(models.Model):
+    """Slow SQL statements aggregated by normalized query fingerprint"""
+    fingerprint = models.CharField(max_length=40, unique=True)
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField(help_text='Most recent raw SQL for this fingerprint')
+    sample_params = models.TextField(blank=True)
+    view_name = models.CharField(max_length=200, blank=True, help_text='URL name of the view that issued the query')
+    stack_frame = models.CharField(max_length=500, blank=True, help_text='Project code location that issued the query')
+    explain_plan = models.TextField(blank=True, help_text='EXPLAIN output captured for SELECT statements')
+    explained_at = models.DateTimeField(blank=True, null=True)
+    calls = models.PositiveIntegerField(default=0)
+    total_duration_ms = models.FloatField(default=0)
+    max_duration_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-total_duration_ms']
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+        indexes = [
+            models.Index(fields=['-total_duration_ms']),
+            models.Index(fields=['-last_seen']),
+        ]
+
+    def __str__(self):
+        return f"{self.calls} x {self.average_duration_ms:.1f} ms - {self.normalized_sql[:80]}"
+
+    @property
+    def average_duration_ms(self):
+        return self.total_duration_ms / self.calls if self.calls else 0
@@ -0,0 +1,198 @@
+"""
+Background offload of media uploads from admin saves.
+
+Instead of blocking the admin request on a remote upload, ``stage_new_files``
+writes newly uploaded files to local staging (see ``api.storage``) and
+``queue_offload`` records a ``PendingUpload`` for each of them. Once the
+admin transaction commits, a per-process thread pool pushes the files to the
+remote storage and swaps the field reference to the stored name.
+
+Failed uploads are tracked on their ``PendingUpload`` row and retried with
+exponential backoff by the ``process_pending_uploads`` management command
+(run it periodically, e.g. from cron), which also picks up work left behind
+by a restarted worker process.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, FileField
+from django.utils import timezone
+
+from .storage import OffloadingStorage, STAGED_PREFIX, get_remote_storage, get_staging_storage
+
+logger = logging.getLogger('api.offload')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def offload_enabled(field):
+    """Return True if files of this model field are offloaded in the background."""
+    return isinstance(field.storage, OffloadingStorage)
+
+
+def stage_new_files(obj):
+    """
+    Write files newly assigned to obj's file fields to local staging.
+
+    Must be called before obj is saved. The staged names are stored on the
+    fields so the save itself doesn't upload anything.
+
+    Returns:
+        List of (field name, staged name) pairs to pass to queue_offload
+    """
+    staged = []
+    for field in obj._meta.concrete_fields:
+        if not isinstance(field, FileField):
+            continue
+        file = getattr(obj, field.attname)
+        if not file or file._committed or not offload_enabled(field):
+            continue
+        name = field.generate_filename(obj, file.name)
+        staged_name = field.storage.stage(name, file.file)
+        file.name = staged_name
+        file._committed = True
+        staged.append((field.attname, staged_name))
+    return staged
+
+
+def queue_offload(obj, staged):
+    """
+    Record staged files of a saved object and upload them once the current
+    transaction commits.
+    """
+    from .models import PendingUpload
+
+    if not staged:
+        return
+    uploads = PendingUpload.objects.bulk_create([
+        PendingUpload(
+            model_label=obj._meta.label,
+            object_id=obj.pk,
+            field_name=field_name,
+            staged_name=staged_name,
+        )
+        for field_name, staged_name in staged
+    ])
+    ids = [upload.pk for upload in uploads]
+    transaction.on_commit(lambda: submit_uploads(ids))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.UPLOAD_OFFLOAD_WORKERS,
+                thread_name_prefix='upload-offload',
+            )
+        return _executor
+
+
+def submit_uploads(ids):
+    """Hand uploads to this process's worker pool."""
+    executor = _get_executor()
+    for upload_id in ids:
+        executor.submit(_run_in_thread, upload_id)
+
+
+def _run_in_thread(upload_id):
+    try:
+        process_upload(upload_id)
+    finally:
+        # Worker threads have their own connections; don't leak them
+        close_old_connections()
+
+
+def _retry_delay(attempts):
+    base = settings.UPLOAD_OFFLOAD_RETRY_DELAY
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 6 * 3600))
+
+
+def process_upload(upload_id):
+    """
+    Push one staged file to the remote storage and point the field at it.
+
+    Returns:
+        True if the file was uploaded, False if it failed or was not due
+    """
+    from .models import PendingUpload
+
+    # Claim the upload atomically so two workers never push the same file
+    claimed = PendingUpload.objects.filter(
+        pk=upload_id, status__in=['pending', 'failed'],
+    ).update(status='uploading', attempts=F('attempts') + 1, updated_at=timezone.now())
+    if not claimed:
+        return False
+    upload = PendingUpload.objects.get(pk=upload_id)
+
+    staging = get_staging_storage()
+    staged_path = upload.staged_name[len(STAGED_PREFIX):]
+    try:
+        model = apps.get_model(upload.model_label)
+        with staging.open(staged_path, 'rb') as content:
+            stored_name = get_remote_storage().save(staged_path, content)
+    except Exception as e:
+        PendingUpload.objects.filter(pk=upload.pk).update(
+            status='failed',
+            last_error=f'{type(e).__name__}: {e}',
+            next_attempt_at=timezone.now() + _retry_delay(upload.attempts),
+        )
+        logger.warning('Upload of %s failed (attempt %d): %s', upload.staged_name, upload.attempts, e)
+        return False
+
+    # Only swap the reference if the field still points at the staged file;
+    # the object may have been edited again or deleted in the meantime.
+    swapped = model._default_manager.filter(
+        pk=upload.object_id, **{upload.field_name: upload.staged_name}
+    ).update(**{upload.field_name: stored_name})
+    if swapped:
+        _record_swap(model, upload.object_id)
+    else:
+        get_remote_storage().delete(stored_name)
+    staging.delete(staged_path)
+
+    PendingUpload.objects.filter(pk=upload.pk).update(
+        status='done', stored_name=stored_name if swapped else '', last_error='',
+    )
+    return True
+
+
+def _record_swap(model, object_id):
+    # The queryset update sends no save signals; without this the change feed
+    # keeps the staged URL, which 404s once the staged file is deleted
+    from .changes import record_bulk_changes, tracked_models
+    from .models import BlogPost
+    from .transfer import invalidate_after_bulk_write
+
+    if model in tracked_models():
+        # Loaded rather than model(pk=...) so child rows carry their parent post
+        record_bulk_changes(model, list(model._default_manager.filter(pk=object_id)), created=False)
+    transaction.on_commit(
+        lambda: invalidate_after_bulk_write([model], [object_id] if model is BlogPost else ())
+    )
+
+
+def due_uploads(stale_after=None):
+    """
+    Return uploads that should be (re)tried now: pending or failed uploads
+    whose retry time has passed, and uploads stuck in 'uploading' for longer
+    than stale_after (their worker died). Uploads that failed
+    UPLOAD_OFFLOAD_MAX_ATTEMPTS times are left for a manual retry.
+    """
+    from .models import PendingUpload
+
+    now = timezone.now()
+    stale_after = stale_after or timedelta(seconds=settings.UPLOAD_OFFLOAD_STALE_AFTER)
+    stuck = PendingUpload.objects.filter(status='uploading', updated_at__lt=now - stale_after)
+    stuck.update(status='failed', last_error='Worker stopped during upload', next_attempt_at=now)
+    return PendingUpload.objects.filter(
+        status__in=['pending', 'failed'], next_attempt_at__lte=now,
+        attempts__lt=settings.UPLOAD_OFFLOAD_MAX_ATTEMPTS,
+    ).order_by('next_attempt_at')
+
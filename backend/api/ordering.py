@@ -0,0 +1,176 @@
+"""
+Batch reordering of ordered content.
+
+``apply_ordering`` takes a new sequence for some or all rows of an ordered
+model (per blog post for blog media) and writes it in one transaction with
+``bulk_update``. Order values are sparse: rows already in the right
+relative order keep their values, and the others get values between their
+new neighbours, so moving one item rewrites only that item. Only when two
+neighbours leave no room is the whole list renumbered, ORDER_GAP apart.
+
+Used by ``/api/reorder/<model>/`` and the admin's drag-and-drop
+(``static/admin/js/reorder.js``).
+"""
+from bisect import bisect_left
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+# Spacing of renumbered order values
+ORDER_GAP = 1024
+
+# Model name -> (model label, foreign key the order is scoped to, or None)
+ORDERED_MODELS = {
+    'galleryitem': ('api.GalleryItem', None),
+    'aboutvalue': ('api.AboutValue', None),
+    'abouttimelineitem': ('api.AboutTimelineItem', None),
+    'blogpostimage': ('api.BlogPostImage', 'blog_post'),
+    'blogpostvideo': ('api.BlogPostVideo', 'blog_post'),
+}
+
+
+def ordered_model(name):
+    """
+    Return (model, scope field name or None) for a name in ORDERED_MODELS.
+
+    Raises:
+        LookupError: if the model can't be reordered
+    """
+    label, scope = ORDERED_MODELS[name.lower()]
+    return apps.get_model(label), scope
+
+
+def _increasing_positions(values):
+    """Positions of a longest strictly increasing subsequence of values."""
+    tails = []  # tails[k]: position ending the best subsequence of length k + 1
+    tail_values = []
+    previous = [None] * len(values)
+    for position, value in enumerate(values):
+        k = bisect_left(tail_values, value)
+        if k:
+            previous[position] = tails[k - 1]
+        if k == len(tails):
+            tails.append(position)
+            tail_values.append(value)
+        else:
+            tails[k] = position
+            tail_values[k] = value
+    positions = set()
+    position = tails[-1] if tails else None
+    while position is not None:
+        positions.add(position)
+        position = previous[position]
+    return positions
+
+
+def sparse_orders(values):
+    """
+    Return new order values for rows whose current values are listed in
+    their new sequence, changing as few of them as possible.
+
+    Example:
+        [0, 1024, 2048, 512] -> [0, 1024, 2048, 3072]
+        [0, 2048, 1024] -> [0, 512, 1024]
+    """
+    kept = _increasing_positions(values)
+    result = list(values)
+    count = len(values)
+    start = 0
+    while start < count:
+        if start in kept:
+            start += 1
+            continue
+        end = start
+        while end < count and end not in kept:
+            end += 1
+        # Fill the run start..end-1 strictly between its kept neighbours
+        run = end - start
+        low = result[start - 1] if start else None
+        high = values[end] if end < count else None
+        if low is None and high is None:
+            low, high = 0, ORDER_GAP * (run + 1)
+        elif low is None:
+            low = high - ORDER_GAP * (run + 1)
+        elif high is None:
+            high = low + ORDER_GAP * (run + 1)
+        if high - low <= run:
+            # No room left between the neighbours
+            return [ORDER_GAP * (position + 1) for position in range(count)]
+        for offset in range(run):
+            result[start + offset] = low + (high - low) * (offset + 1) // (run + 1)
+        start = end
+    return result
+
+
+def apply_ordering(model, ids, parent=None):
+    """
+    Put rows of an ordered model in a new sequence.
+
+    Args:
+        model: Model from ORDERED_MODELS
+        ids: Primary keys in their new order. Either every row (of the
+            parent), or a subset, rearranged among the positions it occupies
+            (e.g. one changelist page)
+        parent: Primary key of the parent the order is scoped to, for models
+            with a scope field
+
+    Returns:
+        ({primary key: order} for the listed rows, number of rows updated)
+
+    Raises:
+        ValidationError: if ids lists a row twice or a row that doesn't exist
+    """
+    from .changes import record_bulk_changes
+    from .transfer import invalidate_after_bulk_write
+
+    scope = dict(ORDERED_MODELS.values()).get(model._meta.label)
+    try:
+        ids = [model._meta.pk.to_python(pk) for pk in ids]
+    except (TypeError, ValidationError):
+        raise ValidationError('ids must be a list of item IDs.')
+    if len(set(ids)) != len(ids):
+        raise ValidationError('Each item may only be listed once.')
+
+    queryset = model.objects.all()
+    if scope:
+        if parent in (None, ''):
+            raise ValidationError(f'{scope} is required.')
+        try:
+            parent = model._meta.get_field(scope).target_field.to_python(parent)
+        except ValidationError:
+            raise ValidationError(f'{scope} must be an ID.')
+        queryset = queryset.filter(**{scope: parent})
+
+    with transaction.atomic():
+        # Rows in their current display order, locked against concurrent reorders
+        rows = list(queryset.select_for_update().values_list('pk', 'order'))
+        current = dict(rows)
+        unknown = [pk for pk in ids if pk not in current]
+        if unknown:
+            raise ValidationError(f'Unknown items: {", ".join(str(pk) for pk in unknown)}.')
+
+        listed = set(ids)
+        moved = iter(ids)
+        sequence = [next(moved) if pk in listed else pk for pk, _order in rows]
+        orders = dict(zip(sequence, sparse_orders([current[pk] for pk in sequence])))
+
+        fields = ['order']
+        extra = {}
+        if scope:
+            extra[model._meta.get_field(scope).attname] = parent
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            fields.append('updated_at')
+            extra['updated_at'] = timezone.now()
+        changed = [
+            model(pk=pk, order=order, **extra)
+            for pk, order in orders.items() if order != current[pk]
+        ]
+        if changed:
+            model.objects.bulk_update(changed, fields, batch_size=500)
+            # bulk_update sends no save signals
+            record_bulk_changes(model, changed, created=False)
+            transaction.on_commit(lambda: invalidate_after_bulk_write([model], [parent] if scope else ()))
+
+    return {pk: orders[pk] for pk in ids}, len(changed)
@@ -0,0 +1,103 @@
+"""
+Row counts for paginated admin changelists and API list endpoints.
+
+``SELECT COUNT(*)`` reads every matching row, so on large tables it costs
+more than the page itself. Below COUNT_ESTIMATE_THRESHOLD rows counts stay
+exact. Above it, PostgreSQL's planner estimate is used (``EXPLAIN``, no
+rows read). Other databases use one exact count per filter. Either way the
+large count is cached until a row of the model is inserted, changed or
+deleted, or for at most COUNT_CACHE_TIMEOUT seconds. That timeout covers
+queryset ``update()``/``delete()``, which send no signals.
+
+An estimate can be off by a few percent, so the last page may come out
+short or empty.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+from . import metrics
+
+
+def _version_key(model):
+    return f'api:count-version:{model._meta.label_lower}'
+
+
+def _unordered(queryset):
+    # Ordering doesn't change a count (sliced querysets can't be reordered)
+    return queryset if queryset.query.is_sliced else queryset.order_by()
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for a queryset, or None if unavailable."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = _unordered(queryset).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def fast_count(queryset):
+    """
+    Count a queryset: exactly when it's small, otherwise from the cache or
+    the planner's estimate.
+    """
+    model = queryset.model
+    version = cache.get_or_set(_version_key(model), lambda: uuid.uuid4().hex, None)
+    sql, params = _unordered(queryset).query.sql_with_params()
+    digest = hashlib.sha1(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+    key = f'api:count:{model._meta.label_lower}:{version}:{digest}'
+
+    count = cache.get(key)
+    metrics.record_cache_lookup('counts', count is not None)
+    if count is not None:
+        return count
+
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD
+    count = estimate_count(queryset)
+    if count is None or count < threshold:
+        count = queryset.count()
+    if count >= threshold:
+        cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_counts(model):
+    """Drop the cached counts of a model's querysets."""
+    cache.delete(_version_key(model))
+
+
+def invalidate_model_counts(sender, update_fields=None, **kwargs):
+    """Signal handler: drop a model's cached counts once a change is committed."""
+    # View counter updates on blog post detail pages don't change any count
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    transaction.on_commit(lambda: invalidate_counts(sender))
+
+
+class FastCountPaginator(Paginator):
+    """Paginator that counts querysets with fast_count."""
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return fast_count(self.object_list)
+        return super().count
+
+
+class FastCountPagination(PageNumberPagination):
+    """Default API pagination: page numbers, with fast_count totals."""
+    django_paginator_class = FastCountPaginator
@@ -0,0 +1,217 @@
+"""
+Blog post view statistics and the "popular" / "trending" rankings.
+
+Detail page views are counted in memory per process and written every
+VIEW_FLUSH_INTERVAL seconds as increments of hourly buckets (and of the
+lifetime ``BlogPost.views`` counter), so a page view costs no write.
+
+``manage.py compact_view_stats`` merges hourly buckets older than
+VIEW_HOURLY_RETENTION_HOURS into daily buckets and drops daily buckets
+older than VIEW_DAILY_RETENTION_DAYS, so the table stays at roughly
+posts x (hours + days) rows. Rankings are computed from the buckets of a
+window with one GROUP BY and cached for VIEW_RANKINGS_CACHE_TIMEOUT.
+"""
+import atexit
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDay
+from django.utils import timezone
+
+from . import metrics
+from .models import BlogPost, BlogPostViewBucket
+
+logger = logging.getLogger(__name__)
+
+POPULAR_PERIODS = {'day': 1, 'week': 7, 'month': 30}
+
+_lock = threading.Lock()
+# (post id, hour start) -> views not yet written
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def record_view(post_id):
+    """Count a detail page view; written to the database in batches."""
+    global _last_flush
+    with _lock:
+        _pending[(post_id, hour_start(timezone.now()))] += 1
+        due = (
+            time.monotonic() - _last_flush >= settings.VIEW_FLUSH_INTERVAL
+            or len(_pending) >= settings.VIEW_FLUSH_MAX_KEYS
+        )
+        if not due:
+            return
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    _write(batch)
+
+
+def flush_views():
+    """Write all views counted by this process so far."""
+    global _last_flush
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if batch:
+        _write(batch)
+
+
+def _write(batch):
+    try:
+        add_views(batch)
+    except Exception:
+        logger.exception('Could not write %d blog post view counts', len(batch))
+        # Keep the counts for the next flush
+        with _lock:
+            _pending.update(batch)
+
+
+# Don't lose the last few seconds of views when a worker shuts down
+atexit.register(flush_views)
+
+
+def _increment_buckets(granularity, counts):
+    """Add {(post id, start): views} to the buckets, creating missing ones."""
+    for (post_id, start), views in counts.items():
+        bucket = BlogPostViewBucket.objects.filter(blog_post_id=post_id, granularity=granularity, start=start)
+        if bucket.update(views=F('views') + views):
+            continue
+        try:
+            with transaction.atomic():
+                BlogPostViewBucket.objects.create(
+                    blog_post_id=post_id, granularity=granularity, start=start, views=views
+                )
+        except IntegrityError:
+            # Created by another process in the meantime
+            bucket.update(views=F('views') + views)
+
+
+def add_views(counts):
+    """
+    Write hourly view counts and add them to the lifetime counters.
+
+    Args:
+        counts: {(post id, hour start): views}
+    """
+    existing = set(BlogPost.objects.filter(pk__in={post_id for post_id, _start in counts}).values_list('pk', flat=True))
+    counts = {key: views for key, views in counts.items() if key[0] in existing}
+    totals = Counter()
+    for (post_id, _start), views in counts.items():
+        totals[post_id] += views
+
+    with transaction.atomic():
+        _increment_buckets('hour', counts)
+        # A queryset update: no save signals, so caches aren't invalidated by views
+        for post_id, views in totals.items():
+            BlogPost.objects.filter(pk=post_id).update(views=F('views') + views)
+
+
+def compact_buckets(now=None):
+    """
+    Merge old hourly buckets into daily ones and drop expired daily buckets.
+
+    Returns:
+        (hourly buckets merged, daily buckets deleted)
+    """
+    now = now or timezone.now()
+    # Only whole days are merged, so a day is never split across granularities
+    cutoff = (now - timedelta(hours=settings.VIEW_HOURLY_RETENTION_HOURS)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    old_hours = BlogPostViewBucket.objects.filter(granularity='hour', start__lt=cutoff)
+    with transaction.atomic():
+        days = (
+            old_hours.annotate(day=TruncDay('start', tzinfo=dt_timezone.utc))
+            .values('blog_post', 'day').annotate(total=Sum('views')).order_by()
+        )
+        _increment_buckets('day', {(row['blog_post'], row['day']): row['total'] for row in days})
+        merged, _ = old_hours.delete()
+
+    expired = now - timedelta(days=settings.VIEW_DAILY_RETENTION_DAYS)
+    deleted, _ = BlogPostViewBucket.objects.filter(granularity='day', start__lt=expired).delete()
+    return merged, deleted
+
+
+def _published_buckets(since):
+    return BlogPostViewBucket.objects.filter(start__gte=since, blog_post__published=True)
+
+
+def _cached(key, build):
+    result = cache.get(key)
+    metrics.record_cache_lookup('view_rankings', result is not None)
+    if result is None:
+        result = build()
+        cache.set(key, result, settings.VIEW_RANKINGS_CACHE_TIMEOUT)
+    return result
+
+
+def popular_posts(period, limit):
+    """
+    Return [(post id, views)] of the most viewed published posts in a period.
+
+    Args:
+        period: One of POPULAR_PERIODS ('day', 'week', 'month')
+        limit: Number of posts
+    """
+    def build():
+        since = timezone.now() - timedelta(days=POPULAR_PERIODS[period])
+        rows = (
+            _published_buckets(since).values('blog_post')
+            .annotate(total=Sum('views')).order_by('-total', 'blog_post')[:limit]
+        )
+        return [(row['blog_post'], row['total']) for row in rows]
+
+    return _cached(f'api:views:popular:{period}:{limit}', build)
+
+
+def trending_posts(limit):
+    """
+    Return [(post id, views in the last 24h, score)] of published posts whose
+    views in the last 24 hours are furthest above their daily average over
+    the 7 days before, relative to that average's noise.
+    """
+    def build():
+        now = timezone.now()
+        day_ago = now - timedelta(days=1)
+        rows = (
+            _published_buckets(now - timedelta(days=8)).values('blog_post')
+            .annotate(
+                recent=Sum('views', filter=Q(start__gte=day_ago)),
+                earlier=Sum('views', filter=Q(start__lt=day_ago)),
+            ).order_by()
+        )
+        ranked = []
+        for row in rows:
+            recent = row['recent'] or 0
+            baseline = (row['earlier'] or 0) / 7
+            score = (recent - baseline) / math.sqrt(baseline + 1)
+            if recent and score > 0:
+                ranked.append((row['blog_post'], recent, round(score, 3)))
+        ranked.sort(key=lambda item: (-item[2], item[0]))
+        return ranked[:limit]
+
+    return _cached(f'api:views:trending:{limit}', build)
+
+
+def weekly_views():
+    """Subquery expression: a post's views over the last 7 days, from the buckets."""
+    buckets = (
+        BlogPostViewBucket.objects.filter(blog_post=OuterRef('pk'), start__gte=timezone.now() - timedelta(days=7))
+        .values('blog_post').annotate(total=Sum('views')).values('total')
+    )
+    return Coalesce(Subquery(buckets), 0)
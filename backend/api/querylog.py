@@ -0,0 +1,232 @@
+"""
+Slow query logging with automatic EXPLAIN capture.
+
+Queries slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged to the
+``api.slow_queries`` logger and aggregated by normalized query fingerprint
+into the ``SlowQuery`` table, which staff can review in the admin.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction, DatabaseError, IntegrityError
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger('api.slow_queries')
+
+_state = threading.local()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# Frames from these locations are skipped when looking for the code that issued a query
+_LIBRARY_MARKERS = ('site-packages', 'dist-packages', '/django/', '/rest_framework/', 'api/middleware.py')
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+def normalize_sql(sql):
+    """
+    Normalize SQL so queries differing only in literal values share a fingerprint.
+
+    Args:
+        sql: Raw SQL string as sent to the database
+
+    Returns:
+        Normalized SQL string
+    """
+    normalized = _STRING_LITERAL.sub('?', sql)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def fingerprint_sql(sql):
+    """Return a stable SHA-1 fingerprint of the normalized SQL."""
+    return hashlib.sha1(normalize_sql(sql).encode('utf-8')).hexdigest()
+
+
+def _threshold_ms():
+    return getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0)
+
+
+def _originating_frame():
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        filename = frame.filename
+        if filename == __file__ or not filename.startswith(base_dir):
+            continue
+        if any(marker in filename for marker in _LIBRARY_MARKERS):
+            continue
+        return f'{filename[len(base_dir):].lstrip("/")}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+def _view_name():
+    request = getattr(_state, 'request', None)
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ''
+    return match.view_name or match._func_path
+
+
+def _slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_state, 'suppressed', False):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= _threshold_ms():
+            entry = {
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'params': params,
+                'many': many,
+                'duration_ms': duration_ms,
+                'view_name': _view_name(),
+                'stack_frame': _originating_frame(),
+            }
+            logger.warning(
+                'Slow query (%.1f ms) in %s at %s: %s; params=%r',
+                duration_ms, entry['view_name'] or '-', entry['stack_frame'] or '-', sql, params,
+            )
+            _state.pending.append(entry)
+
+
+@contextmanager
+def capture_slow_queries(request=None):
+    """
+    Record slow queries executed inside the block and store them on exit.
+
+    Entries are stored after the block finishes rather than inline so that
+    recording never runs inside (or breaks) the caller's transactions.
+
+    Args:
+        request: Optional HttpRequest used to attribute queries to a view
+    """
+    if _threshold_ms() <= 0 or getattr(_state, 'active', False):
+        yield
+        return
+
+    _state.active = True
+    _state.request = request
+    _state.pending = []
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_slow_query_wrapper))
+            yield
+    finally:
+        pending = _state.pending
+        _state.active = False
+        _state.request = None
+        _state.pending = []
+        if pending:
+            _state.suppressed = True
+            try:
+                for entry in pending:
+                    record_slow_query(**entry)
+            finally:
+                _state.suppressed = False
+
+
+def explain(sql, params, alias='default'):
+    """
+    Run EXPLAIN (or EXPLAIN QUERY PLAN on SQLite) for a SELECT statement.
+
+    Returns:
+        The plan as text, or an empty string if it could not be captured
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    connection = connections[alias]
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None:
+        return ''
+    try:
+        # Savepoint so a failed EXPLAIN doesn't abort the surrounding transaction
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f'EXPLAIN failed: {e}'
+    return '\n'.join(' | '.join(str(column) for column in row) for row in rows)
+
+
+def record_slow_query(sql, params, duration_ms, alias='default', many=False,
+                      view_name='', stack_frame=''):
+    """
+    Aggregate a slow query into the SlowQuery report by fingerprint.
+
+    The EXPLAIN plan is (re)captured for SELECTs the first time a fingerprint
+    is seen and afterwards at most once per ``SLOW_QUERY_EXPLAIN_INTERVAL``.
+    """
+    from .models import SlowQuery
+
+    fingerprint = fingerprint_sql(sql)
+    now = timezone.now()
+    params_repr = repr(params)[:2000]
+    try:
+        with transaction.atomic(using=alias):
+            updated = SlowQuery.objects.using(alias).filter(fingerprint=fingerprint).update(
+                calls=F('calls') + 1,
+                total_duration_ms=F('total_duration_ms') + duration_ms,
+                max_duration_ms=Greatest('max_duration_ms', duration_ms),
+                last_seen=now,
+            )
+            if not updated:
+                try:
+                    with transaction.atomic(using=alias):
+                        SlowQuery.objects.using(alias).create(
+                            fingerprint=fingerprint,
+                            normalized_sql=normalize_sql(sql),
+                            sample_sql=sql,
+                            sample_params=params_repr,
+                            view_name=view_name,
+                            stack_frame=stack_frame,
+                            calls=1,
+                            total_duration_ms=duration_ms,
+                            max_duration_ms=duration_ms,
+                            first_seen=now,
+                            last_seen=now,
+                        )
+                except IntegrityError:
+                    # Another worker created the row first; fold this call into it
+                    return record_slow_query(sql, params, duration_ms, alias, many, view_name, stack_frame)
+
+            interval = timedelta(seconds=getattr(settings, 'SLOW_QUERY_EXPLAIN_INTERVAL', 3600))
+            stale = SlowQuery.objects.using(alias).filter(fingerprint=fingerprint).filter(
+                Q(explained_at__isnull=True) | Q(explained_at__lt=now - interval)
+            )
+            if not many and stale.exists():
+                stale.update(
+                    explain_plan=explain(sql, params, alias),
+                    explained_at=now,
+                    sample_sql=sql,
+                    sample_params=params_repr,
+                    view_name=view_name,
+                    stack_frame=stack_frame,
+                )
+    except DatabaseError:
+        # Never let the report break the request that produced it
+        logger.exception('Could not record slow query %s', fingerprint)
+
@@ -0,0 +1,228 @@
+"""
+Related posts for blog detail pages.
+
+Published posts are indexed as TF-IDF vectors over their plain text (title
+and excerpt weighted above the content). The top RELATED_POSTS_COUNT most
+similar posts of each post are stored in ``RelatedPost``, so the detail
+endpoint reads them with one indexed query.
+
+Term counts are kept per post in ``BlogPostTerms``. When a post is saved
+only its own terms are recomputed, and only the lists it can enter or
+leave are rebuilt; ``manage.py build_related_posts`` rebuilds everything
+(e.g. nightly, so document frequencies stay current).
+"""
+import logging
+import re
+from collections import Counter
+from html import unescape
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils.html import strip_tags
+
+from .models import BlogPost, BlogPostTerms, RelatedPost
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r'\w{2,}')
+
+FIELD_WEIGHTS = (('title', 3), ('excerpt', 2), ('content', 1))
+
+STOP_WORDS = frozenset('''
+    about above after again against all also am an and any are as at be because been before being
+    below between both but by can could did do does doing down during each few for from further
+    had has have having he her here hers him his how if in into is it its just me more most my
+    no nor not now of off on once only or other our ours out over own same she should so some
+    such than that the their theirs them then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with would you your
+'''.split())
+
+
+def post_terms(post):
+    """Return {term: weighted count} for a post's sanitized plain text."""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        text = unescape(strip_tags(getattr(post, field) or '')).lower()
+        for token in TOKEN.findall(text):
+            if token not in STOP_WORDS and not token.isdigit():
+                counts[token] += weight
+    return dict(counts)
+
+
+class TermMatrix:
+    """
+    L2-normalised TF-IDF vectors of the indexed posts, one row per post, in
+    compressed sparse row form (NumPy arrays).
+    """
+
+    def __init__(self, rows):
+        import numpy as np
+
+        self.post_ids = np.array([post_id for post_id, _terms in rows], dtype=np.int64)
+        self.position = {post_id: row for row, (post_id, _terms) in enumerate(rows)}
+
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        counts = []
+        for _post_id, terms in rows:
+            for term, count in terms.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+        self.size = len(vocabulary)
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        # Row number of every stored value
+        self.rows = np.repeat(np.arange(len(rows)), np.diff(self.indptr))
+
+        document_frequency = np.bincount(self.indices, minlength=self.size)
+        idf = np.log((1 + len(rows)) / (1 + document_frequency)) + 1
+        data = (1 + np.log(np.array(counts, dtype=np.float64))) * idf[self.indices]
+        norms = np.sqrt(np.bincount(self.rows, weights=data ** 2, minlength=len(rows)))
+        norms[norms == 0] = 1
+        self.data = data / norms[self.rows]
+
+    def similarities(self, row):
+        """Return the cosine similarity of one row to every row."""
+        import numpy as np
+
+        start, end = self.indptr[row], self.indptr[row + 1]
+        query = np.zeros(self.size)
+        query[self.indices[start:end]] = self.data[start:end]
+        return np.bincount(self.rows, weights=self.data * query[self.indices], minlength=len(self.post_ids))
+
+    def top(self, row, count, scores=None):
+        """Return [(post id, score)] of the most similar other posts, best first."""
+        import numpy as np
+
+        scores = (self.similarities(row) if scores is None else scores).copy()
+        scores[row] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > count:
+            candidates = candidates[np.argpartition(-scores[candidates], count - 1)[:count]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(self.post_ids[index]), float(scores[index])) for index in candidates]
+
+
+def load_matrix():
+    """Build the TF-IDF matrix of all indexed (published) posts."""
+    rows = list(
+        BlogPostTerms.objects.filter(blog_post__published=True).order_by('blog_post_id')
+        .values_list('blog_post_id', 'terms').iterator(chunk_size=500)
+    )
+    return TermMatrix(rows)
+
+
+def _entries(matrix, post_id, scores=None):
+    neighbours = matrix.top(matrix.position[post_id], settings.RELATED_POSTS_COUNT, scores)
+    return [
+        RelatedPost(blog_post_id=post_id, related_id=related_id, score=score, rank=rank)
+        for rank, (related_id, score) in enumerate(neighbours)
+    ]
+
+
+def rebuild_related_posts():
+    """
+    Recompute the terms of every published post and all related post lists.
+
+    Returns:
+        Number of posts indexed
+    """
+    terms = []
+    for post in BlogPost.objects.filter(published=True).only('pk', 'title', 'excerpt', 'content').iterator(chunk_size=500):
+        terms.append(BlogPostTerms(blog_post_id=post.pk, terms=post_terms(post)))
+    with transaction.atomic():
+        BlogPostTerms.objects.all().delete()
+        BlogPostTerms.objects.bulk_create(terms, batch_size=500)
+
+    matrix = load_matrix()
+    entries = []
+    for post_id in matrix.position:
+        entries.extend(_entries(matrix, post_id))
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPost.objects.bulk_create(entries, batch_size=1000)
+    return len(terms)
+
+
+def update_related_posts(post_ids, listed_by=()):
+    """
+    Re-index changed posts and rebuild only the related lists they affect.
+
+    Args:
+        post_ids: Posts that were saved, unpublished or deleted
+        listed_by: Posts whose lists contained a deleted post (their rows
+            are already gone through the cascade)
+    """
+    post_ids = set(post_ids)
+    published = {
+        post.pk: post
+        for post in BlogPost.objects.filter(pk__in=post_ids, published=True).only('pk', 'title', 'excerpt', 'content')
+    }
+    removed = post_ids - set(published)
+
+    with transaction.atomic():
+        BlogPostTerms.objects.filter(blog_post_id__in=removed).delete()
+        for post_id, post in published.items():
+            BlogPostTerms.objects.update_or_create(blog_post_id=post_id, defaults={'terms': post_terms(post)})
+        # Lists the changed posts are in may lose or reorder them
+        affected = set(listed_by) | set(
+            RelatedPost.objects.filter(related_id__in=post_ids).values_list('blog_post_id', flat=True)
+        )
+        RelatedPost.objects.filter(blog_post_id__in=removed).delete()
+
+    matrix = load_matrix()
+    count = settings.RELATED_POSTS_COUNT
+    current = {
+        row['blog_post']: (row['entries'], row['lowest'])
+        for row in RelatedPost.objects.values('blog_post').annotate(entries=Count('pk'), lowest=Min('score')).order_by()
+    }
+
+    scores_by_post = {}
+    for post_id in published:
+        if post_id not in matrix.position:
+            continue
+        scores = matrix.similarities(matrix.position[post_id])
+        scores_by_post[post_id] = scores
+        affected.add(post_id)
+        # Similarity is symmetric: the post enters any list it now beats
+        for index in scores.nonzero()[0]:
+            other = int(matrix.post_ids[index])
+            entries, lowest = current.get(other, (0, 0.0))
+            if entries < count or scores[index] > lowest:
+                affected.add(other)
+
+    affected = {post_id for post_id in affected - removed if post_id in matrix.position}
+    entries = []
+    for post_id in affected:
+        entries.extend(_entries(matrix, post_id, scores_by_post.get(post_id)))
+    with transaction.atomic():
+        RelatedPost.objects.filter(blog_post_id__in=affected).delete()
+        RelatedPost.objects.bulk_create(entries, batch_size=1000)
+
+
+def collect_listed_by(sender, instance, **kwargs):
+    """pre_delete handler: remember which lists contain a post before it's deleted."""
+    instance._related_listed_by = list(
+        RelatedPost.objects.filter(related=instance).values_list('blog_post_id', flat=True)
+    )
+
+
+def refresh_related_posts(sender, instance, update_fields=None, **kwargs):
+    """Signal handler: update related posts once a blog post change is committed."""
+    # View counter updates on blog post detail pages don't change the text
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    post_id = instance.pk
+    listed_by = getattr(instance, '_related_listed_by', ())
+
+    def update():
+        try:
+            update_related_posts([post_id], listed_by)
+        except Exception:
+            # The post itself is saved; the nightly rebuild catches up
+            logger.exception('Could not update related posts for blog post %s', post_id)
+
+    transaction.on_commit(update)
@@ -0,0 +1,133 @@
+"""
+Indexed search for admin changelists with large text columns.
+
+SQLite: an external-content FTS5 table per model (``<table>_fts``), kept
+current by triggers that only fire when a searched column changes.
+Searches become ``id IN (SELECT rowid FROM <table>_fts WHERE ... MATCH ...)``
+with every word matched as a token prefix.
+
+PostgreSQL: pg_trgm GIN indexes on ``UPPER(column)``, which serve the
+admin's default ``icontains`` search as is, so no query changes are needed.
+
+SQLite rebuilds a table for some schema changes, dropping its triggers, so
+they are re-created after every ``migrate`` if missing.
+"""
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.text import smart_split, unescape_string_literal
+
+# db table -> searched columns; must match the admins' search_fields
+SEARCH_INDEXES = {
+    'api_contactmessage': ['name', 'email', 'subject', 'message'],
+    'api_blogpost': ['title', 'excerpt', 'content', 'author'],
+}
+
+WORD = re.compile(r'\w')
+
+
+def _sqlite_statements(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        # Only re-index when a searched column changes (not e.g. is_read or views)
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_indexes(schema_editor):
+    """Create the search indexes for the database's backend (no-op elsewhere)."""
+    vendor = schema_editor.connection.vendor
+    for table, columns in SEARCH_INDEXES.items():
+        if vendor == 'sqlite':
+            statements = _sqlite_statements(table, columns)
+        elif vendor == 'postgresql':
+            statements = ['CREATE EXTENSION IF NOT EXISTS pg_trgm'] + [
+                f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} '
+                f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+                for column in columns
+            ]
+        else:
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+
+def drop_search_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, columns in SEARCH_INDEXES.items():
+        if vendor == 'sqlite':
+            fts = f'{table}_fts'
+            statements = [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')]
+            statements.append(f'DROP TABLE IF EXISTS {fts}')
+        elif vendor == 'postgresql':
+            statements = [f'DROP INDEX IF EXISTS {table}_{column}_trgm' for column in columns]
+        else:
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+
+def ensure_search_indexes(sender, using='default', **kwargs):
+    """post_migrate handler: re-create SQLite FTS triggers a table rebuild dropped."""
+    from django.db import connections
+
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+    if f'{next(iter(SEARCH_INDEXES))}_fts' not in existing:
+        # Search index migration not applied (yet)
+        return
+    expected = {
+        f'{table}_fts_{suffix}' for table in SEARCH_INDEXES for suffix in ('ai', 'ad', 'au')
+    } | {f'{table}_fts' for table in SEARCH_INDEXES}
+    if not expected <= existing:
+        with db.schema_editor() as schema_editor:
+            create_search_indexes(schema_editor)
+
+
+def fts_query(search_term):
+    """
+    Convert an admin search term to an FTS5 query: every word (or quoted
+    phrase) must match, as a prefix.
+    """
+    terms = []
+    for bit in smart_split(search_term):
+        if len(bit) > 1 and bit[0] in '"\'' and bit[-1] == bit[0]:
+            bit = unescape_string_literal(bit)
+        if WORD.search(bit):
+            terms.append('"%s"*' % bit.replace('"', '""'))
+    return ' '.join(terms)
+
+
+def indexed_search(queryset, search_term):
+    """
+    Filter a queryset through its model's FTS index.
+
+    Returns:
+        The filtered queryset, or None when the default admin search should
+        be used (no FTS index on this backend, or nothing searchable)
+    """
+    table = queryset.model._meta.db_table
+    if connection.vendor != 'sqlite' or table not in SEARCH_INDEXES:
+        return None
+    query = fts_query(search_term)
+    if not query:
+        return None
+    fts = f'{table}_fts'
+    return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [query]))
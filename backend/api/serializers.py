@@ -1,10 +1,8 @@
 from rest_framework import serializers
 from .models import (
     ContactMessage, Service, Testimonial, HeroImage, PageImage, BlogPost, Update,
-    AboutPage, AboutValue, AboutTimelineItem, ContactInformation,
-    AboutStorySection, AboutMissionSection, AboutVisionSection,
-    AboutValuesSection, AboutTimelineSection,
-    BlogPostImage, BlogPostVideo, GalleryItem
+    AboutSection, AboutValue, AboutTimelineItem, ContactInformation,
+    BlogPostImage, BlogPostVideo, GalleryItem, ChunkedUpload
 )
 from .utils import sanitize_html
 
@@ -124,6 +122,24 @@ class BlogPostVideoSerializer(serializers.ModelSerializer):
         return obj.get_embed_url()
 
 
+class BlogPostSummarySerializer(serializers.ModelSerializer):
+    """Blog post summary for related reading and popular/trending lists"""
+    featured_image_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BlogPost
+        fields = ['id', 'title', 'slug', 'excerpt', 'category', 'featured_image_url', 'created_date']
+        read_only_fields = fields
+
+    def get_featured_image_url(self, obj):
+        if obj.featured_image:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.featured_image.url)
+            return obj.featured_image.url
+        return None
+
+
 class BlogPostSerializer(serializers.ModelSerializer):
     featured_image_url = serializers.SerializerMethodField()
     images = BlogPostImageSerializer(many=True, read_only=True)
@@ -167,37 +183,28 @@ class UpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_date', 'updated_date']
 
 
-class AboutStorySectionSerializer(serializers.ModelSerializer):
+class AboutSectionSerializer(serializers.ModelSerializer):
     class Meta:
-        model = AboutStorySection
-        fields = ['id', 'title', 'content', 'is_active', 'created_at', 'updated_at']
+        model = AboutSection
+        fields = ['id', 'key', 'title', 'body', 'subtitle', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class AboutMissionSectionSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = AboutMissionSection
-        fields = ['id', 'title', 'content', 'is_active', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
+# Shapes of the per-section endpoints from before the sections shared a table
+class AboutTextSectionSerializer(serializers.ModelSerializer):
+    """Story, mission or vision section"""
+    content = serializers.CharField(source='body')
 
-class AboutVisionSectionSerializer(serializers.ModelSerializer):
     class Meta:
-        model = AboutVisionSection
+        model = AboutSection
         fields = ['id', 'title', 'content', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class AboutValuesSectionSerializer(serializers.ModelSerializer):
+class AboutHeaderSectionSerializer(serializers.ModelSerializer):
+    """Values or timeline section header"""
     class Meta:
-        model = AboutValuesSection
-        fields = ['id', 'title', 'subtitle', 'is_active', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
-
-class AboutTimelineSectionSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = AboutTimelineSection
+        model = AboutSection
         fields = ['id', 'title', 'subtitle', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
@@ -216,20 +223,33 @@ class AboutTimelineItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-# Legacy serializer for backward compatibility
-class AboutPageSerializer(serializers.ModelSerializer):
-    values = AboutValueSerializer(many=True, read_only=True)
-    timeline_items = AboutTimelineItemSerializer(many=True, read_only=True)
-    
-    class Meta:
-        model = AboutPage
-        fields = [
-            'id', 'story_title', 'story_content', 'mission_title', 'mission_content',
-            'vision_title', 'vision_content', 'values_title', 'values_subtitle',
-            'timeline_title', 'timeline_subtitle', 'values', 'timeline_items',
-            'is_active', 'created_at', 'updated_at'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+class AboutPageSerializer(serializers.Serializer):
+    """
+    The whole About page (see api.about.about_page), in the shape of the
+    legacy AboutPage endpoint: <section>_title / _content / _subtitle fields
+    plus the values and timeline items.
+    """
+    # Section key -> field name prefix
+    PREFIXES = {
+        'story': 'story',
+        'mission': 'mission',
+        'vision': 'vision',
+        'values_header': 'values',
+        'timeline_header': 'timeline',
+    }
+
+    def to_representation(self, content):
+        data = {}
+        for key, prefix in self.PREFIXES.items():
+            section = content['sections'].get(key)
+            text_field, attname = ('content', 'body') if key in AboutSection.TEXT_KEYS else ('subtitle', 'subtitle')
+            data[f'{prefix}_title'] = section.title if section else None
+            data[f'{prefix}_{text_field}'] = getattr(section, attname) if section else None
+        data['values'] = AboutValueSerializer(content['values'], many=True).data
+        data['timeline_items'] = AboutTimelineItemSerializer(content['timeline_items'], many=True).data
+        updated = [section.updated_at for section in content['sections'].values() if section]
+        data['updated_at'] = serializers.DateTimeField().to_representation(max(updated)) if updated else None
+        return data
 
 
 class ContactInformationSerializer(serializers.ModelSerializer):
@@ -309,3 +329,46 @@ class GalleryItemSerializer(serializers.ModelSerializer):
     
     def get_embed_url(self, obj):
         return obj.get_embed_url()
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """Serializer for resumable chunked upload sessions"""
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            'id', 'target', 'object_id', 'filename', 'total_size', 'received_bytes',
+            'status', 'stored_name', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'received_bytes', 'status', 'stored_name', 'created_at', 'updated_at']
+
+    def validate_total_size(self, value):
+        from django.conf import settings
+        max_size = settings.CHUNKED_UPLOAD_MAX_SIZE
+        if value <= 0:
+            raise serializers.ValidationError('Upload size must be greater than zero.')
+        if value > max_size:
+            raise serializers.ValidationError(
+                f'File size exceeds maximum allowed size of {max_size / (1024 * 1024):.1f}MB.'
+            )
+        return value
+
+    def validate(self, attrs):
+        from django.core.exceptions import ValidationError as DjangoValidationError
+        from django.core.files.base import ContentFile
+
+        upload = ChunkedUpload(target=attrs['target'])
+        model, field = upload.get_target_field()
+
+        # Run the target field's validators (e.g. allowed extensions) up front,
+        # so an invalid file is refused before any bytes are uploaded.
+        named_file = ContentFile(b'', name=attrs['filename'])
+        for validator in field.validators:
+            try:
+                validator(named_file)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError({'filename': e.messages})
+
+        object_id = attrs.get('object_id')
+        if object_id is not None and not model.objects.filter(pk=object_id).exists():
+            raise serializers.ValidationError({'object_id': f'{model._meta.verbose_name} {object_id} does not exist.'})
+        return attrs
@@ -0,0 +1,107 @@
+"""
+Signal handlers for the API app.
+
+Files stored by ContentAddressedStorage are reference counted: when an
+object is deleted or one of its files is replaced, the reference to the old
+file is released so shared files are removed once nothing uses them.
+
+Content changes also invalidate cached facet and row counts, feeds and sitemaps,
+are recorded in the change feed, and blog post changes update the related
+posts index. Changed images get a new admin list thumbnail.
+"""
+from django.db import transaction
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+
+from .media import is_content_addressed, iter_file_fields
+
+
+def _file_attnames(model):
+    return [field.attname for field in model._meta.concrete_fields if isinstance(field, FileField)]
+
+
+def _file_name(value):
+    # Unsaved assignments hold File objects, loaded rows plain names
+    return getattr(value, 'name', value) or ''
+
+
+def _release(model, attname, name):
+    if is_content_addressed(name):
+        storage = model._meta.get_field(attname).storage
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+def remember_file_names(sender, instance, **kwargs):
+    """Remember the file names an object was loaded with to detect replacements."""
+    instance._loaded_file_names = {
+        attname: _file_name(instance.__dict__[attname])
+        for attname in _file_attnames(sender) if attname in instance.__dict__
+    }
+
+
+def release_replaced_files(sender, instance, created, **kwargs):
+    """Release files that a save replaced or cleared."""
+    loaded = getattr(instance, '_loaded_file_names', {})
+    for attname in _file_attnames(sender):
+        # Deferred fields weren't loaded, so they can't have been changed
+        if attname not in instance.__dict__:
+            continue
+        name = _file_name(instance.__dict__[attname])
+        old = loaded.get(attname)
+        if not created and old and old != name:
+            _release(sender, attname, old)
+        loaded[attname] = name
+    instance._loaded_file_names = loaded
+
+
+def release_deleted_files(sender, instance, **kwargs):
+    """Release the files of a deleted object."""
+    for attname in _file_attnames(sender):
+        if attname in instance.__dict__:
+            _release(sender, attname, _file_name(instance.__dict__[attname]))
+
+
+def connect_media_signals():
+    models = {model for model, _field in iter_file_fields()}
+    for model in models:
+        post_init.connect(remember_file_names, sender=model, dispatch_uid=f'media_init_{model._meta.label}')
+        post_save.connect(release_replaced_files, sender=model, dispatch_uid=f'media_save_{model._meta.label}')
+        post_delete.connect(release_deleted_files, sender=model, dispatch_uid=f'media_delete_{model._meta.label}')
+
+
+def connect_content_signals():
+    from django.apps import apps
+
+    from .about import about_models, invalidate_about_content
+    from .changes import record_change, tracked_models
+    from .events import wake_update_hub
+    from .facets import FACET_SOURCES, invalidate_facets
+    from .feeds import FEED_MODELS, invalidate_feeds
+    from .models import BlogPost, ChangeLogEntry
+    from .pagination import invalidate_model_counts
+    from .related import collect_listed_by, refresh_related_posts
+    from .sitemaps import invalidate_sitemap
+    from .thumbnails import refresh_admin_thumbnail, thumbnail_models
+    for model in tracked_models():
+        post_save.connect(record_change, sender=model, dispatch_uid=f'changes_save_{model._meta.label}')
+        post_delete.connect(record_change, sender=model, dispatch_uid=f'changes_delete_{model._meta.label}')
+    post_save.connect(wake_update_hub, sender=ChangeLogEntry, dispatch_uid='update_stream_wake')
+    for queryset, _fields, _date_field in FACET_SOURCES.values():
+        model = queryset.model
+        post_save.connect(invalidate_facets, sender=model, dispatch_uid=f'facets_save_{model._meta.label}')
+        post_delete.connect(invalidate_facets, sender=model, dispatch_uid=f'facets_delete_{model._meta.label}')
+    for model in FEED_MODELS:
+        for signal, action in ((post_save, 'save'), (post_delete, 'delete')):
+            signal.connect(invalidate_feeds, sender=model, dispatch_uid=f'feeds_{action}_{model._meta.label}')
+            signal.connect(invalidate_sitemap, sender=model, dispatch_uid=f'sitemap_{action}_{model._meta.label}')
+    for model in apps.get_app_config('api').get_models():
+        post_save.connect(invalidate_model_counts, sender=model, dispatch_uid=f'counts_save_{model._meta.label}')
+        post_delete.connect(invalidate_model_counts, sender=model, dispatch_uid=f'counts_delete_{model._meta.label}')
+    for model in thumbnail_models():
+        pre_save.connect(refresh_admin_thumbnail, sender=model, dispatch_uid=f'admin_thumbnail_{model._meta.label}')
+    for model in about_models():
+        post_save.connect(invalidate_about_content, sender=model, dispatch_uid=f'about_save_{model._meta.label}')
+        post_delete.connect(invalidate_about_content, sender=model, dispatch_uid=f'about_delete_{model._meta.label}')
+    pre_delete.connect(collect_listed_by, sender=BlogPost, dispatch_uid='related_posts_pre_delete')
+    post_save.connect(refresh_related_posts, sender=BlogPost, dispatch_uid='related_posts_save')
+    post_delete.connect(refresh_related_posts, sender=BlogPost, dispatch_uid='related_posts_delete')
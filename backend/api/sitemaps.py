@@ -0,0 +1,155 @@
+"""
+XML sitemap of the public site (/sitemap.xml).
+
+The sitemap index lists one sitemap for the static pages and one per chunk
+of blog posts. Blog post chunks are fixed primary key ranges of
+SITEMAP_CHUNK_SIZE ids (50,000, the sitemap protocol limit), so an edit
+only changes the chunk its post falls in and new posts only the last one.
+
+Every document is cached separately; a content change drops just the
+affected chunk, the static pages sitemap (for its lastmod) and the index.
+"""
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.http import Http404, HttpResponse
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from . import metrics
+from .models import BlogPost, GalleryItem, Update
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+INDEX_CACHE_KEY = 'api:sitemap:index'
+PAGES_CACHE_KEY = 'api:sitemap:pages'
+
+# Frontend pages; list pages take their lastmod from the newest public row
+STATIC_PAGES = [
+    ('/', None),
+    ('/about', None),
+    ('/services', None),
+    ('/blog', (BlogPost.objects.filter(published=True), 'updated_date')),
+    ('/updates', (Update.objects.filter(published=True), 'updated_date')),
+    ('/gallery', (GalleryItem.objects.filter(is_active=True), 'updated_at')),
+    ('/contact', None),
+]
+
+
+def _chunk_cache_key(chunk):
+    return f'api:sitemap:blog:{chunk}'
+
+
+def _render(root, entries):
+    """Render (tag, loc, lastmod) entries as a urlset or sitemapindex document."""
+    stream = StringIO()
+    xml = SimplerXMLGenerator(stream, 'utf-8')
+    xml.startDocument()
+    xml.startElement(root, {'xmlns': SITEMAP_NS})
+    for tag, loc, lastmod in entries:
+        xml.startElement(tag, {})
+        xml.addQuickElement('loc', loc)
+        if lastmod:
+            xml.addQuickElement('lastmod', lastmod.date().isoformat())
+        xml.endElement(tag)
+    xml.endElement(root)
+    xml.endDocument()
+    return stream.getvalue()
+
+
+def _cached(key, build):
+    content = cache.get(key)
+    metrics.record_cache_lookup('sitemap', content is not None)
+    if content is None:
+        content = build()
+        cache.set(key, content, settings.FEEDS_CACHE_TIMEOUT)
+    return content
+
+
+def _blog_chunks():
+    """Return [(chunk number, latest update)] for chunks with published posts."""
+    chunk = ExpressionWrapper(F('pk') / settings.SITEMAP_CHUNK_SIZE, output_field=IntegerField())
+    return list(
+        BlogPost.objects.filter(published=True)
+        .annotate(chunk=chunk).values('chunk')
+        .annotate(lastmod=Max('updated_date'))
+        .order_by('chunk').values_list('chunk', 'lastmod')
+    )
+
+
+def _pages_lastmods():
+    return {
+        path: source[0].aggregate(lastmod=Max(source[1]))['lastmod'] if source else None
+        for path, source in STATIC_PAGES
+    }
+
+
+def build_index(request):
+    base = request.build_absolute_uri('/').rstrip('/')
+    pages_lastmod = max(
+        (lastmod for lastmod in _pages_lastmods().values() if lastmod), default=None
+    )
+    entries = [('sitemap', f'{base}/sitemap-pages.xml', pages_lastmod)]
+    entries += [
+        ('sitemap', f'{base}/sitemap-blog-{chunk}.xml', lastmod)
+        for chunk, lastmod in _blog_chunks()
+    ]
+    return _render('sitemapindex', entries)
+
+
+def build_pages():
+    lastmods = _pages_lastmods()
+    return _render('urlset', [
+        ('url', f'{settings.FRONTEND_URL}{path}', lastmods[path]) for path, _source in STATIC_PAGES
+    ])
+
+
+def build_blog_chunk(chunk):
+    size = settings.SITEMAP_CHUNK_SIZE
+    posts = (
+        BlogPost.objects.filter(published=True, pk__gte=chunk * size, pk__lt=(chunk + 1) * size)
+        .order_by('pk').values_list('pk', 'updated_date')
+    )
+    entries = [('url', f'{settings.FRONTEND_URL}/blog/{pk}', updated) for pk, updated in posts.iterator()]
+    if not entries:
+        return None
+    return _render('urlset', entries)
+
+
+def _xml_response(content):
+    if content is None:
+        raise Http404('No such sitemap')
+    return HttpResponse(content, content_type='application/xml; charset=utf-8')
+
+
+def sitemap_index_view(request):
+    return _xml_response(_cached(INDEX_CACHE_KEY, lambda: build_index(request)))
+
+
+def sitemap_pages_view(request):
+    return _xml_response(_cached(PAGES_CACHE_KEY, build_pages))
+
+
+def sitemap_blog_view(request, chunk):
+    # Empty chunks are cached as '' so crawlers probing them stay cheap too
+    return _xml_response(_cached(_chunk_cache_key(chunk), lambda: build_blog_chunk(chunk) or '') or None)
+
+
+def drop_sitemaps(post_ids=()):
+    """Drop the cached index and pages sitemaps and the blog chunks listing post_ids."""
+    keys = [INDEX_CACHE_KEY, PAGES_CACHE_KEY]
+    keys.extend({_chunk_cache_key(pk // settings.SITEMAP_CHUNK_SIZE) for pk in post_ids})
+    cache.delete_many(keys)
+
+
+def invalidate_sitemap(sender, instance=None, update_fields=None, **kwargs):
+    """Signal handler: drop the cached sitemaps a committed change affects."""
+    # View counter updates on blog post detail pages don't affect the sitemap
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    post_ids = []
+    if sender is BlogPost and instance is not None and instance.pk is not None:
+        post_ids.append(instance.pk)
+    transaction.on_commit(lambda: drop_sitemaps(post_ids))
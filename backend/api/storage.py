@@ -0,0 +1,228 @@
+"""
+Media storage backends.
+
+``OffloadingStorage`` is used as DEFAULT_FILE_STORAGE when upload offloading
+is enabled. It sends every regular save straight to the remote backend
+(``REMOTE_MEDIA_STORAGE``, Cloudinary in production), but also knows about
+files that admin saves have only staged on local disk so far: their names
+start with ``STAGED_PREFIX`` and are read and served from the staging
+directory until the background worker in ``api.offload`` has pushed them to
+the remote backend and swapped the field reference.
+
+``ContentAddressedStorage`` names files by the SHA-256 of their content and
+stores each unique file once, with a reference count kept in ``MediaBlob``.
+Its URLs never change content, so they can be cached forever.
+
+``LocalRemoteStorage`` is a filesystem stand-in for the remote backend, for
+tests and local development.
+"""
+import os
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, Storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+from .media import CONTENT_ADDRESSED_PREFIX, content_hash, is_content_addressed, perceptual_hash, sha256_from_name
+
+STAGED_PREFIX = 'staged/'
+
+
+@lru_cache(maxsize=None)
+def get_media_backend():
+    """Return the storage backend that holds the files (Cloudinary in production)."""
+    return import_string(settings.REMOTE_MEDIA_STORAGE)()
+
+
+@lru_cache(maxsize=None)
+def get_remote_storage():
+    """Return the storage files are ultimately uploaded to."""
+    if settings.CONTENT_ADDRESSED_MEDIA:
+        return ContentAddressedStorage()
+    return get_media_backend()
+
+
+@lru_cache(maxsize=None)
+def get_staging_storage():
+    """Return the local storage admin uploads are staged in."""
+    return FileSystemStorage(location=settings.UPLOAD_STAGING_ROOT, base_url=settings.UPLOAD_STAGING_URL)
+
+
+def is_staged(name):
+    """Return True if a stored file name refers to a locally staged file."""
+    return bool(name) and name.startswith(STAGED_PREFIX)
+
+
+@deconstructible
+class OffloadingStorage(Storage):
+    """
+    Remote media storage that also resolves names of locally staged files.
+    """
+
+    def _backend(self, name):
+        if is_staged(name):
+            return get_staging_storage(), name[len(STAGED_PREFIX):]
+        return get_remote_storage(), name
+
+    def stage(self, name, content):
+        """
+        Save content to local staging instead of the remote backend.
+
+        Args:
+            name: Desired file name (as generated by the model field)
+            content: File to save
+
+        Returns:
+            Name to store on the model field, prefixed with STAGED_PREFIX
+        """
+        return STAGED_PREFIX + get_staging_storage().save(name, content)
+
+    # Regular saves (and name generation) go straight to the remote backend
+    def _save(self, name, content):
+        return get_remote_storage().save(name, content)
+
+    def get_available_name(self, name, max_length=None):
+        return get_remote_storage().get_available_name(name, max_length=max_length)
+
+    def generate_filename(self, filename):
+        return get_remote_storage().generate_filename(filename)
+
+    def _open(self, name, mode='rb'):
+        storage, name = self._backend(name)
+        return storage.open(name, mode)
+
+    def delete(self, name):
+        storage, name = self._backend(name)
+        return storage.delete(name)
+
+    def exists(self, name):
+        storage, name = self._backend(name)
+        return storage.exists(name)
+
+    def size(self, name):
+        storage, name = self._backend(name)
+        return storage.size(name)
+
+    def url(self, name):
+        storage, name = self._backend(name)
+        return storage.url(name)
+
+    def path(self, name):
+        storage, name = self._backend(name)
+        return storage.path(name)
+
+    def get_modified_time(self, name):
+        storage, name = self._backend(name)
+        return storage.get_modified_time(name)
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Storage that keeps one copy of each unique file, named by content hash.
+
+    Saving content that is already stored only increments the reference count
+    of its MediaBlob; deleting a name decrements it, and the file itself is
+    removed from the backend once nothing references it any more. Names not
+    assigned by this storage (uploaded before it was enabled) are passed
+    through to the backend unchanged.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save
+        return name
+
+    def generate_filename(self, filename):
+        return get_media_backend().generate_filename(filename)
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        backend = get_media_backend()
+        sha256 = content_hash(content)
+        blob_name = f'{CONTENT_ADDRESSED_PREFIX}{sha256[:2]}/{sha256}{os.path.splitext(name)[1].lower()}'
+
+        if MediaBlob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + 1):
+            return MediaBlob.objects.values_list('name', flat=True).get(sha256=sha256)
+
+        # Reuses a file left without its MediaBlob row. Backends that rename on
+        # save (Cloudinary adds a prefix and suffix) never find it and store a copy
+        stored_name = blob_name if backend.exists(blob_name) else backend.save(blob_name, content)
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(
+                    sha256=sha256,
+                    name=stored_name,
+                    size=content.size,
+                    phash=perceptual_hash(content),
+                    ref_count=1,
+                )
+        except IntegrityError:
+            # The same content was stored concurrently; share that copy instead
+            if stored_name != blob_name:
+                backend.delete(stored_name)
+            return self._save(name, content)
+        return stored_name
+
+    def delete(self, name):
+        """Release one reference to a file, deleting it when no longer used."""
+        from .models import MediaBlob
+
+        backend = get_media_backend()
+        if not is_content_addressed(name):
+            return backend.delete(name)
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(sha256=sha256_from_name(name)).first()
+            if blob is None:
+                return
+            if blob.ref_count > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            blob.delete()
+            transaction.on_commit(lambda: backend.delete(blob.name))
+
+    def exists(self, name):
+        return get_media_backend().exists(name)
+
+    def _open(self, name, mode='rb'):
+        return get_media_backend().open(name, mode)
+
+    def size(self, name):
+        return get_media_backend().size(name)
+
+    def url(self, name):
+        return get_media_backend().url(name)
+
+    def path(self, name):
+        return get_media_backend().path(name)
+
+    def get_modified_time(self, name):
+        return get_media_backend().get_modified_time(name)
+
+
+@deconstructible
+class LocalRemoteStorage(FileSystemStorage):
+    """
+    Filesystem stand-in for the remote media storage.
+
+    Files are kept under REMOTE_STORAGE_STANDIN_ROOT. Set
+    REMOTE_STORAGE_STANDIN_LATENCY (seconds) to simulate a slow upload.
+    """
+
+    def __init__(self, location=None, base_url=None, **kwargs):
+        super().__init__(
+            location=location or getattr(settings, 'REMOTE_STORAGE_STANDIN_ROOT', None),
+            base_url=base_url,
+            **kwargs
+        )
+
+    def _save(self, name, content):
+        latency = getattr(settings, 'REMOTE_STORAGE_STANDIN_LATENCY', 0)
+        if latency:
+            time.sleep(latency)
+        return super()._save(name, content)
@@ -0,0 +1,141 @@
+"""
+Small preview images for admin changelists.
+
+Each model with list previews has an ``admin_thumbnail`` image field. It is
+regenerated whenever its source image changes, so list pages show images of
+a few kilobytes instead of the full-size originals. As a regular file field
+it is offloaded, content-addressed and cleaned up like any other media
+file. ``manage.py build_admin_thumbnails`` fills in existing rows.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .media import is_content_addressed
+
+logger = logging.getLogger(__name__)
+
+# Model label -> image fields the thumbnail is made from (the first one set)
+THUMBNAIL_SOURCES = {
+    'api.HeroImage': ['image'],
+    'api.PageImage': ['image'],
+    'api.BlogPost': ['featured_image'],
+    'api.GalleryItem': ['image', 'thumbnail'],
+}
+
+
+def thumbnail_models():
+    from django.apps import apps
+    return [apps.get_model(label) for label in THUMBNAIL_SOURCES]
+
+
+def thumbnail_source(obj):
+    """Return the image file the object's admin thumbnail is made from, or None."""
+    attnames = THUMBNAIL_SOURCES[obj._meta.label]
+    if getattr(obj, 'media_type', None) == 'video':
+        # Gallery videos are previewed by their thumbnail, not a leftover image
+        attnames = attnames[::-1]
+    for attname in attnames:
+        file = getattr(obj, attname)
+        if file:
+            return file
+    return None
+
+
+def make_thumbnail(file):
+    """
+    Return a JPEG no larger than ADMIN_THUMBNAIL_SIZE of an image file, or
+    None if Pillow can't read it.
+    """
+    from PIL import Image, ImageOps
+
+    size = settings.ADMIN_THUMBNAIL_SIZE
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            # Let JPEG decode at a reduced size
+            image.draft('RGB', (size * 2, size * 2))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                # Flatten transparency onto the admin's white background
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            image = image.convert('RGB')
+            image.thumbnail((size, size), Image.LANCZOS)
+            output = BytesIO()
+            image.save(output, 'JPEG', quality=80, optimize=True, progressive=True)
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+    return output.getvalue()
+
+
+def _read_thumbnail(source):
+    if not source._committed:
+        # A new upload: read it in place, it's saved after this
+        return make_thumbnail(source.file)
+    with source.storage.open(source.name, 'rb') as file:
+        return make_thumbnail(file)
+
+
+def update_admin_thumbnail(obj):
+    """
+    Regenerate obj's admin thumbnail from its current source image (without
+    saving obj).
+
+    Returns:
+        True if a thumbnail was set
+    """
+    source = thumbnail_source(obj)
+    data = None
+    if source:
+        try:
+            data = _read_thumbnail(source)
+        except Exception:
+            logger.exception('Could not read %s for the admin thumbnail of %s', source.name, obj._meta.label)
+    if data is None:
+        obj.admin_thumbnail = ''
+        return False
+    stem = os.path.splitext(os.path.basename(source.name))[0]
+    obj.admin_thumbnail = ContentFile(data, name=f'{stem}.jpg')
+    return True
+
+
+def store_admin_thumbnail(obj):
+    """
+    Regenerate and store obj's admin thumbnail with a queryset update, so
+    backfills don't fire save signals (change feed, caches, related posts).
+
+    Returns:
+        True if a thumbnail was stored
+    """
+    old = obj.admin_thumbnail.name
+    if not update_admin_thumbnail(obj):
+        return False
+    thumbnail = obj.admin_thumbnail
+    thumbnail.save(thumbnail.name, thumbnail.file, save=False)
+    type(obj).objects.filter(pk=obj.pk).update(admin_thumbnail=thumbnail.name)
+    if is_content_addressed(old):
+        thumbnail.storage.delete(old)
+    return True
+
+
+def refresh_admin_thumbnail(sender, instance, update_fields=None, **kwargs):
+    """pre_save handler: regenerate the admin thumbnail when its source image changed."""
+    # A partial save couldn't store the new thumbnail
+    if update_fields is not None and 'admin_thumbnail' not in update_fields:
+        return
+    # Names the object was loaded with (see api.signals.remember_file_names)
+    loaded = getattr(instance, '_loaded_file_names', {})
+    changed = any(
+        attname in instance.__dict__ and (getattr(instance, attname).name or '') != loaded.get(attname, '')
+        for attname in THUMBNAIL_SOURCES[sender._meta.label]
+    )
+    if changed or instance._state.adding:
+        update_admin_thumbnail(instance)
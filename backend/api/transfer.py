@@ -0,0 +1,426 @@
+"""
+Bulk export and import of public content as JSON Lines.
+
+Exports use Django's ``jsonl`` serialization (one object per line, the
+``dumpdata`` format) of every model behind the public API, parents before
+children. Blog posts are referred to by slug, so images and videos attach to
+the right post in another environment. File fields are exported as storage
+names; the media files themselves are copied separately.
+
+Imports read the same format in batches. Each batch is validated with
+``full_clean()`` (without per-row database lookups) and written with
+``bulk_create`` / ``bulk_update`` in its own transaction. Blog posts are
+matched by slug, everything else by primary key (like ``loaddata``), so
+importing a file twice updates in place. Invalid rows are reported by line
+and skipped.
+
+Bulk writes send no save signals, so afterwards the change feed entries are
+written in bulk, the affected caches are dropped once, and the related posts
+index is rebuilt. Admin list thumbnails are left to
+``manage.py build_admin_thumbnails``.
+"""
+import datetime
+import json
+import operator
+import time
+from collections import Counter
+from contextlib import nullcontext
+from functools import reduce
+
+from django.core import serializers
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.db.models import FileField, Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .changes import PARENT_FIELDS, record_bulk_changes, tracked_models
+from .media import add_references, is_content_addressed
+
+# Model label -> field rows are matched on instead of the primary key
+NATURAL_KEYS = {
+    'api.BlogPost': 'slug',
+}
+
+# Derived from other fields and rebuilt after an import
+EXCLUDED_FIELDS = {'admin_thumbnail'}
+
+# Up to this many changed blog posts, related posts are updated
+# incrementally instead of rebuilt
+INCREMENTAL_RELATED_POSTS = 100
+
+
+def export_models():
+    """Return the exported models, parents before children."""
+    return tracked_models()
+
+
+def export_fields(model):
+    return [
+        field.name for field in model._meta.local_fields
+        if not field.primary_key and field.name not in EXCLUDED_FIELDS
+    ]
+
+
+def with_children(queryset):
+    """Return [queryset] plus the child rows (blog images, videos) of its objects."""
+    querysets = [queryset]
+    for label, field_name in PARENT_FIELDS.items():
+        child = next(model for model in export_models() if model._meta.label == label)
+        if child._meta.get_field(field_name).related_model is queryset.model:
+            querysets.append(child.objects.filter(**{f'{field_name}__in': queryset.values('pk')}))
+    return querysets
+
+
+def iter_jsonl(querysets, chunk_size=500):
+    """Yield JSON Lines chunks of the objects of several querysets."""
+    for queryset in querysets:
+        fields = export_fields(queryset.model)
+        batch = []
+        for obj in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+            batch.append(obj)
+            if len(batch) >= chunk_size:
+                yield serializers.serialize('jsonl', batch, fields=fields, use_natural_foreign_keys=True)
+                batch = []
+        if batch:
+            yield serializers.serialize('jsonl', batch, fields=fields, use_natural_foreign_keys=True)
+
+
+class ImportResult:
+    """Outcome of an import: rows written per model, rejected lines and timing."""
+
+    def __init__(self):
+        self.created = Counter()
+        self.updated = Counter()
+        self.unchanged = Counter()
+        # (line number, message)
+        self.errors = []
+        self.models = set()
+        self.blog_post_ids = set()
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows(self):
+        return sum(self.created.values()) + sum(self.updated.values())
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def _message(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items())
+    return ' '.join(getattr(error, 'messages', [str(error)]))
+
+
+def _read_records(lines, result, models):
+    """Yield (line number, model, record) for the parseable lines."""
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            model = models[record['model'].lower()]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            result.errors.append((number, 'Not an exported object of a public model'))
+            continue
+        yield number, model, record
+
+
+def _batches(records, batch_size):
+    """Group consecutive records of the same model into batches."""
+    batch = []
+    for number, model, record in records:
+        if batch and (model is not batch[0][1] or len(batch) >= batch_size):
+            yield batch[0][1], batch
+            batch = []
+        batch.append((number, model, record))
+    if batch:
+        yield batch[0][1], batch
+
+
+def _foreign_keys(model, batch):
+    """
+    Resolve the foreign keys of a batch with one query per related model.
+
+    Returns:
+        {field name: {exported value: primary key}}
+    """
+    resolved = {}
+    for field in model._meta.concrete_fields:
+        if not field.is_relation:
+            continue
+        values = {
+            tuple(value) if isinstance(value, list) else value
+            for _number, _model, record in batch
+            for value in [record.get('fields', {}).get(field.name)]
+            if value is not None
+        }
+        related = field.related_model
+        key_field = NATURAL_KEYS.get(related._meta.label)
+        natural = {value[0] for value in values if isinstance(value, tuple)}
+        plain = {value for value in values if not isinstance(value, tuple)}
+        mapping = {}
+        if natural and key_field:
+            for key, pk in related.objects.filter(**{f'{key_field}__in': natural}).values_list(key_field, 'pk'):
+                mapping[(key,)] = pk
+        if plain:
+            for pk in related.objects.filter(pk__in=plain).values_list('pk', flat=True):
+                mapping[pk] = pk
+        resolved[field.name] = mapping
+    return resolved
+
+
+def _assign(obj, fields, foreign_keys):
+    """Set exported field values on obj; returns the names of the fields set."""
+    assigned = []
+    for name, value in fields.items():
+        try:
+            field = obj._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.primary_key or name in EXCLUDED_FIELDS or not field.concrete:
+            continue
+        if field.is_relation:
+            if value is not None:
+                key = tuple(value) if isinstance(value, list) else value
+                if key not in foreign_keys[name]:
+                    raise ValidationError({name: [f'No {field.related_model._meta.verbose_name} {value!r}']})
+                value = foreign_keys[name][key]
+        else:
+            value = field.to_python(value)
+        setattr(obj, field.attname, value)
+        assigned.append(field.attname)
+    return assigned
+
+
+def _assign_slugs(model, objects):
+    """Give new blog posts without a slug a unique one (bulk_create skips save())."""
+    missing = [obj for obj in objects if not obj.slug]
+    if not missing:
+        return
+    taken = {obj.slug for obj in objects if obj.slug}
+    bases = sorted({slugify(obj.title) or 'post' for obj in missing})
+    for start in range(0, len(bases), 100):
+        condition = reduce(operator.or_, (Q(slug=base) | Q(slug__startswith=f'{base}-') for base in bases[start:start + 100]))
+        taken.update(model.objects.filter(condition).values_list('slug', flat=True))
+    for obj in missing:
+        base = slugify(obj.title) or 'post'
+        slug, counter = base, 1
+        while slug in taken:
+            slug = f'{base}-{counter}'
+            counter += 1
+        obj.slug = slug
+        taken.add(slug)
+
+
+def _file_changes(model, created, updated):
+    """Return (names newly referenced, names no longer referenced) by the batch."""
+    attnames = [field.attname for field in model._meta.concrete_fields if isinstance(field, FileField)]
+    added, released = [], []
+    for obj in created:
+        added.extend(getattr(obj, attname).name for attname in attnames if getattr(obj, attname))
+    for obj in updated:
+        # Names the row was loaded with (see api.signals.remember_file_names)
+        loaded = getattr(obj, '_loaded_file_names', {})
+        for attname in attnames:
+            old, new = loaded.get(attname) or '', getattr(obj, attname).name or ''
+            if old != new:
+                if new:
+                    added.append(new)
+                if old:
+                    released.append((attname, old))
+    return added, released
+
+
+def _same_value(imported, current):
+    # Exported datetimes and times have millisecond precision (DjangoJSONEncoder)
+    if isinstance(imported, (datetime.datetime, datetime.time)) and isinstance(current, type(imported)):
+        return imported == current.replace(microsecond=current.microsecond // 1000 * 1000)
+    return imported == current
+
+
+def _restore_auto_now(model, created, exported):
+    """Put back the exported auto_now values (e.g. updated_at) bulk_create replaced with now."""
+    restored, fields = [], set()
+    for obj in created:
+        values = exported.get(id(obj))
+        if values and obj.pk is not None:
+            for attname, value in values.items():
+                setattr(obj, attname, value)
+            restored.append(obj)
+            fields.update(values)
+    if restored:
+        # bulk_update doesn't apply auto_now
+        model.objects.bulk_update(restored, sorted(fields), batch_size=200)
+
+
+def _import_batch(model, batch, result):
+    label = model._meta.label
+    key_field = NATURAL_KEYS.get(label)
+    foreign_keys = _foreign_keys(model, batch)
+    # Foreign keys are checked by _foreign_keys, not one query per row
+    relations = [field for field in model._meta.concrete_fields if field.is_relation]
+    exclude = [field.name for field in relations]
+
+    def key_of(record):
+        return record.get('fields', {}).get(key_field) if key_field else record.get('pk')
+
+    keys = {key_of(record) for _number, _model, record in batch} - {None, ''}
+    existing = model.objects.in_bulk(keys, field_name=key_field or 'pk') if keys else {}
+    auto_now = [field.attname for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+    # Later lines for the same object win
+    pending = {}
+    for number, _model, record in batch:
+        key = key_of(record)
+        pending[key if key not in (None, '') else ('line', number)] = (number, record)
+
+    created, updated, update_fields = [], [], set()
+    exported_auto_now = {}
+    now = timezone.now()
+    for key, (number, record) in pending.items():
+        obj = existing.get(key)
+        is_new = obj is None
+        if is_new:
+            obj = model()
+            if not key_field and record.get('pk') is not None:
+                obj.pk = record['pk']
+        else:
+            before = {field.attname: field.value_from_object(obj) for field in model._meta.concrete_fields}
+        try:
+            assigned = _assign(obj, record.get('fields', {}), foreign_keys)
+            for field in relations:
+                if not field.null and getattr(obj, field.attname) is None:
+                    raise ValidationError({field.name: ['This field is required.']})
+            obj.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+        except (ValidationError, ValueError, TypeError) as error:
+            result.errors.append((number, f'{label}: {_message(error)}'))
+            continue
+        if is_new:
+            created.append(obj)
+            exported_auto_now[id(obj)] = {
+                attname: getattr(obj, attname) for attname in auto_now
+                if attname in assigned and getattr(obj, attname) is not None
+            }
+            continue
+        # Re-importing unchanged rows writes nothing. auto_now fields are
+        # rewritten on every save, so they don't count as changes
+        changed = [
+            attname for attname in assigned
+            if attname not in auto_now and not _same_value(getattr(obj, attname), before[attname])
+        ]
+        if not changed:
+            result.unchanged[label] += 1
+            continue
+        for attname in auto_now:
+            setattr(obj, attname, now)
+        update_fields.update(changed, auto_now)
+        updated.append(obj)
+
+    if key_field == 'slug':
+        _assign_slugs(model, created)
+    added, released = _file_changes(model, created, updated)
+
+    first, last = batch[0][0], batch[-1][0]
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(created)
+            _restore_auto_now(model, created, exported_auto_now)
+            if updated and update_fields:
+                # Small batches keep the CASE expressions bulk_update builds cheap to compile
+                model.objects.bulk_update(updated, sorted(update_fields), batch_size=200)
+            add_references(added)
+            for attname, name in released:
+                if is_content_addressed(name):
+                    storage = model._meta.get_field(attname).storage
+                    transaction.on_commit(lambda storage=storage, name=name: storage.delete(name))
+            record_bulk_changes(model, created, created=True)
+            record_bulk_changes(model, updated, created=False)
+    except DatabaseError as error:
+        result.errors.append((first, f'{label} (lines {first}-{last}) not imported: {error}'))
+        return
+
+    result.created[label] += len(created)
+    result.updated[label] += len(updated)
+    if created or updated:
+        result.models.add(model)
+    if label == 'api.BlogPost':
+        result.blog_post_ids.update(obj.pk for obj in created + updated)
+
+
+def invalidate_after_bulk_write(models, blog_post_ids=()):
+    """
+    Drop the caches that save signals would have dropped for rows written
+    with bulk_create / bulk_update (counts, feeds, facets, sitemaps, About
+    content).
+    """
+    from .about import about_models, invalidate_about_content
+    from .facets import FACET_SOURCES, invalidate_facets
+    from .feeds import FEED_MODELS, invalidate_feeds
+    from .pagination import invalidate_counts
+    from .sitemaps import drop_sitemaps
+
+    facet_models = {queryset.model for queryset, _fields, _date_field in FACET_SOURCES.values()}
+    for model in models:
+        invalidate_counts(model)
+        if model in FEED_MODELS:
+            invalidate_feeds(model)
+        if model in facet_models:
+            invalidate_facets(model)
+    if set(models) & set(about_models()):
+        invalidate_about_content()
+    if models:
+        drop_sitemaps(blog_post_ids)
+
+
+def _finish(result):
+    """Do what the save signals would have done for the imported rows."""
+    from .related import rebuild_related_posts, update_related_posts
+
+    invalidate_after_bulk_write(result.models, result.blog_post_ids)
+
+    # Rows created with their exported primary keys don't advance the sequences
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), list(result.models)):
+            cursor.execute(sql)
+
+    if len(result.blog_post_ids) > INCREMENTAL_RELATED_POSTS:
+        rebuild_related_posts()
+    elif result.blog_post_ids:
+        update_related_posts(result.blog_post_ids)
+
+
+def import_jsonl(lines, batch_size=1000, dry_run=False, progress=None):
+    """
+    Import exported JSON Lines.
+
+    Args:
+        lines: Iterable of text lines (e.g. an open file)
+        batch_size: Rows validated and written per transaction
+        dry_run: Validate and write everything, then roll it back
+        progress: Optional callable(result) called after every batch
+
+    Returns:
+        ImportResult
+    """
+    result = ImportResult()
+    models = {model._meta.label_lower: model for model in export_models()}
+    # A dry run keeps every batch until the end, so later batches can refer
+    # to objects created by earlier ones
+    with transaction.atomic() if dry_run else nullcontext():
+        for model, batch in _batches(_read_records(lines, result, models), batch_size):
+            _import_batch(model, batch, result)
+            result.elapsed = time.perf_counter() - result.started
+            if progress:
+                progress(result)
+        if dry_run:
+            transaction.set_rollback(True)
+    if not dry_run:
+        _finish(result)
+    result.elapsed = time.perf_counter() - result.started
+    return result
@@ -0,0 +1,149 @@
+"""
+Streaming upload handling.
+
+``SizeLimitedUploadHandler`` streams every multipart file upload to a
+temporary file and stops storing it as soon as the per-field size limit is
+crossed, instead of buffering the whole upload in worker memory and
+validating it afterwards. Rejected uploads are recorded on the request and
+reported as form errors by ``with_upload_errors``.
+
+The chunk helpers below back the resumable upload endpoints used for large
+videos (see ``views.chunked_upload_*``).
+"""
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+
+def get_upload_size_limit(field_name):
+    """
+    Return the maximum upload size in bytes for a form field.
+
+    Args:
+        field_name: Form field name, optionally with a formset prefix
+            (e.g. 'videos-0-video_file')
+
+    Returns:
+        Limit in bytes from UPLOAD_FIELD_SIZE_LIMITS, or MAX_UPLOAD_SIZE
+    """
+    limits = getattr(settings, 'UPLOAD_FIELD_SIZE_LIMITS', {})
+    base_name = field_name.rsplit('-', 1)[-1]
+    return limits.get(base_name, getattr(settings, 'MAX_UPLOAD_SIZE', 10 * 1024 * 1024))
+
+
+def _format_size(size):
+    return f'{size / (1024 * 1024):.1f}MB'
+
+
+class SizeLimitedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploads to a temporary file and abort each file at its size limit.
+
+    Requests whose Content-Length already exceeds the largest possible upload
+    are rejected before any of the body is read.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if self.request is not None:
+            self.request.upload_errors = {}
+        limits = getattr(settings, 'UPLOAD_FIELD_SIZE_LIMITS', {}).values()
+        largest = max([get_upload_size_limit('')] + list(limits))
+        if content_length and content_length > largest + settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            raise RequestDataTooBig(
+                f'Upload of {_format_size(content_length)} exceeds the maximum of {_format_size(largest)}.'
+            )
+        return None
+
+    def new_file(self, field_name, *args, **kwargs):
+        self.size_limit = get_upload_size_limit(field_name)
+        super().new_file(field_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.size_limit:
+            self._reject()
+        return super().receive_data_chunk(raw_data, start)
+
+    def _reject(self):
+        if self.request is not None:
+            self.request.upload_errors[self.field_name] = (
+                f'File "{self.file_name}" exceeds the maximum allowed size of {_format_size(self.size_limit)}.'
+            )
+        # The parser closes (and thereby deletes) the temporary file and
+        # discards the rest of this file's data without storing it.
+        raise SkipFile()
+
+
+def with_upload_errors(form_class, request):
+    """
+    Return a form class that reports uploads rejected by SizeLimitedUploadHandler.
+
+    Args:
+        form_class: Form class to extend
+        request: Current HttpRequest
+
+    Returns:
+        form_class itself, or a subclass adding an error to each rejected field
+    """
+    errors = getattr(request, 'upload_errors', None)
+    if not errors:
+        return form_class
+
+    class UploadLimitedForm(form_class):
+        def clean(self):
+            cleaned_data = super().clean()
+            for name in list(self.fields):
+                message = errors.get(self.add_prefix(name))
+                if message:
+                    self.add_error(name, message)
+            return cleaned_data
+
+    UploadLimitedForm.__name__ = form_class.__name__
+    return UploadLimitedForm
+
+
+# ============================================================================
+# RESUMABLE CHUNKED UPLOADS
+# ============================================================================
+
+def chunk_path(upload):
+    """Return the staging path holding the bytes received so far for an upload."""
+    directory = Path(settings.CHUNKED_UPLOAD_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f'{upload.pk}.part'
+
+
+def write_chunk(upload, offset, stream, length, block_size=64 * 1024):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset`` of the staging file.
+
+    The request body is copied in small blocks so a chunk is never held in
+    memory as a whole. Any bytes beyond the new end (left over from an
+    interrupted earlier attempt) are truncated.
+
+    Returns:
+        Number of bytes written
+    """
+    path = chunk_path(upload)
+    mode = 'r+b' if path.exists() else 'w+b'
+    written = 0
+    with open(path, mode) as handle:
+        handle.seek(offset)
+        while written < length:
+            block = stream.read(min(block_size, length - written))
+            if not block:
+                break
+            handle.write(block)
+            written += len(block)
+        handle.truncate()
+    return written
+
+
+def discard_chunks(upload):
+    """Delete the staging file of an upload, if any."""
+    try:
+        os.remove(chunk_path(upload))
+    except FileNotFoundError:
+        pass
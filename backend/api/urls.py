@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import events, feeds, views
 
 router = DefaultRouter()
 router.register(r'services', views.ServiceViewSet, basename='service')
@@ -9,8 +9,8 @@ router.register(r'hero-images', views.HeroImageViewSet, basename='hero-image')
 router.register(r'page-images', views.PageImageViewSet, basename='page-image')
 router.register(r'blog-posts', views.BlogPostViewSet, basename='blog-post')
 router.register(r'updates', views.UpdateViewSet, basename='update')
-# Legacy endpoint removed - use individual section endpoints instead
-# router.register(r'about-page', views.AboutPageViewSet, basename='about-page')
+# Before the per-section endpoints, so the change feed lists sections under it
+router.register(r'about-sections', views.AboutSectionViewSet, basename='about-section')
 router.register(r'about-story', views.AboutStorySectionViewSet, basename='about-story')
 router.register(r'about-mission', views.AboutMissionSectionViewSet, basename='about-mission')
 router.register(r'about-vision', views.AboutVisionSectionViewSet, basename='about-vision')
@@ -24,5 +24,17 @@ router.register(r'gallery', views.GalleryItemViewSet, basename='gallery-item')
 urlpatterns = [
     path('contact/', views.contact_create, name='contact-create'),
     path('contact/list/', views.contact_list, name='contact-list'),
+    path('about-page/', views.about_page_view, name='about-page'),
+    path('facets/', views.facets_view, name='facets'),
+    path('changes/', views.changes_view, name='changes'),
+    path('updates/stream/', events.update_stream_view, name='update-stream'),
+    # Before the router so 'popular'/'trending' aren't taken as blog post ids
+    path('blog-posts/popular/', views.popular_posts_view, name='blog-post-popular'),
+    path('blog-posts/trending/', views.trending_posts_view, name='blog-post-trending'),
+    path('feeds/<slug:name>.<slug:feed_format>', feeds.feed_view, name='feed'),
+    path('reorder/<slug:model_name>/', views.reorder_view, name='reorder'),
+    path('uploads/', views.chunked_upload_create, name='chunked-upload-create'),
+    path('uploads/<uuid:upload_id>/', views.chunked_upload_detail, name='chunked-upload-detail'),
+    path('uploads/<uuid:upload_id>/complete/', views.chunked_upload_complete, name='chunked-upload-complete'),
     path('', include(router.urls)),
 ]
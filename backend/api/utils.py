@@ -71,17 +71,19 @@ def get_video_embed_url(video_url, video_type):
     return video_url
 
 
-def validate_file_size(file):
+def validate_file_size(file, max_size=None):
     """
     Validate that uploaded file size is within limits.
     
     Args:
         file: Django UploadedFile object
+        max_size: Limit in bytes (default: MAX_UPLOAD_SIZE)
         
     Raises:
         ValidationError if file is too large
     """
-    max_size = getattr(settings, 'MAX_UPLOAD_SIZE', 10 * 1024 * 1024)  # Default 10MB
+    if max_size is None:
+        max_size = getattr(settings, 'MAX_UPLOAD_SIZE', 10 * 1024 * 1024)  # Default 10MB
     
     if file.size > max_size:
         max_size_mb = max_size / (1024 * 1024)
@@ -2,27 +2,46 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAdminUser, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.throttling import AnonRateThrottle
-from django.db import models
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import models, transaction
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from . import metrics
+from .about import about_page
+from .changes import get_changes
+from .facets import get_facets
+from .idempotency import IdempotencyKeyReused, Submission, SubmissionInProgress, valid_idempotency_key
+from .ordering import apply_ordering, ordered_model
+from .pagination import FastCountPagination
+from .popularity import POPULAR_PERIODS, popular_posts, record_view, trending_posts
+from .uploads import discard_chunks, chunk_path, write_chunk
 from .models import (
     ContactMessage, Service, Testimonial, HeroImage, PageImage, BlogPost, Update,
-    # AboutPage,  # Legacy model - removed from API
-    AboutValue, AboutTimelineItem, ContactInformation,
-    AboutStorySection, AboutMissionSection, AboutVisionSection,
-    AboutValuesSection, AboutTimelineSection, GalleryItem
+    AboutSection, AboutValue, AboutTimelineItem, ContactInformation,
+    GalleryItem, ChunkedUpload, ChangeLogEntry,
+    RelatedPost
 )
 from .serializers import (
     ContactMessageSerializer, ServiceSerializer, TestimonialSerializer,
     HeroImageSerializer, PageImageSerializer, BlogPostSerializer, UpdateSerializer,
-    # AboutPageSerializer,  # Legacy serializer - removed from API
-    ContactInformationSerializer,
-    AboutStorySectionSerializer, AboutMissionSectionSerializer, AboutVisionSectionSerializer,
-    AboutValuesSectionSerializer, AboutTimelineSectionSerializer,
-    AboutValueSerializer, AboutTimelineItemSerializer, GalleryItemSerializer
+    ContactInformationSerializer, AboutPageSerializer,
+    AboutSectionSerializer, AboutTextSectionSerializer, AboutHeaderSectionSerializer,
+    AboutValueSerializer, AboutTimelineItemSerializer, GalleryItemSerializer,
+    ChunkedUploadSerializer, BlogPostSummarySerializer
 )
 
 
+# Fields compared to recognise a repeated contact form submission
+CONTACT_FIELDS = ['name', 'email', 'phone', 'subject', 'message']
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])  # Explicitly allow public access for contact form
 @throttle_classes([AnonRateThrottle])  # Rate limit to prevent spam/DoS attacks
@@ -31,11 +50,46 @@ def contact_create(request):
     Create a new contact message.
     Public endpoint for contact form submissions.
     Rate limited to prevent spam and DoS attacks.
-    """
-    serializer = ContactMessageSerializer(data=request.data)
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    Repeats of a submission (the same Idempotency-Key header, or the same
+    content within CONTACT_DUPLICATE_WINDOW seconds) get the original
+    response back without another write (see api/idempotency.py).
+    """
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None and not valid_idempotency_key(idempotency_key):
+        return Response(
+            {'error': 'Idempotency-Key must be 1-255 printable ASCII characters.'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    submission = Submission(
+        'contact', request.data, CONTACT_FIELDS, idempotency_key,
+        key_timeout=settings.CONTACT_IDEMPOTENCY_TIMEOUT,
+        window=settings.CONTACT_DUPLICATE_WINDOW,
+    )
+    try:
+        replay = submission.claim()
+    except IdempotencyKeyReused:
+        return Response(
+            {'error': 'This Idempotency-Key was already used for a different message.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    except SubmissionInProgress:
+        return Response(
+            {'error': 'This message is already being sent.'},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Retry-After': '1'},
+        )
+    if replay is not None:
+        return Response(replay['data'], status=replay['status'], headers={'Idempotent-Replayed': 'true'})
+
+    try:
+        serializer = ContactMessageSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            submission.complete(status.HTTP_201_CREATED, dict(serializer.data))
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+    finally:
+        submission.release()
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -50,6 +104,273 @@ def contact_list(request):
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@throttle_classes([])  # Scrapers poll frequently; never throttle them
+def metrics_view(request):
+    """
+    Expose request, latency and cache metrics in Prometheus text format (staff only).
+    Prometheus can authenticate with HTTP Basic auth as a staff user.
+    """
+    return HttpResponse(
+        metrics.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def facets_view(request):
+    """
+    Counts per blog category, gallery event/media type, update type/priority
+    and year/month, for published content only.
+    Public endpoint used to render filter options with counts.
+    """
+    return Response(get_facets())
+
+
+def _ranked_posts(request, ranking):
+    """Serialize [(post id, extra fields)] in ranking order, skipping missing posts."""
+    posts = BlogPost.objects.filter(published=True).defer('content').in_bulk([post_id for post_id, _extra in ranking])
+    context = {'request': request}
+    return [
+        dict(BlogPostSummarySerializer(posts[post_id], context=context).data, **extra)
+        for post_id, extra in ranking if post_id in posts
+    ]
+
+
+def _ranking_limit(request):
+    try:
+        return min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        return None
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def popular_posts_view(request):
+    """
+    Most viewed published blog posts over ?period=day|week|month (default
+    week). Optional 'limit' (default 10, max 50).
+    """
+    period = request.query_params.get('period', 'week')
+    limit = _ranking_limit(request)
+    if period not in POPULAR_PERIODS or limit is None:
+        return Response(
+            {'error': f"'period' must be one of {', '.join(POPULAR_PERIODS)} and 'limit' an integer."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    ranking = [(post_id, {'period_views': views}) for post_id, views in popular_posts(period, limit)]
+    return Response({'period': period, 'results': _ranked_posts(request, ranking)})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def trending_posts_view(request):
+    """
+    Published blog posts viewed most above their usual level in the last
+    24 hours. Optional 'limit' (default 10, max 50).
+    """
+    limit = _ranking_limit(request)
+    if limit is None:
+        return Response({'error': "'limit' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    ranking = [
+        (post_id, {'recent_views': views, 'trend_score': score})
+        for post_id, views, score in trending_posts(limit)
+    ]
+    return Response({'results': _ranked_posts(request, ranking)})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def changes_view(request):
+    """
+    Delta sync: public objects created, updated or deleted after ?since=<seq>.
+    Without 'since', returns only the latest sequence number to sync from.
+    Optional 'limit' (default 500, max 1000); fetch again from 'next' while
+    'has_more' is true. Returns 410 if 'since' is older than the retained
+    change log, in which case the client must reload the full lists.
+    """
+    latest = ChangeLogEntry.objects.order_by('-seq').values_list('seq', flat=True).first() or 0
+    since = request.query_params.get('since')
+    if since is None:
+        return Response({'latest': latest})
+
+    try:
+        since = int(since)
+        limit = min(max(int(request.query_params.get('limit', 500)), 1), 1000)
+    except ValueError:
+        return Response({'error': "'since' and 'limit' must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+    oldest = ChangeLogEntry.objects.order_by('seq').values_list('seq', flat=True).first()
+    if oldest is not None and since < oldest - 1:
+        # Entries after 'since' have been pruned
+        return Response(
+            {'error': 'Change log no longer covers this sequence number; reload all content.', 'latest': latest},
+            status=status.HTTP_410_GONE
+        )
+
+    changes, next_seq, has_more = get_changes(request, since, limit)
+    return Response({'changes': changes, 'next': next_seq, 'has_more': has_more, 'latest': latest})
+
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def chunked_upload_create(request):
+    """
+    Start a resumable upload for a large video (admin only).
+    Expects target ('gallery_item' or 'blog_post_video'), filename, total_size
+    and optionally object_id to attach the finished file to.
+    """
+    # Drop sessions abandoned for longer than the expiry period
+    cutoff = timezone.now() - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+    for stale in ChunkedUpload.objects.filter(status='uploading', updated_at__lt=cutoff):
+        discard_chunks(stale)
+        stale.delete()
+
+    serializer = ChunkedUploadSerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save(uploaded_by=request.user)
+        data = dict(serializer.data, chunk_size=settings.CHUNKED_UPLOAD_CHUNK_SIZE)
+        return Response(data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAdminUser])
+def chunked_upload_detail(request, upload_id):
+    """
+    GET: current status and offset, to resume an interrupted upload.
+    PUT: append the next chunk; requires a 'Content-Range: bytes start-end/total'
+         header whose start equals the current offset.
+    DELETE: abort the upload and discard received data.
+    """
+    if request.method == 'GET':
+        upload = get_object_or_404(ChunkedUpload, pk=upload_id)
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    if request.method == 'DELETE':
+        upload = get_object_or_404(ChunkedUpload, pk=upload_id)
+        discard_chunks(upload)
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    match = CONTENT_RANGE.match(request.META.get('HTTP_CONTENT_RANGE', ''))
+    if not match:
+        return Response(
+            {'error': 'A Content-Range header of the form "bytes start-end/total" is required.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    start, end, total = (int(value) for value in match.groups())
+    length = end - start + 1
+
+    if length > settings.CHUNKED_UPLOAD_CHUNK_SIZE:
+        return Response(
+            {'error': f'Chunks may not exceed {settings.CHUNKED_UPLOAD_CHUNK_SIZE} bytes.'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    with transaction.atomic():
+        # Lock the session so concurrent retries of the same chunk can't interleave
+        upload = get_object_or_404(ChunkedUpload.objects.select_for_update(), pk=upload_id)
+        if upload.status != 'uploading':
+            return Response({'error': 'Upload is already complete.'}, status=status.HTTP_409_CONFLICT)
+        if total != upload.total_size or end >= total or length <= 0:
+            return Response({'error': 'Content-Range does not match the upload size.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start != upload.received_bytes:
+            # Client is out of sync (e.g. a retried chunk); tell it where to resume
+            return Response(
+                {'error': 'Chunk does not start at the current offset.', 'offset': upload.received_bytes},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # Django gives an empty body (no or zero Content-Length) no stream
+        written = write_chunk(upload, start, request.stream, length) if request.stream is not None else 0
+        if written != length:
+            return Response(
+                {'error': 'Incomplete chunk received.', 'offset': upload.received_bytes},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        upload.received_bytes = start + written
+        upload.save(update_fields=['received_bytes', 'updated_at'])
+
+    return Response({'offset': upload.received_bytes, 'total_size': upload.total_size})
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def chunked_upload_complete(request, upload_id):
+    """
+    Finish an upload once all bytes are received: move the file into media
+    storage and attach it to the target object, if one was given.
+    """
+    with transaction.atomic():
+        upload = get_object_or_404(ChunkedUpload.objects.select_for_update(), pk=upload_id)
+        if upload.status == 'complete':
+            return Response(ChunkedUploadSerializer(upload).data)
+        if upload.received_bytes != upload.total_size:
+            return Response(
+                {'error': 'Upload is not complete.', 'offset': upload.received_bytes},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        model, field = upload.get_target_field()
+        with open(chunk_path(upload), 'rb') as handle:
+            if upload.object_id is not None:
+                instance = get_object_or_404(model, pk=upload.object_id)
+                getattr(instance, field.name).save(upload.filename, File(handle), save=True)
+                stored_name = getattr(instance, field.name).name
+            else:
+                name = field.generate_filename(None, upload.filename)
+                stored_name = field.storage.save(name, File(handle), max_length=field.max_length)
+
+        upload.status = 'complete'
+        upload.stored_name = stored_name
+        upload.save(update_fields=['status', 'stored_name', 'updated_at'])
+
+    discard_chunks(upload)
+    data = dict(ChunkedUploadSerializer(upload).data, url=field.storage.url(stored_name))
+    return Response(data)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def reorder_view(request, model_name):
+    """
+    Save a new display order in one request (admin only).
+    Expects ids: the items in their new order, either all of them or a subset
+    rearranged among the positions it occupies (e.g. one admin page), and for
+    blog post images/videos, blog_post. Only rows whose order value has to
+    change are written (see api/ordering.py).
+    """
+    try:
+        model, scope = ordered_model(model_name)
+    except LookupError:
+        return Response({'error': 'This content cannot be reordered.'}, status=status.HTTP_404_NOT_FOUND)
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return Response({'error': 'ids must be a non-empty list of item IDs.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        orders, updated = apply_ordering(model, ids, parent=request.data.get(scope) if scope else None)
+    except ValidationError as e:
+        return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'order': orders, 'updated': updated})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def about_page_view(request):
+    """
+    The whole About page: every active section plus the values and timeline
+    items, in the legacy AboutPage shape (a one-item list). Cached as one
+    object until any of it changes.
+    """
+    return Response([AboutPageSerializer(about_page()).data])
+
+
 class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing services.
@@ -147,9 +468,19 @@ class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
+        # Counted in memory and written in batches (see api.popularity)
+        record_view(instance.pk)
         instance.views += 1
-        instance.save(update_fields=['views'])
-        return super().retrieve(request, *args, **kwargs)
+        data = self.get_serializer(instance).data
+        # Precomputed by api.related; one query on the (blog_post, rank) index
+        related = (
+            RelatedPost.objects.filter(blog_post=instance, related__published=True)
+            .select_related('related').defer('related__content').order_by('rank')
+        )
+        data['related_posts'] = BlogPostSummarySerializer(
+            [entry.related for entry in related], many=True, context=self.get_serializer_context()
+        ).data
+        return Response(data)
 
 
 class UpdateViewSet(viewsets.ReadOnlyModelViewSet):
@@ -174,79 +505,77 @@ class UpdateViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class AboutStorySectionViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutSectionViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for viewing About Story section.
-    Returns only the active story section.
+    ViewSet for viewing the active About page sections, one per key.
     Public read-only endpoint.
     """
     permission_classes = [AllowAny]  # Explicitly allow public read access
-    serializer_class = AboutStorySectionSerializer
+    serializer_class = AboutSectionSerializer
     pagination_class = None
-    
+
     def get_queryset(self):
-        # Return only the most recent active story section (max 1 for safety)
-        return AboutStorySection.objects.filter(is_active=True).order_by('-updated_at')[:1]
+        return AboutSection.objects.filter(is_active=True)
 
+    def list(self, request, *args, **kwargs):
+        # Served from the cached About page
+        sections = [section for section in about_page()['sections'].values() if section]
+        return Response(self.get_serializer(sections, many=True).data)
 
-class AboutMissionSectionViewSet(viewsets.ReadOnlyModelViewSet):
+
+class AboutStorySectionViewSet(AboutSectionViewSet):
+    """
+    ViewSet for viewing About Story section.
+    Returns only the active story section.
+    Public read-only endpoint.
+    """
+    section_key = 'story'
+    serializer_class = AboutTextSectionSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().filter(key=self.section_key)
+
+    def list(self, request, *args, **kwargs):
+        section = about_page()['sections'][self.section_key]
+        return Response([self.get_serializer(section).data] if section else [])
+
+
+class AboutMissionSectionViewSet(AboutStorySectionViewSet):
     """
     ViewSet for viewing About Mission section.
     Returns only the active mission section.
     Public read-only endpoint.
     """
-    permission_classes = [AllowAny]  # Explicitly allow public read access
-    serializer_class = AboutMissionSectionSerializer
-    pagination_class = None
-    
-    def get_queryset(self):
-        # Return only the most recent active mission section (max 1 for safety)
-        return AboutMissionSection.objects.filter(is_active=True).order_by('-updated_at')[:1]
+    section_key = 'mission'
 
 
-class AboutVisionSectionViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutVisionSectionViewSet(AboutStorySectionViewSet):
     """
     ViewSet for viewing About Vision section.
     Returns only the active vision section.
     Public read-only endpoint.
     """
-    permission_classes = [AllowAny]  # Explicitly allow public read access
-    serializer_class = AboutVisionSectionSerializer
-    pagination_class = None
-    
-    def get_queryset(self):
-        # Return only the most recent active vision section (max 1 for safety)
-        return AboutVisionSection.objects.filter(is_active=True).order_by('-updated_at')[:1]
+    section_key = 'vision'
 
 
-class AboutValuesSectionViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutValuesSectionViewSet(AboutStorySectionViewSet):
     """
     ViewSet for viewing About Values section header.
     Returns only the active values section header.
     Public read-only endpoint.
     """
-    permission_classes = [AllowAny]  # Explicitly allow public read access
-    serializer_class = AboutValuesSectionSerializer
-    pagination_class = None
-    
-    def get_queryset(self):
-        # Return only the most recent active values section header (max 1 for safety)
-        return AboutValuesSection.objects.filter(is_active=True).order_by('-updated_at')[:1]
+    section_key = 'values_header'
+    serializer_class = AboutHeaderSectionSerializer
 
 
-class AboutTimelineSectionViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutTimelineSectionViewSet(AboutStorySectionViewSet):
     """
     ViewSet for viewing About Timeline section header.
     Returns only the active timeline section header.
     Public read-only endpoint.
     """
-    permission_classes = [AllowAny]  # Explicitly allow public read access
-    serializer_class = AboutTimelineSectionSerializer
-    pagination_class = None
-    
-    def get_queryset(self):
-        # Return only the most recent active timeline section header (max 1 for safety)
-        return AboutTimelineSection.objects.filter(is_active=True).order_by('-updated_at')[:1]
+    section_key = 'timeline_header'
+    serializer_class = AboutHeaderSectionSerializer
 
 
 class AboutValueViewSet(viewsets.ReadOnlyModelViewSet):
@@ -257,7 +586,7 @@ class AboutValueViewSet(viewsets.ReadOnlyModelViewSet):
     """
     permission_classes = [AllowAny]  # Explicitly allow public read access
     serializer_class = AboutValueSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = FastCountPagination
     
     def get_queryset(self):
         # Return all active values ordered by display order
@@ -272,27 +601,13 @@ class AboutTimelineItemViewSet(viewsets.ReadOnlyModelViewSet):
     """
     permission_classes = [AllowAny]  # Explicitly allow public read access
     serializer_class = AboutTimelineItemSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = FastCountPagination
     
     def get_queryset(self):
         # Return all active timeline items ordered by display order
         return AboutTimelineItem.objects.filter(is_active=True).order_by('order', 'year')
 
 
-# Legacy AboutPageViewSet - REMOVED
-# The AboutPage model is deprecated. Use individual section endpoints instead:
-# - /api/about-story/
-# - /api/about-mission/
-# - /api/about-vision/
-# - /api/about-values-header/
-# - /api/about-timeline-header/
-# - /api/about-values/
-# - /api/about-timeline-items/
-#
-# class AboutPageViewSet(viewsets.ReadOnlyModelViewSet):
-#     ... (removed to prevent usage of deprecated endpoint)
-
-
 class ContactInformationViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing Contact Information.
@@ -3,6 +3,11 @@ ASGI config for bencyn_susu project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project with this application to enable the Server-Sent Events
+stream at /api/updates/stream/ (see api/events.py), e.g.:
+
+    gunicorn bencyn_susu.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -15,8 +15,10 @@ For production deployment, ensure:
 """
 
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from decouple import config
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -76,14 +78,13 @@ INSTALLED_APPS = [
     'api.apps.ApiConfig',
 ]
 
-# Add Cloudinary storage for media files in production
-# Note: cloudinary must come before cloudinary_storage
-if not DEBUG:
-    staticfiles_index = INSTALLED_APPS.index('django.contrib.staticfiles')
-    INSTALLED_APPS.insert(staticfiles_index + 1, 'cloudinary')
-    INSTALLED_APPS.insert(staticfiles_index + 2, 'cloudinary_storage')
+# Note: 'cloudinary' and 'cloudinary_storage' are intentionally NOT installed apps.
+# Only their storage backend is used (see DEFAULT_FILE_STORAGE below), and listing
+# them would import the Cloudinary SDK at startup through their template tags.
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',  # First, so latency covers the whole stack
+    'api.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files in production
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -215,12 +216,11 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # In development, use local file storage
 if not DEBUG:
     # Production: Use Cloudinary for media files
-    import cloudinary
-    import cloudinary.uploader
-    import cloudinary.api
-    
     # Cloudinary configuration - set these in your environment variables
     # Get from Cloudinary dashboard: https://cloudinary.com/console
+    # The Cloudinary SDK is configured from this dict lazily, the first time the
+    # media storage is used (Django only imports DEFAULT_FILE_STORAGE on first
+    # access), so processes like migrate or collectstatic never load it.
     CLOUDINARY_STORAGE = {
         'CLOUD_NAME': config('CLOUDINARY_CLOUD_NAME', default=''),
         'API_KEY': config('CLOUDINARY_API_KEY', default=''),
@@ -229,16 +229,8 @@ if not DEBUG:
         'STATICFILES_MANIFEST_ROOT': BASE_DIR / 'staticfiles',
     }
     
-    # Configure Cloudinary SDK (for programmatic access if needed)
-    cloudinary.config(
-        cloud_name=CLOUDINARY_STORAGE['CLOUD_NAME'],
-        api_key=CLOUDINARY_STORAGE['API_KEY'],
-        api_secret=CLOUDINARY_STORAGE['API_SECRET'],
-        secure=CLOUDINARY_STORAGE['SECURE']
-    )
-    
     # Use Cloudinary storage for media files
-    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+    REMOTE_MEDIA_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
     
     # Media URL will be automatically handled by Cloudinary
     MEDIA_URL = '/media/'
@@ -247,13 +239,175 @@ if not DEBUG:
     MEDIA_ROOT = BASE_DIR / 'media'
 else:
     # Development: Use local file storage
+    REMOTE_MEDIA_STORAGE = 'django.core.files.storage.FileSystemStorage'
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background upload offload
+# Admin saves write new files to local staging and return immediately; a
+# thread pool then pushes them to REMOTE_MEDIA_STORAGE and swaps the field
+# reference. Run `manage.py process_pending_uploads` periodically to retry
+# failed uploads. When disabled, files are uploaded synchronously on save.
+# REMOTE_MEDIA_STORAGE can be set to 'api.storage.LocalRemoteStorage', a
+# filesystem stand-in for the remote storage, for tests.
+REMOTE_MEDIA_STORAGE = config('REMOTE_MEDIA_STORAGE', default=REMOTE_MEDIA_STORAGE)
+UPLOAD_OFFLOAD_ENABLED = config('UPLOAD_OFFLOAD_ENABLED', default=not DEBUG, cast=bool)
+
+# Content-addressed media
+# New files are named by the SHA-256 of their content (cas/ab/<hash>.jpg) and
+# stored once however often they are uploaded; a reference count removes a
+# file when nothing uses it any more. Names (and therefore URLs) never change
+# content, so they can be cached as immutable.
+CONTENT_ADDRESSED_MEDIA = config('CONTENT_ADDRESSED_MEDIA', default=True, cast=bool)
+# Images whose perceptual hashes differ in at most this many of 64 bits are
+# reported as near-duplicates in the admin
+PHASH_MAX_DISTANCE = 6
+# Longest side in pixels of the previews generated for admin lists (shown
+# at up to half that size, so they stay sharp on high-density screens)
+ADMIN_THUMBNAIL_SIZE = 200
+
+if UPLOAD_OFFLOAD_ENABLED:
+    DEFAULT_FILE_STORAGE = 'api.storage.OffloadingStorage'
+elif CONTENT_ADDRESSED_MEDIA:
+    DEFAULT_FILE_STORAGE = 'api.storage.ContentAddressedStorage'
+else:
+    DEFAULT_FILE_STORAGE = REMOTE_MEDIA_STORAGE
+UPLOAD_STAGING_ROOT = config('UPLOAD_STAGING_ROOT', default=str(BASE_DIR / 'media_staging'))
+UPLOAD_STAGING_URL = '/media/staged/'
+UPLOAD_OFFLOAD_WORKERS = config('UPLOAD_OFFLOAD_WORKERS', default=4, cast=int)
+UPLOAD_OFFLOAD_MAX_ATTEMPTS = 5
+UPLOAD_OFFLOAD_RETRY_DELAY = 60  # Seconds before the first retry, doubled after each failure
+UPLOAD_OFFLOAD_STALE_AFTER = 15 * 60  # Seconds after which an 'uploading' entry is considered abandoned
+REMOTE_STORAGE_STANDIN_ROOT = config('REMOTE_STORAGE_STANDIN_ROOT', default=str(BASE_DIR / 'media_remote'))
+REMOTE_STORAGE_STANDIN_LATENCY = 0
+
+# Media serving for deployments that keep media on local disk (not Cloudinary)
+# /media/ is served by api.media_views.media_view with Range and conditional
+# request support. Set MEDIA_SENDFILE to 'nginx' (X-Accel-Redirect to
+# MEDIA_ACCEL_REDIRECT_PREFIX, an `internal` location aliased to MEDIA_ROOT)
+# or 'apache' (X-Sendfile) to let the web server stream the file.
+SERVE_MEDIA = config('SERVE_MEDIA', default=DEBUG, cast=bool)
+MEDIA_SENDFILE = config('MEDIA_SENDFILE', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+MEDIA_CACHE_MAX_AGE = 24 * 3600  # Content-addressed files are cached for a year instead
+
 # File upload settings
+# Uploads are streamed to a temporary file by SizeLimitedUploadHandler, which
+# stops reading a file as soon as it crosses its limit. Django's defaults for
+# FILE_UPLOAD_MAX_MEMORY_SIZE / DATA_UPLOAD_MAX_MEMORY_SIZE (2.5MB) apply, so
+# large files are never buffered in worker memory.
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB max file size
-DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE
-FILE_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE
+MAX_VIDEO_UPLOAD_SIZE = config('MAX_VIDEO_UPLOAD_SIZE', default=100 * 1024 * 1024, cast=int)  # 100MB
+BULK_UPLOAD_MAX_ARCHIVE_SIZE = config('BULK_UPLOAD_MAX_ARCHIVE_SIZE', default=500 * 1024 * 1024, cast=int)  # 500MB
+UPLOAD_FIELD_SIZE_LIMITS = {
+    # Per-field overrides of MAX_UPLOAD_SIZE (GalleryItem / BlogPostVideo video_file)
+    'video_file': MAX_VIDEO_UPLOAD_SIZE,
+    # Zip of photos on the gallery bulk upload page
+    'archive': BULK_UPLOAD_MAX_ARCHIVE_SIZE,
+}
+FILE_UPLOAD_HANDLERS = ['api.uploads.SizeLimitedUploadHandler']
+
+# Resumable chunked uploads for large videos (/api/uploads/)
+# Chunks are staged in CHUNKED_UPLOAD_DIR until the upload is complete.
+CHUNKED_UPLOAD_DIR = config('CHUNKED_UPLOAD_DIR', default=os.path.join(tempfile.gettempdir(), 'bencyn_susu_uploads'))
+CHUNKED_UPLOAD_MAX_SIZE = config('CHUNKED_UPLOAD_MAX_SIZE', default=1024 * 1024 * 1024, cast=int)  # 1GB
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int)  # 8MB
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24  # Unfinished uploads older than this are discarded
+
+# Bulk gallery uploads (admin > Gallery Items > Bulk upload, see api/bulk_upload.py)
+# Received files wait in BULK_UPLOAD_DIR until the background job has added them.
+# The job runs in the web process: a worker timeout, restart or deploy stops it
+# and, with BULK_UPLOAD_DIR on ephemeral disk, loses the staged files. Run
+# `manage.py fail_stale_uploads` periodically to mark batches without progress
+# for BULK_UPLOAD_STALE_MINUTES as failed and clear what they left behind.
+BULK_UPLOAD_DIR = config('BULK_UPLOAD_DIR', default=os.path.join(tempfile.gettempdir(), 'bencyn_susu_bulk_uploads'))
+BULK_UPLOAD_WORKERS = config('BULK_UPLOAD_WORKERS', default=4, cast=int)  # Images processed in parallel
+BULK_UPLOAD_MAX_FILES = config('BULK_UPLOAD_MAX_FILES', default=500, cast=int)  # Per batch, including zip contents
+DATA_UPLOAD_MAX_NUMBER_FILES = BULK_UPLOAD_MAX_FILES + 1  # Selected files plus the zip
+BULK_UPLOAD_STALE_MINUTES = config('BULK_UPLOAD_STALE_MINUTES', default=60, cast=int)  # Without progress
+
+# Cache
+# Defaults to a per-process memory cache. Use a shared cache (e.g. Redis or
+# Memcached) in production so invalidation on content changes reaches every
+# worker, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='bencyn-susu'),
+    }
+}
+# Facet counts are invalidated on content changes; the timeout only bounds
+# staleness for per-process caches
+FACETS_CACHE_TIMEOUT = 60 * 60
+# Current About page sections for the About Settings admin page (see api/about.py)
+ABOUT_CACHE_TIMEOUT = 60 * 60
+
+# RSS/Atom feeds (/api/feeds/) and XML sitemap (/sitemap.xml); the generated
+# XML is cached and dropped when the content it lists changes
+FEED_ITEMS = 50
+FEEDS_CACHE_TIMEOUT = 6 * 60 * 60
+SITEMAP_CHUNK_SIZE = 50000
+
+# Related posts shown on blog detail pages (see api/related.py)
+RELATED_POSTS_COUNT = 5
+
+# Blog post view statistics (see api/popularity.py). Views are written every
+# VIEW_FLUSH_INTERVAL seconds per process; `manage.py compact_view_stats`
+# merges hourly buckets into daily ones and drops old days
+VIEW_FLUSH_INTERVAL = config('VIEW_FLUSH_INTERVAL', default=10, cast=int)
+VIEW_FLUSH_MAX_KEYS = 1000
+VIEW_HOURLY_RETENTION_HOURS = 48
+VIEW_DAILY_RETENTION_DAYS = config('VIEW_DAILY_RETENTION_DAYS', default=90, cast=int)
+VIEW_RANKINGS_CACHE_TIMEOUT = 5 * 60
+
+# Row counts of paginated admin changelists and API lists (see
+# api/pagination.py): exact below the threshold, otherwise estimated by
+# PostgreSQL's planner or counted once and cached until the table changes
+COUNT_ESTIMATE_THRESHOLD = config('COUNT_ESTIMATE_THRESHOLD', default=10000, cast=int)
+COUNT_CACHE_TIMEOUT = 5 * 60
+
+# Change feed (/api/changes/): entries older than this are removed by
+# `manage.py prune_change_log`; clients further behind must reload everything
+CHANGE_LOG_RETENTION_DAYS = config('CHANGE_LOG_RETENTION_DAYS', default=30, cast=int)
+
+# Contact message retention (see api/archive.py): `manage.py archive_contact_messages`
+# moves messages older than this many days (0 = keep in the inbox forever) into
+# the compressed archive, searchable from admin > Contact Messages > Search archive
+CONTACT_RETENTION_READ_DAYS = config('CONTACT_RETENTION_READ_DAYS', default=180, cast=int)
+CONTACT_RETENTION_UNREAD_DAYS = config('CONTACT_RETENTION_UNREAD_DAYS', default=365, cast=int)
+CONTACT_ARCHIVE_BATCH_SIZE = 500  # Messages moved per transaction
+
+# Repeated contact form submissions (double clicks, network retries) get the
+# first response back instead of creating another message (see
+# api/idempotency.py): for CONTACT_IDEMPOTENCY_TIMEOUT seconds with the same
+# Idempotency-Key header, for CONTACT_DUPLICATE_WINDOW seconds (0 = off) with
+# the same content. Needs a shared cache to catch repeats across workers
+CONTACT_IDEMPOTENCY_TIMEOUT = 24 * 60 * 60
+CONTACT_DUPLICATE_WINDOW = config('CONTACT_DUPLICATE_WINDOW', default=10 * 60, cast=int)
+
+# Server-Sent Events stream of published updates (/api/updates/stream/, ASGI only).
+# One change log query per poll interval per process, however many clients are
+# connected; heartbeats keep proxies from closing idle connections, and streams
+# end after MAX_DURATION seconds so clients reconnect (resuming from Last-Event-ID)
+UPDATE_STREAM_POLL_INTERVAL = config('UPDATE_STREAM_POLL_INTERVAL', default=2.0, cast=float)
+UPDATE_STREAM_HEARTBEAT = config('UPDATE_STREAM_HEARTBEAT', default=15, cast=int)
+UPDATE_STREAM_MAX_DURATION = config('UPDATE_STREAM_MAX_DURATION', default=300, cast=int)
+UPDATE_STREAM_HISTORY = config('UPDATE_STREAM_HISTORY', default=500, cast=int)
+
+# Metrics (exposed at /metrics in Prometheus text format, staff only)
+# Set METRICS_DIR to a writable directory shared by all gunicorn workers so each
+# worker writes to its own mmap'd file and /metrics reports the sum across workers.
+# Leave empty to keep metrics in process memory (fine for runserver).
+METRICS_DIR = config('METRICS_DIR', default='' if DEBUG else str(BASE_DIR / 'metrics'))
+
+# Slow query log
+# Queries slower than this threshold (milliseconds) are logged with their SQL,
+# parameters, view and calling code, and aggregated by fingerprint into the
+# "Slow Queries" admin report. EXPLAIN output is captured for SELECTs at most
+# once per SLOW_QUERY_EXPLAIN_INTERVAL seconds per fingerprint. Set to 0 to disable.
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=int)
+SLOW_QUERY_EXPLAIN_INTERVAL = config('SLOW_QUERY_EXPLAIN_INTERVAL', default=3600, cast=int)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -282,7 +436,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Default, but individual views can override
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.FastCountPagination',
     'PAGE_SIZE': 20,
     # Rate limiting for API endpoints
     'DEFAULT_THROTTLE_CLASSES': [
@@ -302,7 +456,15 @@ CORS_ALLOWED_ORIGINS_RAW = config(
 # Filter out empty strings to prevent CORS validation errors
 CORS_ALLOWED_ORIGINS = [origin.strip() for origin in CORS_ALLOWED_ORIGINS_RAW.split(',') if origin.strip()]
 
+# Public frontend URL, used for links in feeds and the sitemap
+FRONTEND_URL = config(
+    'FRONTEND_URL',
+    default=CORS_ALLOWED_ORIGINS[0] if CORS_ALLOWED_ORIGINS else 'http://localhost:3000'
+).rstrip('/')
+
 CORS_ALLOW_CREDENTIALS = True
+# The contact form sends an Idempotency-Key so retries aren't saved twice
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 
 # Additional CORS settings for production
 if not DEBUG:
@@ -396,10 +558,19 @@ LOGGING = {
             'level': 'WARNING',
             'propagate': False,
         },
+        'api.slow_queries': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'api.offload': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
-# Production: Create logs directory if it doesn't exist
-if not DEBUG:
-    LOG_DIR = BASE_DIR / 'logs'
-    LOG_DIR.mkdir(exist_ok=True)
+# Directory for the optional file handler above. It is not created at import time
+# (that would run on every manage.py invocation); create it when enabling the handler.
+LOG_DIR = BASE_DIR / 'logs'
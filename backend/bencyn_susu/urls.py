@@ -1,23 +1,36 @@
 """
 URL configuration for bencyn_susu project.
 """
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from api.admin_views import about_settings_view
+from api.media_views import media_view
+from api.sitemaps import sitemap_blog_view, sitemap_index_view, sitemap_pages_view
+from api.views import metrics_view
 
 urlpatterns = [
     # Custom admin views must come BEFORE admin.site.urls to avoid catch-all pattern
     path('admin/about-settings/', about_settings_view, name='about_settings'),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
+    path('sitemap.xml', sitemap_index_view, name='sitemap-index'),
+    path('sitemap-pages.xml', sitemap_pages_view, name='sitemap-pages'),
+    path('sitemap-blog-<int:chunk>.xml', sitemap_blog_view, name='sitemap-blog'),
 ]
 
-# Media files (user uploads) - only served in DEBUG mode
-# In production, serve media files through your web server (nginx, Apache, etc.)
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media files (user uploads), including files staged for background upload.
+# Served in DEBUG mode, or in production with SERVE_MEDIA for deployments
+# without Cloudinary (ideally with MEDIA_SENDFILE so nginx/Apache stream them).
+# Staged files are always served so admin previews work until they're uploaded.
+media_prefix = re.escape(settings.MEDIA_URL.lstrip('/'))
+if settings.SERVE_MEDIA:
+    urlpatterns += [re_path(rf'^{media_prefix}(?P<path>.*)$', media_view, name='media')]
+else:
+    urlpatterns += [re_path(rf'^{media_prefix}(?P<path>staged/.*)$', media_view, name='media')]
 
 # Static files are now served by WhiteNoise in production
 # No need for static() URL pattern - WhiteNoise middleware handles it
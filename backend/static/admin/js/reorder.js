@@ -0,0 +1,144 @@
+/*
+ * Drag-and-drop reordering for admin changelists and tabular inlines.
+ *
+ * Rows get a handle; dropping a row saves the new order of the rows on the
+ * page at once through POST /api/reorder/<model>/ (see api/ordering.py),
+ * which only rewrites rows whose order value has to change. The returned
+ * values are written back into any "order" inputs on the page, so saving
+ * the form afterwards doesn't undo the move.
+ */
+(function() {
+    'use strict';
+
+    var REORDER_URL = '/api/reorder/';
+
+    function csrfToken() {
+        var input = document.querySelector('input[name="csrfmiddlewaretoken"]');
+        return input ? input.value : '';
+    }
+
+    function saveOrder(modelName, ids, parent) {
+        var payload = {ids: ids};
+        if (parent) {
+            payload.blog_post = parent;
+        }
+        return fetch(REORDER_URL + modelName + '/', {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {'Content-Type': 'application/json', 'X-CSRFToken': csrfToken()},
+            body: JSON.stringify(payload)
+        }).then(function(response) {
+            return response.json().then(function(data) {
+                if (!response.ok) {
+                    throw new Error(data.error || data.detail || 'The new order could not be saved.');
+                }
+                return data.order;
+            });
+        });
+    }
+
+    function makeSortable(tbody, rowId, save) {
+        var rows = Array.prototype.filter.call(tbody.rows, function(row) { return rowId(row); });
+        if (rows.length < 2) {
+            return;
+        }
+        var dragged = null;
+        var before = null;
+
+        rows.forEach(function(row) {
+            var handle = document.createElement('span');
+            handle.className = 'reorder-handle';
+            handle.title = 'Drag to reorder';
+            handle.textContent = '☰';
+            var cell = row.querySelector('td, th');
+            cell.insertBefore(handle, cell.firstChild);
+
+            // Only the handle starts a drag, so inputs in the row stay usable
+            handle.addEventListener('mousedown', function() { row.draggable = true; });
+            handle.addEventListener('mouseup', function() { row.draggable = false; });
+
+            row.addEventListener('dragstart', function(event) {
+                dragged = row;
+                before = rows.map(rowId).join(',');
+                row.classList.add('reorder-dragging');
+                event.dataTransfer.effectAllowed = 'move';
+                event.dataTransfer.setData('text/plain', rowId(row));
+            });
+            row.addEventListener('dragover', function(event) {
+                if (!dragged || row === dragged) {
+                    return;
+                }
+                event.preventDefault();
+                var box = row.getBoundingClientRect();
+                var after = event.clientY > box.top + box.height / 2;
+                tbody.insertBefore(dragged, after ? row.nextSibling : row);
+            });
+            row.addEventListener('drop', function(event) { event.preventDefault(); });
+            row.addEventListener('dragend', function() {
+                row.draggable = false;
+                row.classList.remove('reorder-dragging');
+                dragged = null;
+                rows = Array.prototype.filter.call(tbody.rows, function(row) { return rowId(row); });
+                var ids = rows.map(rowId);
+                if (ids.join(',') === before) {
+                    return;
+                }
+                rows.forEach(function(row) { row.classList.add('reorder-saving'); });
+                save(ids).then(function(order) {
+                    rows.forEach(function(row) {
+                        row.classList.remove('reorder-saving');
+                        var input = row.querySelector('input[name$="-order"]');
+                        if (input && order[rowId(row)] !== undefined) {
+                            input.value = order[rowId(row)];
+                        }
+                    });
+                }).catch(function(error) {
+                    window.alert(error.message);
+                    window.location.reload();
+                });
+            });
+        });
+    }
+
+    function initChangelist() {
+        var match = /\bmodel-(\w+)\b/.exec(document.body.className);
+        var table = document.getElementById('result_list');
+        // Rows can only be moved while they're shown in their display order
+        if (!match || !table || !document.body.classList.contains('change-list') ||
+                new URLSearchParams(window.location.search).has('o')) {
+            return;
+        }
+        makeSortable(table.tBodies[0], function(row) {
+            var checkbox = row.querySelector('input.action-select');
+            return checkbox ? checkbox.value : null;
+        }, function(ids) {
+            return saveOrder(match[1], ids);
+        });
+    }
+
+    function initInlines() {
+        var parent = /\/(\d+)\/change\/$/.exec(window.location.pathname);
+        if (!parent) {
+            return;
+        }
+        document.querySelectorAll('fieldset[class*="reorder-"]').forEach(function(fieldset) {
+            var modelName = /\breorder-(\w+)\b/.exec(fieldset.className)[1];
+            var tbody = fieldset.querySelector('table tbody');
+            if (!tbody) {
+                return;
+            }
+            makeSortable(tbody, function(row) {
+                // Saved rows only; new and template rows have no id yet
+                var input = row.classList.contains('has_original') && row.querySelector('input[name$="-id"]');
+                return input && input.value ? input.value : null;
+            }, function(ids) {
+                return saveOrder(modelName, ids, parent[1]);
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        initChangelist();
+        initInlines();
+    });
+})();
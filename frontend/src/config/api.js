@@ -50,7 +50,7 @@ export const API_ENDPOINTS = {
   GALLERY: `${API_BASE_URL}/api/gallery/`,
   
   // About Page Sections
-  ABOUT_PAGE: `${API_BASE_URL}/api/about-page/`, // Legacy endpoint
+  ABOUT_PAGE: `${API_BASE_URL}/api/about-page/`, // Whole page in one request
   ABOUT_STORY: `${API_BASE_URL}/api/about-story/`,
   ABOUT_MISSION: `${API_BASE_URL}/api/about-mission/`,
   ABOUT_VISION: `${API_BASE_URL}/api/about-vision/`,
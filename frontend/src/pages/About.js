@@ -17,52 +17,14 @@ const About = () => {
 
   const fetchAboutPage = async () => {
     try {
-      // Fetch all sections independently
-      const [storyRes, missionRes, visionRes, valuesHeaderRes, timelineHeaderRes, valuesRes, timelineRes] = await Promise.all([
-        axiosInstance.get(API_ENDPOINTS.ABOUT_STORY),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_MISSION),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_VISION),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_VALUES_HEADER),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_TIMELINE_HEADER),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_VALUES),
-        axiosInstance.get(API_ENDPOINTS.ABOUT_TIMELINE_ITEMS)
-      ]);
-
-      // Handle paginated responses
-      const storyData = storyRes.data.results || storyRes.data;
-      const missionData = missionRes.data.results || missionRes.data;
-      const visionData = visionRes.data.results || visionRes.data;
-      const valuesHeaderData = valuesHeaderRes.data.results || valuesHeaderRes.data;
-      const timelineHeaderData = timelineHeaderRes.data.results || timelineHeaderRes.data;
-      const valuesData = valuesRes.data.results || valuesRes.data;
-      const timelineData = timelineRes.data.results || timelineRes.data;
-
-      // Combine all data
-      setAboutData({
-        story_title: Array.isArray(storyData) && storyData.length > 0 ? storyData[0].title : null,
-        story_content: Array.isArray(storyData) && storyData.length > 0 ? storyData[0].content : null,
-        mission_title: Array.isArray(missionData) && missionData.length > 0 ? missionData[0].title : null,
-        mission_content: Array.isArray(missionData) && missionData.length > 0 ? missionData[0].content : null,
-        vision_title: Array.isArray(visionData) && visionData.length > 0 ? visionData[0].title : null,
-        vision_content: Array.isArray(visionData) && visionData.length > 0 ? visionData[0].content : null,
-        values_title: Array.isArray(valuesHeaderData) && valuesHeaderData.length > 0 ? valuesHeaderData[0].title : null,
-        values_subtitle: Array.isArray(valuesHeaderData) && valuesHeaderData.length > 0 ? valuesHeaderData[0].subtitle : null,
-        timeline_title: Array.isArray(timelineHeaderData) && timelineHeaderData.length > 0 ? timelineHeaderData[0].title : null,
-        timeline_subtitle: Array.isArray(timelineHeaderData) && timelineHeaderData.length > 0 ? timelineHeaderData[0].subtitle : null,
-        values: Array.isArray(valuesData) ? valuesData : [],
-        timeline_items: Array.isArray(timelineData) ? timelineData : []
-      });
-    } catch (error) {
-      // Fallback to legacy endpoint if new endpoints fail
-      try {
-        const response = await axiosInstance.get(API_ENDPOINTS.ABOUT_PAGE);
-        const dataArray = response.data.results || response.data;
-        if (Array.isArray(dataArray) && dataArray.length > 0) {
-          setAboutData(dataArray[0]);
-        }
-      } catch (legacyError) {
-        // Legacy endpoint also failed, will use default data
+      // Whole page (sections, values and timeline) in one request
+      const response = await axiosInstance.get(API_ENDPOINTS.ABOUT_PAGE);
+      const dataArray = response.data.results || response.data;
+      if (Array.isArray(dataArray) && dataArray.length > 0) {
+        setAboutData(dataArray[0]);
       }
+    } catch (error) {
+      // Will use default data
     } finally {
       setIsLoading(false);
     }
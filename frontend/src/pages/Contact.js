@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { axiosInstance } from '../config/api';
 import { API_ENDPOINTS } from '../config/api';
@@ -18,6 +18,15 @@ const Contact = () => {
   const [submitStatus, setSubmitStatus] = useState(null);
   const [contactInfo, setContactInfo] = useState(null);
   const [isLoadingContact, setIsLoadingContact] = useState(true);
+  // Sent with every attempt to send the same message, so retries aren't saved twice
+  const idempotencyKey = useRef(null);
+
+  const newIdempotencyKey = () => {
+    if (window.crypto && window.crypto.randomUUID) {
+      return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+  };
 
   const validateEmail = (email) => {
     const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
@@ -51,6 +60,8 @@ const Contact = () => {
 
   const handleChange = (e) => {
     const { name, value } = e.target;
+    // An edited message is a new submission
+    idempotencyKey.current = null;
     setFormData({
       ...formData,
       [name]: value
@@ -79,8 +90,15 @@ const Contact = () => {
     setIsSubmitting(true);
     setSubmitStatus(null);
 
+    if (!idempotencyKey.current) {
+      idempotencyKey.current = newIdempotencyKey();
+    }
+
     try {
-      await axiosInstance.post(API_ENDPOINTS.CONTACT, formData);
+      await axiosInstance.post(API_ENDPOINTS.CONTACT, formData, {
+        headers: { 'Idempotency-Key': idempotencyKey.current }
+      });
+      idempotencyKey.current = null;
       setSubmitStatus({ type: 'success', message: 'Thank you! Your message has been sent successfully.' });
       setFormData({
         name: '',